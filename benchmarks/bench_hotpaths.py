@@ -0,0 +1,244 @@
+"""Cost of the validator hot paths and of one polling tick, at growing record counts.
+
+Usage: python -m benchmarks.bench_hotpaths [--max-size N] [--json] [--output FILE]
+                                           [--baseline FILE] [--tolerance FRACTION]
+
+Every result is {"name", "size", "seconds", "ns_per_op"}; ``--baseline``
+compares ns_per_op against a previous ``--output`` file and exits non-zero
+when any benchmark got slower than ``--tolerance`` allows.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from src.depth import DepthFillSimulator, DepthSnapshot
+from src.market_data import MarketDataClient
+from src.polling import poll_market
+from src.portfolio import Portfolio
+from src.schema import TradingSignal, TradingSignalValidator
+import src.scanner  # noqa: F401  imported up front so NumPy's import is not timed
+from src.testing import FakeBinanceClient
+
+SYMBOLS = [f"COIN{i}USDT" for i in range(200)]
+BASE_TIME = datetime(2024, 1, 1)
+QUERY_REPEATS = 100
+
+
+def make_tickers(size: int):
+    """Ticker payloads shaped like the 24h ticker endpoint; about a third meet the criteria"""
+    return [{
+        'symbol': SYMBOLS[i % len(SYMBOLS)],
+        'lastPrice': str(100.0 + i % 1000),
+        'priceChangePercent': str((i % 15) - 7.0),
+        'volume': str(500.0 + (i % 7) * 300),
+    } for i in range(size)]
+
+
+def make_signal(i: int) -> TradingSignal:
+    return TradingSignal(
+        symbol=SYMBOLS[i % len(SYMBOLS)], signal_type="BUY" if i % 2 else "SELL",
+        price=100.0 + i % 1000, change_percent=6.0, volume=2000.0,
+        timestamp=BASE_TIME + timedelta(milliseconds=i), confidence=0.6
+    )
+
+
+def make_validator(size: int, now: datetime = BASE_TIME) -> TradingSignalValidator:
+    return TradingSignalValidator(Mock(), order_archive_size=size, max_signals=size,
+                                  clock=lambda: now)
+
+
+def with_pending_orders(size: int) -> TradingSignalValidator:
+    validator = make_validator(size)
+    for i in range(size):
+        validator.create_pseudo_order(make_signal(i), 1.0)
+    return validator
+
+
+def with_signals(size: int) -> TradingSignalValidator:
+    # Clock at the newest signal so the 10-minute window covers a slice of the store
+    validator = make_validator(size, now=BASE_TIME + timedelta(milliseconds=size))
+    for i in range(size):
+        validator.signals.append(make_signal(i))
+    return validator
+
+
+# Each setup receives the size and returns (operation, ops): the timed callable
+# and the number of hot-path calls it makes
+
+def bench_validate_signal_criteria(size):
+    validator, tickers = make_validator(size), make_tickers(size)
+    return lambda: [validator.validate_signal_criteria(t) for t in tickers], size
+
+
+def bench_generate_trading_signal(size):
+    validator, tickers = make_validator(size), make_tickers(size)
+    return lambda: [validator.generate_trading_signal(t) for t in tickers], size
+
+
+def bench_generate_trading_signals(size):
+    validator, tickers = make_validator(size), make_tickers(size)
+    return lambda: validator.generate_trading_signals(tickers), size
+
+
+def bench_create_pseudo_order(size):
+    validator = make_validator(size)
+    signals = [make_signal(i) for i in range(size)]
+    return lambda: [validator.create_pseudo_order(s, 1.0) for s in signals], size
+
+
+def bench_simulate_order_fill(size):
+    validator = with_pending_orders(size)
+    orders = validator.get_pending_orders()
+    return lambda: [validator.simulate_order_fill(o, o.price) for o in orders], size
+
+
+def bench_process_price_snapshot(size):
+    validator = with_pending_orders(size)
+    # Prices sit inside the band of orders priced 100-109 only
+    prices = {symbol: 100.0 + i % 10 for i, symbol in enumerate(SYMBOLS)}
+    return lambda: validator.process_price_snapshot(prices), 1
+
+
+def bench_get_active_signals(size):
+    validator = with_signals(size)
+    return lambda: [validator.get_active_signals() for _ in range(QUERY_REPEATS)], QUERY_REPEATS
+
+
+def bench_get_pending_orders(size):
+    validator = with_pending_orders(size)
+    return lambda: [validator.get_pending_orders() for _ in range(QUERY_REPEATS)], QUERY_REPEATS
+
+
+def bench_poll_tick(size):
+    """One fetch_trade_signals tick over ``size`` symbols, with pending orders on 1% of them"""
+    fake = FakeBinanceClient(symbols=size, seed=1)
+    market_data = MarketDataClient(client=fake)
+    validator = make_validator(max(size, 1000))
+    for symbol in fake.symbols[::100]:
+        validator.create_pseudo_order(TradingSignal(
+            symbol=symbol, signal_type="BUY", price=fake.prices[symbol] * 0.5, change_percent=6.0,
+            volume=2000.0, timestamp=BASE_TIME, confidence=0.6
+        ), 1.0)
+    return lambda: asyncio.run(poll_market(market_data, validator)), 1
+
+
+def bench_depth_match(size):
+    """Matching ``size`` pending orders of one symbol against a 1000-level book"""
+    validator = make_validator(size)
+    for i in range(size):
+        validator.create_pseudo_order(TradingSignal(
+            symbol='BTCUSDT', signal_type="BUY" if i % 2 else "SELL", price=100.0 + (i % 100) * 0.01,
+            change_percent=6.0, volume=2000.0, timestamp=BASE_TIME, confidence=0.6
+        ), 1.0)
+    fake = FakeBinanceClient(symbols=1, seed=1)
+    fake.prices['BTCUSDT'] = 100.5
+    snapshot = DepthSnapshot.from_binance('BTCUSDT', fake.order_book('BTCUSDT', limit=1000))
+    simulator = DepthFillSimulator(validator)
+    orders = validator.get_pending_orders()
+    return lambda: simulator.match(snapshot, orders), 1
+
+
+def bench_portfolio_fill(size):
+    portfolio = Portfolio()
+    fills = [(SYMBOLS[i % len(SYMBOLS)], 1.0 if i % 3 else -1.5, 100.0 + i % 10) for i in range(size)]
+    return lambda: [portfolio.apply_fill(*fill) for fill in fills], size
+
+
+def bench_portfolio_mark(size):
+    """Mark-to-market of ``size`` open positions against one snapshot"""
+    portfolio = Portfolio()
+    symbols = [f"COIN{i}USDT" for i in range(size)]
+    for symbol in symbols:
+        portfolio.apply_fill(symbol, 1.0, 100.0)
+    prices = {symbol: 101.0 for symbol in symbols}
+    return lambda: portfolio.mark(prices, limit=10), 1
+
+
+BENCHMARKS = {
+    'validate_signal_criteria': bench_validate_signal_criteria,
+    'generate_trading_signal': bench_generate_trading_signal,
+    'generate_trading_signals': bench_generate_trading_signals,
+    'create_pseudo_order': bench_create_pseudo_order,
+    'simulate_order_fill': bench_simulate_order_fill,
+    'process_price_snapshot': bench_process_price_snapshot,
+    'get_active_signals': bench_get_active_signals,
+    'get_pending_orders': bench_get_pending_orders,
+    'poll_tick': bench_poll_tick,
+    'depth_match': bench_depth_match,
+    'portfolio_fill': bench_portfolio_fill,
+    'portfolio_mark': bench_portfolio_mark,
+}
+
+
+def run_benchmark(name: str, size: int) -> dict:
+    operation, ops = BENCHMARKS[name](size)
+    gc.collect()
+    start = time.perf_counter()
+    operation()
+    elapsed = time.perf_counter() - start
+    return {'name': name, 'size': size, 'seconds': round(elapsed, 6),
+            'ns_per_op': round(elapsed * 1e9 / ops, 1)}
+
+
+def compare(results, baseline, tolerance: float):
+    """Results whose ns_per_op exceeds the baseline's by more than ``tolerance``"""
+    previous = {(r['name'], r['size']): r['ns_per_op'] for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result['name'], result['size']))
+        if before and result['ns_per_op'] > before * (1 + tolerance):
+            regressions.append(dict(result, baseline_ns_per_op=before))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-size', type=int, default=100000,
+                        help='largest record count (powers of ten from 10^3)')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS),
+                        help='run only the named benchmark (repeatable)')
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    parser.add_argument('--output', help='write the results to a JSON file')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='allowed slowdown as a fraction of the baseline (default 0.25)')
+    args = parser.parse_args()
+
+    sizes = []
+    size = 1000
+    while size <= args.max_size:
+        sizes.append(size)
+        size *= 10
+
+    results = []
+    for name in args.only or BENCHMARKS:
+        for size in sizes:
+            result = run_benchmark(name, size)
+            results.append(result)
+            if not args.json:
+                print(f"{name:26s} {size:>9d} {result['seconds'] * 1000:10.2f} ms "
+                      f"{result['ns_per_op']:12.1f} ns/op")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.json:
+        print(json.dumps(results))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['name']} size={r['size']}: {r['ns_per_op']} ns/op "
+                  f"(baseline {r['baseline_ns_per_op']})", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
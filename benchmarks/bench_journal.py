@@ -0,0 +1,75 @@
+"""Journal recovery time for a large event log.
+
+Usage: python -m benchmarks.bench_journal [--events N]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from src.journal import Journal
+from src.schema import OrderStatus, OrderType, PseudoOrder, TradingSignal, TradingSignalValidator
+
+BASE_TIME = datetime(2024, 1, 1)
+EVENTS_PER_COMMIT = 1000
+
+
+def write_journal(path: str, events: int) -> int:
+    """Write ~90% signal and ~10% order events in group-committed blocks"""
+    journal = Journal(path, fsync=False)
+    written = 0
+    orders = events // 20
+    for i in range(events - 2 * orders):
+        journal.record_signal(TradingSignal(
+            symbol=f"COIN{i % 200}USDT", signal_type="BUY", price=100.0, change_percent=6.0,
+            volume=2000.0, timestamp=BASE_TIME + timedelta(seconds=i), confidence=0.6
+        ))
+        written += 1
+        if written % EVENTS_PER_COMMIT == 0:
+            journal.flush()
+    for i in range(orders):
+        order = PseudoOrder(
+            id=f"ORDER_{i + 1}_COIN{i % 200}USDT_1704067200", symbol=f"COIN{i % 200}USDT",
+            order_type=OrderType.BUY, quantity=1.0, price=100.0,
+            timestamp=BASE_TIME + timedelta(seconds=i)
+        )
+        journal.record_order(order)
+        order.status = OrderStatus.FILLED
+        order.fill_price = 100.5
+        order.fill_timestamp = BASE_TIME + timedelta(seconds=i + 1)
+        journal.record_order(order)
+        written += 2
+        if written % EVENTS_PER_COMMIT < 2:
+            journal.flush()
+    journal.flush()
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.journal')
+        write_journal(path, args.events)
+        size = os.path.getsize(path)
+
+        validator = TradingSignalValidator(Mock())
+        start = time.perf_counter()
+        replayed = Journal(path).recover(validator)
+        elapsed = time.perf_counter() - start
+
+    result = {'events': replayed, 'journal_bytes': size, 'recover_seconds': round(elapsed, 4)}
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"Recovered {replayed} events ({size / 1e6:.1f} MB) in {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
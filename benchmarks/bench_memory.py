@@ -0,0 +1,70 @@
+"""Bytes per archived order in each order storage mode.
+
+Usage: python -m benchmarks.bench_memory [--records N]
+"""
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+
+from src.compact import OrderArchive
+from src.schema import OrderType, PseudoOrder
+
+SYMBOLS = [f"COIN{i}USDT" for i in range(200)]
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def make_order(i: int) -> PseudoOrder:
+    # Build the symbol string per record, as parsing API responses would
+    symbol = "".join(SYMBOLS[i % len(SYMBOLS)])
+    return PseudoOrder(
+        id=f"ORDER_{i}_{symbol}_1704067200",
+        symbol=symbol,
+        order_type=OrderType.BUY if i % 2 else OrderType.SELL,
+        quantity=0.001 * (i % 50 + 1),
+        price=100.0 + i % 1000,
+        timestamp=BASE_TIME + timedelta(seconds=i)
+    )
+
+
+def measure(build, records: int) -> float:
+    """Bytes retained per record by the container build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    container = build(records)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return current / records
+
+
+def _archive(records):
+    archive = OrderArchive()
+    for i in range(records):
+        archive.append(make_order(i))
+    return archive
+
+
+MODES = {
+    'dataclass': lambda n: [make_order(i) for i in range(n)],
+    'columnar': _archive,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    results = {mode: round(measure(build, args.records), 1) for mode, build in MODES.items()}
+    if args.json:
+        print(json.dumps({'records': args.records, 'bytes_per_record': results}))
+    else:
+        for mode, bytes_per_record in results.items():
+            print(f"{mode:<18} {bytes_per_record:>8.1f} bytes/record")
+
+
+if __name__ == '__main__':
+    main()
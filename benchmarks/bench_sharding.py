@@ -0,0 +1,71 @@
+"""Signal scanning throughput in-process and sharded over worker processes.
+
+Usage: python -m benchmarks.bench_sharding [--symbols N] [--scans N] [--workers 1 2 4 ...] [--json]
+
+Each scan covers the whole fake symbol universe with rolling indicators;
+throughput is tickers scanned per second.
+"""
+import argparse
+import json
+import os
+import time
+from unittest.mock import Mock
+
+from src.indicators import IndicatorEngine
+from src.scanner import parse_tickers
+from src.schema import TradingSignalValidator
+from src.sharding import ShardedScanner
+from src.testing import FakeBinanceClient
+
+
+def snapshots(symbols: int, scans: int):
+    fake = FakeBinanceClient(symbols=symbols, volatility=0.02, seed=1)
+    result = []
+    for _ in range(scans):
+        fake.step()
+        result.append(parse_tickers(fake.ticker(symbol) for symbol in fake.symbols))
+    return result
+
+
+def run(columns, workers: int) -> float:
+    if workers == 0:
+        validator = TradingSignalValidator(Mock(), indicators=IndicatorEngine())
+        start = time.perf_counter()
+        for batch in columns:
+            validator.generate_signals_from_columns(batch)
+        return time.perf_counter() - start
+
+    with ShardedScanner(workers) as scanner:
+        scanner.scan_columns(columns[0])  # warm up the workers
+        start = time.perf_counter()
+        for batch in columns:
+            scanner.scan_columns(batch)
+        return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--symbols', type=int, default=20000)
+    parser.add_argument('--scans', type=int, default=20)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    columns = snapshots(args.symbols, args.scans)
+    results = []
+    for workers in [0] + args.workers:
+        seconds = run(columns, workers)
+        results.append({'workers': workers, 'seconds': round(seconds, 4),
+                        'tickers_per_second': round(args.symbols * args.scans / seconds)})
+
+    if args.json:
+        print(json.dumps(results))
+        return
+    for result in results:
+        label = 'in-process' if result['workers'] == 0 else f"{result['workers']} workers"
+        print(f"{label:<12} {result['seconds'] * 1000:10.0f} ms {result['tickers_per_second']:>12,} tickers/s")
+
+
+if __name__ == '__main__':
+    main()
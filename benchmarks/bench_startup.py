@@ -0,0 +1,77 @@
+"""Cold start: importing main, building the app and preloading journal and history.
+
+Usage: python -m benchmarks.bench_startup [--orders N] [--runs N] [--json]
+
+Every run is a fresh interpreter, so import costs are real cold-start costs.
+The journal holds N orders and the kline store a day of 1m history for one symbol.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from src.app import Settings, create_app
+from src.testing import FakeBinanceClient
+
+START = 1704067200000  # 2024-01-01T00:00:00Z
+
+CHILD = """
+import time
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+import asyncio, json
+from src.app import Settings, create_app
+app = create_app(Settings(journal_path={journal!r}, ohlcv_dir={ohlcv!r}, subscriptions_path={subscriptions!r}), started=t0)
+t2 = time.perf_counter()
+async def preload():
+    return await app.preload()
+asyncio.run(preload())
+t3 = time.perf_counter()
+print(json.dumps({{'import_main_ms': (t1 - t0) * 1000, 'build_ms': (t2 - t1) * 1000, 'preload_ms': (t3 - t2) * 1000}}))
+"""
+
+
+def populate(directory: str, orders: int) -> dict:
+    settings = Settings(journal_path=os.path.join(directory, 'tradisb.journal'),
+                        ohlcv_dir=os.path.join(directory, 'ohlcv'),
+                        subscriptions_path=os.path.join(directory, 'subscriptions.json'))
+    app = create_app(settings)
+    signal = app.validator.generate_trading_signal({
+        'symbol': 'BTCUSDT', 'lastPrice': '50000', 'priceChangePercent': '7.5', 'volume': '5000'
+    })
+    for _ in range(orders):
+        app.validator.create_pseudo_order(signal, 0.001)
+    app.journal.flush()
+    asyncio.run(app.history.sync(FakeBinanceClient(symbols=1, seed=1), 'BTCUSDT', START, START + 86_400_000))
+    return {'journal': settings.journal_path, 'ohlcv': settings.ohlcv_dir, 'subscriptions': settings.subscriptions_path}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--orders', type=int, default=10000)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        code = CHILD.format(**populate(directory, args.orders))
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        runs = [json.loads(subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                          check=True, env=env).stdout.splitlines()[-1])
+                for _ in range(args.runs)]
+
+    results = {key: round(statistics.median(run[key] for run in runs), 2) for key in runs[0]}
+    if args.json:
+        print(json.dumps(results))
+        return
+    for key, value in results.items():
+        print(f"{key:<16} {value:10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,213 @@
+"""Application factory: settings, the shared trading state and the Discord client.
+
+Importing this module (or main.py) has no side effects and does not import
+discord.py, python-binance or NumPy. ``create_app`` only builds objects and
+touches no files: the market data client connects on first use, the
+NumPy-backed components (kline store, depth fills, sharded scanner) are
+imported only when used or enabled, and the slow local state (journal
+recovery, subscriptions, indicator warm-up from the kline store) is loaded
+in worker threads while the Discord client logs in. Startup stages are recorded as
+``startup_seconds{stage=...}``, ending with the first command handled.
+"""
+import asyncio
+import os
+import time
+from typing import Mapping, NamedTuple, Optional, Set, Tuple
+
+from src.engine import TradingEngine
+from src.indicators import IndicatorEngine
+from src.journal import Journal
+from src.market_data import MarketDataClient
+from src.metrics import Metrics
+from src.portfolio import Portfolio
+from src.quote_cache import QuoteCache
+from src.schema import TradingSignalValidator
+from src.subscriptions import SubscriptionRegistry
+
+
+def _list(value: str) -> Tuple[str, ...]:
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+class Settings(NamedTuple):
+    discord_token: str = ''
+    binance_api_key: str = ''
+    binance_api_secret: str = ''
+    testnet: bool = True
+    # Where orders and signals are journaled
+    journal_path: str = 'tradisb.journal'
+    # Prometheus text format on this port when set (0: off)
+    metrics_port: int = 0
+    # How long !price/!order reuse a cached quote, in seconds
+    quote_ttl: float = 2.0
+    poll_interval: float = 5.0  # seconds between market polling ticks
+    # Push-driven fills from Binance 'bookTicker' or 'trade' streams; 'off' leaves fills to polling
+    price_stream: str = 'bookTicker'
+    # 'depth' fills orders against order-book snapshots (partial fills, VWAP and slippage)
+    # on every polling tick instead of at the last price
+    fill_model: str = 'price'
+    # Local kline history: indicators warm up from it at startup (a file map, no REST calls)
+    # and ohlcv_symbols are kept filled for the last ohlcv_days days
+    ohlcv_dir: str = 'ohlcv'
+    ohlcv_symbols: Tuple[str, ...] = ()
+    ohlcv_days: float = 1.0
+    # Worker processes that scan shards of the symbol universe for signals; 0 scans in-process
+    scan_workers: int = 0
+    # Channels seen for the first time get these broadcast topics (symbols, BUY/SELL or '*');
+    # !subscribe/!unsubscribe change them per channel and are saved to subscriptions_path
+    subscriptions_path: str = 'subscriptions.json'
+    default_topics: Tuple[str, ...] = ('*',)
+    # 'columnar' keeps filled/cancelled orders in typed arrays (src.compact) instead of dataclasses
+    order_storage: str = 'dataclass'
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] = os.environ) -> 'Settings':
+        return cls(
+            discord_token=env.get('DISCORD_BOT_TOKEN', ''),
+            binance_api_key=env.get('BINANCE_API_KEY', ''),
+            binance_api_secret=env.get('BINANCE_API_SECRET', ''),
+            journal_path=env.get('TRADISB_JOURNAL', 'tradisb.journal'),
+            metrics_port=int(env.get('TRADISB_METRICS_PORT') or 0),
+            quote_ttl=float(env.get('TRADISB_QUOTE_TTL', '2.0')),
+            price_stream=env.get('TRADISB_PRICE_STREAM', 'bookTicker'),
+            fill_model=env.get('TRADISB_FILL_MODEL', 'price'),
+            ohlcv_dir=env.get('TRADISB_OHLCV_DIR', 'ohlcv'),
+            ohlcv_symbols=tuple(s.upper() for s in _list(env.get('TRADISB_OHLCV_SYMBOLS', ''))),
+            ohlcv_days=float(env.get('TRADISB_OHLCV_DAYS', '1')),
+            scan_workers=int(env.get('TRADISB_SCAN_WORKERS', '0')),
+            subscriptions_path=env.get('TRADISB_SUBSCRIPTIONS', 'subscriptions.json'),
+            default_topics=_list(env.get('TRADISB_DEFAULT_TOPICS', '*')),
+            order_storage=env.get('TRADISB_ORDER_STORAGE', 'dataclass'),
+        )
+
+
+class App:
+    """The bot's components, wired together without I/O; see create_app"""
+
+    def __init__(self, settings: Settings, started: Optional[float] = None, client=None):
+        self.settings = settings
+        self.started = started if started is not None else time.perf_counter()
+        self._stages: Set[str] = set()
+        self._preload: Optional[asyncio.Future] = None
+        self._history = None
+
+        # Runtime metrics, shown by !stats and exported on settings.metrics_port
+        self.metrics = metrics = Metrics()
+        # Async market data client used from inside coroutines (pooled session,
+        # bounded concurrency and per-request timeouts); ``client`` replaces Binance
+        self.market_data = MarketDataClient(
+            api_key=settings.binance_api_key,
+            api_secret=settings.binance_api_secret,
+            testnet=settings.testnet,
+            client=client,
+            metrics=metrics
+        )
+        # Shared command-path quotes: concurrent lookups of one symbol share a
+        # request, warmed by every polling tick
+        self.quotes = QuoteCache(self.market_data.get_ticker, ttl=settings.quote_ttl, metrics=metrics)
+
+        self.journal = Journal(settings.journal_path)
+        # Positions and PnL are updated on every fill and rebuilt from recovered orders
+        self.portfolio = Portfolio()
+        self.indicators = IndicatorEngine()
+        self.validator = TradingSignalValidator(None, journal=self.journal, indicators=self.indicators,
+                                                portfolio=self.portfolio, order_storage=settings.order_storage)
+        self.depth_fills = None
+        if settings.fill_model == 'depth':
+            from src.depth import DepthFillSimulator
+
+            self.depth_fills = DepthFillSimulator(self.validator)
+        # Single writer for validator state: handlers and background tasks queue their changes
+        # here and read the snapshots it publishes instead of touching the validator directly
+        self.engine = TradingEngine(self.validator, metrics=metrics)
+        self.scanner = None
+        if settings.scan_workers > 0:
+            from src.sharding import ShardedScanner
+
+            self.scanner = ShardedScanner(settings.scan_workers)
+        self.subscriptions = SubscriptionRegistry(settings.subscriptions_path,
+                                                  default_topics=settings.default_topics)
+
+        validator = self.validator
+        metrics.gauge_callback('pending_orders', lambda: len(validator.orders) - len(validator.orders.archived))
+        metrics.gauge_callback('archived_orders', lambda: len(validator.orders.archived))
+        metrics.gauge_callback('stored_signals', lambda: len(validator.signals))
+        metrics.gauge_callback('cached_quotes', lambda: len(self.quotes))
+        metrics.gauge_callback('open_positions', lambda: self.engine.snapshot.portfolio.open_positions)
+        metrics.gauge_callback('engine_queue_depth', lambda: self.engine.queue.qsize())
+        metrics.gauge_callback('subscribed_channels', lambda: len(self.subscriptions))
+        self.mark_startup('built')
+
+    def mark_startup(self, stage: str):
+        """Record the seconds from process start to ``stage`` the first time it is reached"""
+        if stage not in self._stages:
+            self._stages.add(stage)
+            self.metrics.set('startup_seconds', time.perf_counter() - self.started, stage=stage)
+
+    @property
+    def history(self):
+        """The local kline store (src.ohlcv.OHLCVStore), imported and opened on first use"""
+        if self._history is None:
+            from src.ohlcv import OHLCVStore
+
+            self._history = OHLCVStore(self.settings.ohlcv_dir)
+        return self._history
+
+    def warm_indicators(self) -> int:
+        """Warm the validator's indicators from local history; skipped with scan workers,
+        which scan with indicators of their own"""
+        if self.scanner is not None:
+            return 0
+        from src.ohlcv import warm_indicators
+
+        return warm_indicators(self.history, self.indicators, tick_interval=self.settings.poll_interval)
+
+    def preload(self) -> asyncio.Future:
+        """Start (once) recovering the journal, loading subscriptions and warming indicators in worker threads.
+
+        All begin immediately; await the returned future, which resolves to
+        [journal events replayed, symbols warmed, channels known], before
+        touching the validator.
+        """
+        if self._preload is None:
+            loop = asyncio.get_running_loop()
+            self._preload = asyncio.gather(
+                loop.run_in_executor(None, self.journal.recover, self.validator),
+                loop.run_in_executor(None, self.warm_indicators),
+                loop.run_in_executor(None, self.subscriptions.load),
+            )
+            self._preload.add_done_callback(self._preloaded)
+        return self._preload
+
+    def _preloaded(self, future: asyncio.Future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        replayed, warmed, channels = future.result()
+        print(f'Recovered {replayed} journal events')
+        if self.scanner is None:
+            print(f'Warmed indicators for {warmed} symbols from local history')
+        else:
+            print('Skipped indicator warm-up: scan workers keep their own indicators')
+        print(f'Loaded subscriptions of {channels} channels')
+        self.mark_startup('preloaded')
+
+    def create_client(self):
+        """The Discord client for this app; discord.py is imported here, not at module import"""
+        from src.bot import MyClient
+
+        return MyClient(self)
+
+    async def start(self):
+        """Log in and run the bot until it is closed, preloading state during the login"""
+        self.preload()
+        client = self.create_client()
+        async with client:
+            await client.start(self.settings.discord_token)
+
+    def run(self):
+        asyncio.run(self.start())
+
+
+def create_app(settings: Optional[Settings] = None, started: Optional[float] = None, client=None) -> App:
+    """Build the bot's components from ``settings`` (default: the environment) without file or network I/O"""
+    return App(settings if settings is not None else Settings.from_env(), started=started, client=client)
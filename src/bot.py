@@ -0,0 +1,371 @@
+import asyncio
+from datetime import timedelta
+
+import discord
+
+from src.broadcast import BroadcastScheduler, split_message
+from src.metrics import TickTimer, monitor_event_loop, serve_metrics
+from src.ohlcv import sync_history_periodically
+from src.polling import expire_orders_periodically, format_cancel_message, format_fill_message, poll_market
+from src.portfolio import format_pnl_message
+from src.schema import OrderType
+from src.streaming import BinanceStreamSource, StreamingFillEngine
+
+COMMANDS = ('!hello', '!price', '!order', '!signals', '!stats', '!pnl', '!subscribe', '!unsubscribe',
+            '!subscriptions')
+
+
+# Discord bot client
+class MyClient(discord.Client):
+    def __init__(self, app, **options):
+        intents = discord.Intents.default()
+        intents.message_content = True
+        super().__init__(intents=intents, **options)
+        self.app = app  # src.app.App holding the shared trading state
+        self.broadcaster = BroadcastScheduler(self.get_channel, skip_exceptions=(discord.Forbidden,))
+        self.journal_task = None
+        self.background_tasks = []
+
+    # called once after logging in, before connecting to the gateway
+    async def setup_hook(self):
+        app, settings = self.app, self.app.settings
+        # The journal recovery and indicator warm-up started alongside the login
+        await app.preload()
+        await app.market_data.connect()
+        if app.scanner is not None:
+            app.scanner.start()
+        self.journal_task = asyncio.create_task(app.journal.run(app.validator))
+        # Orders expire on their own deadlines; cancellations are broadcast like fills
+        app.validator.on_cancel = self.announce_cancellations
+        app.engine.publish()  # recovered state is readable before the first event
+        self.background_tasks = [
+            asyncio.create_task(app.engine.run()),
+            asyncio.create_task(monitor_event_loop(app.metrics)),
+            asyncio.create_task(expire_orders_periodically(app.validator, engine=app.engine)),
+            asyncio.create_task(app.subscriptions.run()),  # saves subscription changes in batches
+        ]
+        if settings.ohlcv_symbols:
+            self.background_tasks.append(asyncio.create_task(sync_history_periodically(
+                app.history, app.market_data, settings.ohlcv_symbols, lookback_ms=int(settings.ohlcv_days * 86_400_000)
+            )))
+        if settings.metrics_port:
+            self.background_tasks.append(asyncio.create_task(serve_metrics(app.metrics, port=settings.metrics_port)))
+
+        # Fill orders as soon as their symbol ticks; the polling loop remains the fallback.
+        # With the depth fill model only polled order-book snapshots fill orders
+        if settings.price_stream != 'off' and app.depth_fills is None:
+            self.fill_engine = StreamingFillEngine(
+                app.validator,
+                lambda: BinanceStreamSource(app.market_data, lambda: app.engine.snapshot.pending_symbols, stream=settings.price_stream),
+                on_fill=self.announce_fills,
+                metrics=app.metrics,
+                engine=app.engine
+            )
+            self.background_tasks.append(asyncio.create_task(self.fill_engine.run()))
+
+    # called when the bot shuts down
+    async def close(self):
+        tasks = self.background_tasks + ([self.journal_task] if self.journal_task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)  # the journal task flushes buffered events
+        await self.app.market_data.close()
+        if self.app.scanner is not None:
+            self.app.scanner.close()
+        await super().close()
+
+    # called when the bot is ready
+    async def on_ready(self):
+        print(f'Logged in as {self.user} (ID: {self.user.id})')
+        print('------')
+        self.app.mark_startup('ready')
+
+        # Schedule the fetch task
+        self.bg_task = self.loop.create_task(self.fetch_trade_signals())
+
+    # called when a message is received on server
+    async def on_message(self, message):
+        print(f'Message from {message.author}: {message.content}')
+        if message.author == self.user:
+            return
+
+        command = next((c for c in COMMANDS if message.content.startswith(c)), None)
+        if command is None:
+            return
+
+        self.app.mark_startup('first_command')
+        with self.app.metrics.time('command_seconds', command=command):
+            if command == '!hello':
+                await message.channel.send(f'Hello {message.author.name}!')
+
+            # New feature: Get crypto price
+            if command == '!price':
+                await self.handle_price_command(message)
+
+            # New feature: Create pseudo order
+            if command == '!order':
+                await self.handle_order_command(message)
+
+            # New feature: Check signals
+            if command == '!signals':
+                await self.handle_signals_command(message)
+
+            # Runtime latency and store statistics
+            if command == '!stats':
+                await self.handle_stats_command(message)
+
+            # Positions and PnL of filled pseudo orders
+            if command == '!pnl':
+                await self.handle_pnl_command(message)
+
+            # Which fills and cancellations are broadcast to this channel
+            if command in ('!subscribe', '!unsubscribe', '!subscriptions'):
+                await self.handle_subscription_command(message, command)
+
+    # Handle subscribe, unsubscribe and subscriptions commands
+    async def handle_subscription_command(self, message, command):
+        # Format: !subscribe BTC ETHUSDT SELL | !unsubscribe [TOPIC ...] | !subscriptions
+        channel_id = message.channel.id
+        topics = message.content.split()[1:]
+        # Changing what a channel receives takes the Manage Channels permission there
+        if command != '!subscriptions' and not message.channel.permissions_for(message.author).manage_channels:
+            await message.channel.send("❌ Changing this channel's subscriptions requires the Manage Channels permission")
+            return
+        if command == '!subscribe':
+            if not topics:
+                await message.channel.send("❌ Usage: `!subscribe SYMBOL|BUY|SELL|* ...`\nExample: `!subscribe BTC ETHUSDT SELL`")
+                return
+            current = self.app.subscriptions.subscribe(channel_id, topics)
+        elif command == '!unsubscribe':
+            current = self.app.subscriptions.unsubscribe(channel_id, topics or None)
+        else:
+            current = self.app.subscriptions.topics(channel_id)
+
+        if current:
+            await message.channel.send(f"🔔 This channel receives updates for: {', '.join(f'`{t}`' for t in current)}")
+        else:
+            await message.channel.send("🔕 This channel receives no updates. Use `!subscribe SYMBOL|BUY|SELL|*`")
+
+    # Handle stats command
+    async def handle_stats_command(self, message):
+        # Split on line breaks if the summary is longer than one Discord message
+        response = "⏱️ **Bot Stats**\n" + "\n".join(self.app.metrics.summary())
+        await self.reply(message, response)
+
+    # Reply in the command's own channel (DMs included), split at Discord's message limit
+    async def reply(self, message, content):
+        for part in split_message([content]):
+            await message.channel.send(part)
+
+    # Handle PnL command
+    async def handle_pnl_command(self, message):
+        try:
+            # One snapshot prices every open position; it also refreshes the quote cache
+            app = self.app
+            positions = app.engine.snapshot.portfolio.positions
+            tickers = await app.market_data.get_tickers([p.symbol for p in positions]) if positions else {}
+            app.quotes.update(tickers)
+            prices = {symbol: float(ticker['lastPrice']) for symbol, ticker in tickers.items()}
+            response = format_pnl_message(await app.engine.submit(app.portfolio.mark, prices, limit=10))
+            await self.reply(message, response)
+        except Exception as e:
+            await message.channel.send(f"❌ Error computing PnL: {str(e)}")
+
+    # Handle order command
+    async def handle_order_command(self, message):
+        try:
+            # Format: !order BUY BTCUSDT 0.001 [TTL_MINUTES]
+            parts = message.content.split()
+            if len(parts) < 4:
+                await message.channel.send("❌ Usage: `!order BUY/SELL SYMBOL QUANTITY [TTL_MINUTES]`\nExample: `!order BUY BTCUSDT 0.001 10`")
+                return
+                
+            order_type = parts[1].upper()
+            symbol = parts[2].upper()
+            quantity = float(parts[3])
+            ttl = timedelta(minutes=float(parts[4])) if len(parts) > 4 else None
+            
+            if order_type not in ['BUY', 'SELL']:
+                await message.channel.send("❌ Order type must be BUY or SELL")
+                return
+                
+            # Get current price
+            ticker = await self.app.quotes.get(symbol)
+            current_price = float(ticker['lastPrice'])
+            
+            # Create a mock signal for the order
+            from src.schema import TradingSignal
+            from datetime import datetime
+            
+            signal = TradingSignal(
+                symbol=symbol,
+                signal_type=order_type,
+                price=current_price,
+                change_percent=float(ticker['priceChangePercent']),
+                volume=float(ticker['volume']),
+                timestamp=datetime.now(),
+                confidence=0.8
+            )
+            
+            order, expires_at = await self.app.engine.create_order(signal, quantity, ttl=ttl)
+            
+            response = f"✅ **Pseudo Order Created**\n"
+            response += f"🆔 ID: {order.id}\n"
+            response += f"📊 {order.order_type.value} {order.quantity} {order.symbol}\n"
+            response += f"💰 Price: ${order.price:,.4f}\n"
+            response += f"⏰ Created: {order.timestamp.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            response += f"⌛ Expires: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}"
+            
+            await message.channel.send(response)
+            
+        except Exception as e:
+            await message.channel.send(f"❌ Error creating order: {str(e)}")
+
+    # Handle signals command
+    async def handle_signals_command(self, message):
+        snapshot = self.app.engine.snapshot
+        active_signals = list(snapshot.active_signals)
+        pending_orders = list(snapshot.pending_orders)
+        
+        if not active_signals and not pending_orders:
+            await message.channel.send("📊 No active signals or pending orders found.")
+            return
+            
+        response = "📈 **Trading Dashboard**\n\n"
+        
+        if active_signals:
+            response += f"🔔 **Active Signals ({len(active_signals)}):**\n"
+            for signal in active_signals[-5:]:  # Show last 5
+                emoji = "🟢" if signal.signal_type == "BUY" else "🔴"
+                response += f"{emoji} {signal.symbol} {signal.signal_type} @ ${signal.price:,.4f} ({signal.change_percent:+.2f}%)\n"
+            response += "\n"
+            
+        if pending_orders:
+            response += f"⏳ **Pending Orders ({len(pending_orders)}):**\n"
+            for order in pending_orders[-3:]:  # Show last 3
+                emoji = "🟢" if order.order_type == OrderType.BUY else "🔴"
+                response += f"{emoji} {order.order_type.value} {order.quantity} {order.symbol} @ ${order.price:,.4f}\n"
+                
+        await message.channel.send(response)
+
+    # Handle price command
+    async def handle_price_command(self, message):
+        try:
+            # Extract symbol from command (!price BTC or !price BTCUSDT)
+            parts = message.content.split()
+            if len(parts) < 2:
+                await message.channel.send("❌ Please specify a symbol. Example: `!price BTC` or `!price BTCUSDT`")
+                return
+            
+            symbol = parts[1].upper()
+            
+            # If symbol doesn't end with USDT, add it
+            if not symbol.endswith('USDT'):
+                symbol += 'USDT'
+            
+            # Get ticker data
+            ticker = await self.app.quotes.get(symbol)
+            
+            # Format the response
+            price = float(ticker['lastPrice'])
+            change_percent = float(ticker['priceChangePercent'])
+            volume = float(ticker['volume'])
+            
+            # Choose emoji based on price change
+            emoji = "📈" if change_percent >= 0 else "📉"
+            change_sign = "+" if change_percent >= 0 else ""
+            
+            response = f"{emoji} **{symbol}**\n"
+            response += f"💰 Price: ${price:,.4f}\n"
+            response += f"📊 24h Change: {change_sign}{change_percent:.2f}%\n"
+            response += f"📈 24h Volume: {volume:,.2f}"
+            
+            await message.channel.send(response)
+            
+        except Exception as e:
+            error_msg = str(e)
+            if "Invalid symbol" in error_msg or "symbol does not exist" in error_msg.lower():
+                await message.channel.send(f"❌ Symbol `{symbol}` not found. Please check the symbol name.")
+            else:
+                await message.channel.send(f"❌ Error fetching price data: {error_msg}")
+
+    # called when a reaction is added to a message
+    async def on_reaction_add(self, reaction, user):
+        print(f'Reaction {reaction.emoji} added by {user.name} to message: {reaction.message.content}')
+        if user == self.user:
+            return
+        
+        if reaction.emoji == '👍':
+            await reaction.message.channel.send(f'Thanks for the thumbs up, {user.name}!')
+
+    # called when trade signals are fetched 
+    async def fetch_trade_signals(self):
+        await self.wait_until_ready()
+        for guild in self.guilds:
+            self.discover_channels(guild.text_channels)
+        await self.poll_forever()
+
+    # The market polling loop; runs until the client is closed
+    async def poll_forever(self):
+        app = self.app
+        timer = TickTimer(app.metrics, 'poll_tick', app.settings.poll_interval)
+
+        while not self.is_closed():
+            # One all-symbol snapshot per tick: scan the whole market for signals,
+            # then process pending orders against the same prices
+            with timer.tick():
+                try:
+                    filled_orders = await poll_market(app.market_data, app.validator, app.quotes, depth=app.depth_fills,
+                                                     engine=app.engine, scanner=app.scanner)
+                    if filled_orders:
+                        self.announce_fills(filled_orders)
+                except Exception as e:
+                    app.metrics.inc('poll_tick_errors_total')
+                    print(f"Error processing market snapshot: {e}")
+
+            await asyncio.sleep(app.settings.poll_interval)
+
+    # One merged message per channel per batch of fills, sent in the background
+    # only to the channels subscribed to each order's symbol or type
+    def announce_fills(self, orders):
+        self.announce(orders, format_fill_message)
+
+    def announce_cancellations(self, orders):
+        self.announce(orders, format_cancel_message)
+
+    def announce(self, orders, format_message):
+        events = ((order.symbol, order.order_type.value, format_message(order)) for order in orders)
+        for channel_ids, contents in self.app.subscriptions.route(events):
+            self.broadcaster.submit(channel_ids, contents)
+
+    # Channels the bot can write to get the default topics the first time they are seen;
+    # the others are muted, keeping their topics until the bot may write there again
+    def discover_channels(self, channels):
+        for channel in channels:
+            if channel.permissions_for(channel.guild.me).send_messages:
+                self.app.subscriptions.discover(channel.id)
+            else:
+                self.app.subscriptions.mute(channel.id)
+
+    # Keep the registry in step with guilds and channels while running
+    async def on_guild_join(self, guild):
+        self.discover_channels(guild.text_channels)
+
+    async def on_guild_remove(self, guild):
+        for channel in guild.text_channels:
+            self.app.subscriptions.remove_channel(channel.id)
+
+    async def on_guild_channel_create(self, channel):
+        if isinstance(channel, discord.TextChannel):
+            self.discover_channels([channel])
+
+    async def on_guild_channel_delete(self, channel):
+        self.app.subscriptions.remove_channel(channel.id)
+
+    async def on_guild_channel_update(self, before, after):
+        if isinstance(after, discord.TextChannel):
+            self.discover_channels([after])
+
+    # Helper function to broadcast messages to all channels
+    async def broadcast_message(self, channel_ids, content):
+        await self.broadcaster.broadcast(channel_ids, [content])
@@ -0,0 +1,145 @@
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float, clock: Optional[Callable[[], float]] = None):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = None
+
+    def _now(self) -> float:
+        return self._clock() if self._clock is not None else asyncio.get_running_loop().time()
+
+    def _refill(self):
+        now = self._now()
+        if self._updated is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def split_message(parts: Iterable[str], limit: int = DISCORD_MESSAGE_LIMIT,
+                  separator: str = "\n\n") -> List[str]:
+    """Pack message parts into as few messages of at most ``limit`` chars as possible.
+
+    Parts are never reordered; a single part longer than ``limit`` is split
+    on line breaks where possible, otherwise hard at the limit.
+    """
+    messages = []
+    current = ""
+    for part in parts:
+        for piece in _split_oversized(part, limit):
+            candidate = f"{current}{separator}{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                messages.append(current)
+                current = piece
+    if current:
+        messages.append(current)
+    return messages
+
+
+def _split_oversized(part: str, limit: int) -> List[str]:
+    if len(part) <= limit:
+        return [part]
+    pieces = []
+    while len(part) > limit:
+        cut = part.rfind("\n", 0, limit + 1)
+        if cut <= 0:
+            cut = limit
+        pieces.append(part[:cut])
+        part = part[cut:].lstrip("\n")
+    if part:
+        pieces.append(part)
+    return pieces
+
+
+class BroadcastScheduler:
+    """Sends messages to many channels concurrently within Discord's rate limits.
+
+    Each broadcast merges its contents into as few <=2000-char messages as
+    possible, then sends them to up to ``max_concurrency`` channels at a
+    time. Every channel has its own token bucket (Discord's per-route limit
+    is about 5 messages per 5 seconds per channel) and all sends share a
+    global bucket (about 50 requests per second per bot).
+    """
+
+    def __init__(self, get_channel: Callable[[int], object], max_concurrency: int = 10,
+                 channel_rate: float = 1.0, channel_burst: float = 5.0,
+                 global_rate: float = 45.0, global_burst: float = 45.0,
+                 skip_exceptions: Tuple[type, ...] = ()):
+        self.get_channel = get_channel
+        self.max_concurrency = max_concurrency
+        self.channel_rate = channel_rate
+        self.channel_burst = channel_burst
+        self.skip_exceptions = skip_exceptions  # e.g. (discord.Forbidden,): skip the channel silently
+        self.global_bucket = TokenBucket(global_rate, global_burst)
+        self._channel_buckets: Dict[int, TokenBucket] = {}
+        self._semaphore = None  # created lazily inside the running loop
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _bucket(self, channel_id: int) -> TokenBucket:
+        bucket = self._channel_buckets.get(channel_id)
+        if bucket is None:
+            bucket = self._channel_buckets[channel_id] = TokenBucket(self.channel_rate, self.channel_burst)
+        return bucket
+
+    async def _send_to_channel(self, channel_id: int, messages: List[str]) -> int:
+        channel = self.get_channel(channel_id)
+        if channel is None:
+            return 0
+        sent = 0
+        async with self._semaphore:
+            for message in messages:
+                await self._bucket(channel_id).acquire()
+                await self.global_bucket.acquire()
+                try:
+                    await channel.send(message)
+                except self.skip_exceptions:
+                    break
+                sent += 1
+        return sent
+
+    async def broadcast(self, channel_ids: Iterable[int], contents: Iterable[str]) -> int:
+        """Merge contents into messages and send them to every channel; returns messages sent"""
+        messages = split_message(contents)
+        if not messages:
+            return 0
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        channel_ids = list(channel_ids)
+        results = await asyncio.gather(
+            *(self._send_to_channel(channel_id, messages) for channel_id in channel_ids),
+            return_exceptions=True
+        )
+        sent = 0
+        for channel_id, result in zip(channel_ids, results):
+            if isinstance(result, BaseException):
+                print(f"Error broadcasting to channel {channel_id}: {result}")
+            else:
+                sent += result
+        return sent
+
+    def submit(self, channel_ids: Iterable[int], contents: Iterable[str]) -> asyncio.Task:
+        """Start a broadcast in the background so the caller's loop is not delayed"""
+        task = asyncio.get_running_loop().create_task(self.broadcast(list(channel_ids), list(contents)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
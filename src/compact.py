@@ -0,0 +1,176 @@
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+
+from src.schema import OrderStatus, OrderType, PseudoOrder
+
+NS_PER_SECOND = 10 ** 9
+NO_TIMESTAMP = -1
+
+# Enum <-> small integer codes
+ORDER_TYPES = (OrderType.BUY, OrderType.SELL)
+ORDER_TYPE_CODES = {t: i for i, t in enumerate(ORDER_TYPES)}
+ORDER_STATUSES = (OrderStatus.PENDING, OrderStatus.FILLED, OrderStatus.CANCELLED)
+ORDER_STATUS_CODES = {s: i for i, s in enumerate(ORDER_STATUSES)}
+SIGNAL_TYPES = ("BUY", "SELL")
+SIGNAL_TYPE_CODES = {t: i for i, t in enumerate(SIGNAL_TYPES)}
+
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds (microsecond exact)"""
+    return int(timestamp.replace(microsecond=0).timestamp()) * NS_PER_SECOND + timestamp.microsecond * 1000
+
+
+def from_epoch_ns(epoch_ns: int) -> datetime:
+    """Convert epoch nanoseconds back to a naive local datetime"""
+    seconds, ns = divmod(epoch_ns, NS_PER_SECOND)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000)
+
+
+def to_duration_ns(duration: Optional[timedelta]) -> int:
+    """Convert an optional timedelta to integer nanoseconds (NO_TIMESTAMP for None)"""
+    return duration // timedelta(microseconds=1) * 1000 if duration is not None else NO_TIMESTAMP
+
+
+def from_duration_ns(duration_ns: int) -> Optional[timedelta]:
+    return timedelta(microseconds=duration_ns // 1000) if duration_ns != NO_TIMESTAMP else None
+
+
+class SymbolTable:
+    """Interned symbols mapped to dense integer ids"""
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def intern(self, symbol: str) -> int:
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            symbol = sys.intern(symbol)
+            self.symbols.append(symbol)
+            self._ids[symbol] = symbol_id
+        return symbol_id
+
+
+class OrderColumns:
+    """Columnar, array-backed order storage handing out PseudoOrder copies.
+
+    Every field lives in a typed ``array.array``; only order ids stay as
+    Python strings. ``fill_price`` uses NaN and ``fill_timestamp`` uses
+    ``NO_TIMESTAMP`` for "not filled". Reading a row builds a new
+    PseudoOrder: changing it does not change the row until it is written
+    back with ``update`` (status/fill fields) or assigned to the row.
+    """
+
+    def __init__(self, symbols: Optional[SymbolTable] = None):
+        self.symbol_table = symbols or SymbolTable()
+        self.ids: List[str] = []
+        self.symbol_ids = array('I')
+        self.order_types = array('b')
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.timestamps_ns = array('q')
+        self.statuses = array('b')
+        self.fill_prices = array('d')
+        self.fill_timestamps_ns = array('q')
+        self.ttls_ns = array('q')
+        self.filled_quantities = array('d')
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[PseudoOrder]:
+        return (self[i] for i in range(len(self)))
+
+    def append(self, order: PseudoOrder) -> int:
+        """Store an order and return its row index"""
+        self.ids.append(order.id)
+        self.symbol_ids.append(self.symbol_table.intern(order.symbol))
+        self.order_types.append(ORDER_TYPE_CODES[order.order_type])
+        self.quantities.append(order.quantity)
+        self.prices.append(order.price)
+        self.timestamps_ns.append(to_epoch_ns(order.timestamp))
+        self.statuses.append(0)
+        self.fill_prices.append(float('nan'))
+        self.fill_timestamps_ns.append(NO_TIMESTAMP)
+        self.ttls_ns.append(to_duration_ns(order.ttl))
+        self.filled_quantities.append(0.0)
+        self.update(len(self.ids) - 1, order)
+        return len(self.ids) - 1
+
+    def __setitem__(self, index: int, order: PseudoOrder):
+        """Replace a whole row with ``order``"""
+        self.ids[index] = order.id
+        self.symbol_ids[index] = self.symbol_table.intern(order.symbol)
+        self.order_types[index] = ORDER_TYPE_CODES[order.order_type]
+        self.quantities[index] = order.quantity
+        self.prices[index] = order.price
+        self.timestamps_ns[index] = to_epoch_ns(order.timestamp)
+        self.ttls_ns[index] = to_duration_ns(order.ttl)
+        self.update(index, order)
+
+    def update(self, index: int, order: PseudoOrder):
+        """Write back the mutable (status/fill) fields of an order copy"""
+        self.statuses[index] = ORDER_STATUS_CODES[order.status]
+        self.filled_quantities[index] = order.filled_quantity
+        self.fill_prices[index] = order.fill_price if order.fill_price is not None else float('nan')
+        self.fill_timestamps_ns[index] = to_epoch_ns(order.fill_timestamp) if order.fill_timestamp else NO_TIMESTAMP
+
+    def __getitem__(self, index: int) -> PseudoOrder:
+        if index < 0:
+            index += len(self)
+        fill_price = self.fill_prices[index]
+        fill_ts = self.fill_timestamps_ns[index]
+        return PseudoOrder(
+            id=self.ids[index],
+            symbol=self.symbol_table.symbols[self.symbol_ids[index]],
+            order_type=ORDER_TYPES[self.order_types[index]],
+            quantity=self.quantities[index],
+            price=self.prices[index],
+            timestamp=from_epoch_ns(self.timestamps_ns[index]),
+            status=ORDER_STATUSES[self.statuses[index]],
+            fill_price=None if fill_price != fill_price else fill_price,  # NaN -> None
+            fill_timestamp=from_epoch_ns(fill_ts) if fill_ts != NO_TIMESTAMP else None,
+            ttl=from_duration_ns(self.ttls_ns[index]),
+            filled_quantity=self.filled_quantities[index]
+        )
+
+
+class OrderArchive:
+    """Bounded order history in OrderColumns, a drop-in for the ``deque(maxlen=...)`` archive.
+
+    Rows form a ring of ``maxlen`` slots: once full, each append overwrites
+    the oldest order. Indexing and iteration (oldest first) return
+    PseudoOrder copies, which suits settled orders that no longer change.
+    """
+
+    def __init__(self, maxlen: Optional[int] = None, symbols: Optional[SymbolTable] = None):
+        self.maxlen = maxlen
+        self.columns = OrderColumns(symbols)
+        self._start = 0  # row of the oldest order once the ring is full
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __iter__(self) -> Iterator[PseudoOrder]:
+        return (self[i] for i in range(len(self)))
+
+    def append(self, order: PseudoOrder):
+        if self.maxlen is None or len(self.columns) < self.maxlen:
+            self.columns.append(order)
+        elif self.maxlen > 0:
+            self.columns[self._start] = order
+            self._start = (self._start + 1) % self.maxlen
+
+    def __getitem__(self, index: int) -> PseudoOrder:
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('archive index out of range')
+        return self.columns[(self._start + index) % size]
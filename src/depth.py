@@ -0,0 +1,133 @@
+import json
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.schema import OrderType, PseudoOrder, TradingSignalValidator
+
+
+class DepthSnapshot(NamedTuple):
+    """Order-book depth of one symbol: (price, quantity) levels, best first"""
+    symbol: str
+    bids: np.ndarray  # shape (n, 2), prices descending
+    asks: np.ndarray  # shape (n, 2), prices ascending
+    timestamp: int = 0  # epoch ms, 0 if unknown
+
+    @classmethod
+    def from_binance(cls, symbol: str, depth: Dict, timestamp: int = 0) -> 'DepthSnapshot':
+        """Build from a GET /api/v3/depth response ({"bids": [["price", "qty"], ...], ...})"""
+        def levels(side):
+            array = np.array(depth.get(side) or [], dtype=np.float64).reshape(-1, 2)
+            return array[array[:, 1] > 0]
+        return cls(symbol, levels('bids'), levels('asks'), timestamp)
+
+    @property
+    def mid_price(self) -> Optional[float]:
+        if not len(self.bids) or not len(self.asks):
+            return None
+        return (self.bids[0, 0] + self.asks[0, 0]) / 2
+
+
+def read_depth_snapshots(path: str) -> Iterator[DepthSnapshot]:
+    """Stream snapshots from a JSON-lines file of depth responses with "symbol" (and optional "timestamp")"""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                depth = json.loads(line)
+                yield DepthSnapshot.from_binance(depth['symbol'], depth, depth.get('timestamp', 0))
+
+
+class DepthFill(NamedTuple):
+    order: PseudoOrder
+    quantity: float          # filled by this snapshot
+    price: float             # VWAP of the levels consumed
+    slippage_percent: float  # VWAP against the order price, positive = worse for the order
+
+
+def walk_book(levels: np.ndarray, quantities: np.ndarray, limits: np.ndarray, buy: bool):
+    """Match orders, sorted most aggressive first, against one side of the book.
+
+    Returns (filled quantity, VWAP) per order; VWAP is NaN where nothing filled.
+    """
+    prices, sizes = levels[:, 0], levels[:, 1]
+    cumulative_size = np.concatenate(([0.0], np.cumsum(sizes)))
+    cumulative_notional = np.concatenate(([0.0], np.cumsum(prices * sizes)))
+
+    # Depth each order may reach: every level priced within its limit
+    if buy:
+        reachable = cumulative_size[np.searchsorted(prices, limits, side='right')]
+    else:
+        reachable = cumulative_size[np.searchsorted(-prices, -limits, side='right')]
+
+    # With limits sorted most aggressive first, cumulative consumption after
+    # each order is the running max of min(cumulative demand, reachable depth)
+    consumed = np.maximum.accumulate(np.minimum(np.cumsum(quantities), reachable))
+    start = np.concatenate(([0.0], consumed[:-1]))
+    filled = consumed - start
+
+    notional = np.interp(consumed, cumulative_size, cumulative_notional) - \
+        np.interp(start, cumulative_size, cumulative_notional)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        vwap = np.where(filled > 0, notional / filled, np.nan)
+    return filled, vwap
+
+
+class DepthFillSimulator:
+    """Fills a validator's pending orders against order-book depth, with partial fills and slippage.
+
+    Instead of filling a whole order at the last price, each order walks the
+    opposite side of the book (asks for BUY, bids for SELL) up to its limit,
+    the order price plus or minus the fill tolerance. The orders of a symbol
+    and side are matched in one vectorized pass: most aggressive limit first,
+    each consuming the liquidity left by the ones before it. An order that
+    finds too little depth fills partially and stays pending; the fill price
+    is the VWAP of the levels consumed.
+    """
+
+    def __init__(self, validator: TradingSignalValidator, tolerance_percent: Optional[float] = None):
+        self.validator = validator
+        if tolerance_percent is None:
+            tolerance_percent = validator.FILL_TOLERANCE_PERCENT
+        self.tolerance = tolerance_percent / 100
+
+    def match(self, snapshot: DepthSnapshot, orders: Iterable[PseudoOrder]) -> List[DepthFill]:
+        """Compute the fills a snapshot gives the orders, without applying them"""
+        fills = []
+        by_side = {OrderType.BUY: [], OrderType.SELL: []}
+        for order in orders:
+            if order.symbol == snapshot.symbol and order.filled_quantity < order.quantity:
+                by_side[order.order_type].append(order)
+
+        for order_type, side_orders in by_side.items():
+            buy = order_type == OrderType.BUY
+            levels = snapshot.asks if buy else snapshot.bids
+            if not side_orders or not len(levels):
+                continue
+            prices = np.array([o.price for o in side_orders])
+            limits = prices * (1 + self.tolerance) if buy else prices * (1 - self.tolerance)
+            # Price priority, then creation order (stable sort)
+            ranking = np.argsort(-limits if buy else limits, kind='stable')
+            remaining = np.array([o.quantity - o.filled_quantity for o in side_orders])
+            filled, vwap = walk_book(levels, remaining[ranking], limits[ranking], buy)
+
+            slippage = (vwap - prices[ranking]) / prices[ranking] * 100
+            if not buy:
+                slippage = -slippage
+            for i in np.flatnonzero(filled > 0).tolist():
+                fills.append(DepthFill(side_orders[ranking[i]], float(filled[i]), float(vwap[i]),
+                                       float(slippage[i])))
+        return fills
+
+    def process_snapshot(self, snapshot: DepthSnapshot) -> List[DepthFill]:
+        """Match the symbol's pending orders against a snapshot and apply the fills"""
+        orders = self.validator.orders.in_price_range(snapshot.symbol, 0.0, float('inf'))
+        fills = self.match(snapshot, orders)
+        for fill in fills:
+            self.validator.apply_fill(fill.order, fill.quantity, fill.price)
+        return fills
+
+    def process_snapshots(self, snapshots: Iterable[DepthSnapshot]) -> List[DepthFill]:
+        fills = []
+        for snapshot in snapshots:
+            fills.extend(self.process_snapshot(snapshot))
+        return fills
@@ -0,0 +1,152 @@
+import asyncio
+import copy
+import time
+from datetime import datetime
+from datetime import timedelta
+from typing import Callable, FrozenSet, NamedTuple, Optional, Tuple
+
+from src.portfolio import PortfolioMark
+from src.schema import PseudoOrder, TradingSignal, TradingSignalValidator
+
+
+class EngineSnapshot(NamedTuple):
+    """Read-only view of validator state published by the engine after a batch"""
+    version: int                               # batches applied when it was taken
+    taken_at: datetime
+    pending_orders: Tuple[PseudoOrder, ...]    # copies, safe to read while the engine runs
+    active_signals: Tuple[TradingSignal, ...]  # signals are never mutated once stored
+    pending_symbols: FrozenSet[str] = frozenset()
+    # Unpriced mark of the validator's portfolio (realized PnL, open positions), if it has one
+    portfolio: Optional[PortfolioMark] = None
+
+
+class OrderResult(NamedTuple):
+    """What ``create_order`` hands back: a copy of the new order and when it expires"""
+    order: PseudoOrder
+    expires_at: datetime
+
+
+class TradingEngine:
+    """Single writer for a validator: every state change runs on one task, in queue order.
+
+    Commands (from Discord handlers) and market events (polling ticks,
+    stream updates, expiry) are queued with ``submit``, which returns a
+    future for the result, or ``post`` for fire-and-forget events. The
+    ``run`` task takes up to ``max_batch`` queued items at a time and
+    applies them back to back, then publishes a fresh ``snapshot`` that
+    readers use instead of touching the validator. Snapshots are
+    republished at most every ``snapshot_interval`` seconds unless a
+    command asks for one (``fresh=True``).
+    """
+
+    SIGNAL_WINDOW_MINUTES = 10
+
+    def __init__(self, validator: TradingSignalValidator, max_batch: int = 256,
+                 snapshot_interval: float = 0.25, metrics=None):
+        self.validator = validator
+        self.max_batch = max_batch
+        self.snapshot_interval = snapshot_interval
+        self.metrics = metrics  # optional src.metrics.Metrics receiving batch timings
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.version = 0
+        self.snapshot = self._take_snapshot()
+        self.publish_count = 0
+        self._published_at = float('-inf')
+        self._dirty = False
+
+    def submit(self, fn: Callable, *args, fresh: bool = False, **kwargs) -> asyncio.Future:
+        """Queue ``fn(*args, **kwargs)`` for the engine task; the future resolves to its result.
+
+        With ``fresh`` the snapshot is republished right after the batch
+        that runs it, so a reader following the command sees its effect.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((fn, args, kwargs, future, fresh))
+        return future
+
+    def post(self, fn: Callable, *args, **kwargs):
+        """Queue ``fn(*args, **kwargs)`` without waiting for it; errors are logged"""
+        self.queue.put_nowait((fn, args, kwargs, None, False))
+
+    def create_order(self, signal: TradingSignal, quantity: float,
+                     ttl: Optional[timedelta] = None) -> 'asyncio.Future[OrderResult]':
+        """Queue a new pseudo order; the future resolves to its OrderResult and the snapshot includes it"""
+        return self.submit(self._create_order, signal, quantity, ttl, fresh=True)
+
+    def _create_order(self, signal: TradingSignal, quantity: float, ttl: Optional[timedelta]) -> OrderResult:
+        order = self.validator.create_pseudo_order(signal, quantity, ttl=ttl)
+        return OrderResult(copy.copy(order), self.validator.order_expiry(order))
+
+    def _take_snapshot(self) -> EngineSnapshot:
+        validator = self.validator
+        pending = tuple(copy.copy(order) for order in validator.get_pending_orders())
+        portfolio = validator.portfolio
+        return EngineSnapshot(
+            version=self.version,
+            taken_at=validator.now(),
+            pending_orders=pending,
+            active_signals=tuple(validator.get_active_signals(self.SIGNAL_WINDOW_MINUTES)),
+            pending_symbols=frozenset(order.symbol for order in pending),
+            portfolio=portfolio.mark({}) if portfolio is not None else None,
+        )
+
+    def publish(self):
+        """Replace the published snapshot with the current state"""
+        self.snapshot = self._take_snapshot()
+        self._published_at = time.monotonic()
+        self._dirty = False
+        self.publish_count += 1
+
+    def process_batch(self, batch) -> int:
+        """Apply queued items in order and publish a snapshot when due; returns items applied"""
+        start = time.perf_counter()
+        fresh = False
+        for fn, args, kwargs, future, wants_fresh in batch:
+            if future is not None and future.cancelled():
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if future is not None:
+                    future.set_exception(e)
+                else:
+                    print(f"Engine event failed: {e}")
+                if self.metrics is not None:
+                    self.metrics.inc('engine_errors_total')
+            else:
+                if future is not None:
+                    future.set_result(result)
+            fresh = fresh or wants_fresh
+
+        self.version += 1
+        self._dirty = True
+        if fresh or time.monotonic() - self._published_at >= self.snapshot_interval:
+            self.publish()
+        if self.metrics is not None:
+            self.metrics.observe('engine_batch_seconds', time.perf_counter() - start)
+            self.metrics.inc('engine_events_total', len(batch))
+        return len(batch)
+
+    async def run(self):
+        """Engine task: apply queued items in micro-batches until cancelled"""
+        queue = self.queue
+        try:
+            while True:
+                if self._dirty:
+                    # Publish deferred changes once the queue goes quiet
+                    try:
+                        item = await asyncio.wait_for(queue.get(), timeout=self.snapshot_interval)
+                    except asyncio.TimeoutError:
+                        self.publish()
+                        continue
+                else:
+                    item = await queue.get()
+                batch = [item]
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+                self.process_batch(batch)
+        finally:
+            while not queue.empty():
+                future = queue.get_nowait()[3]
+                if future is not None:
+                    future.cancel()
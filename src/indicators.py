@@ -0,0 +1,153 @@
+import math
+from array import array
+from typing import Dict, Iterable, NamedTuple, Optional
+
+
+class Indicators(NamedTuple):
+    """Rolling indicator values of one symbol after its latest update"""
+    price: float
+    ema: float
+    volatility: float     # standard deviation of log returns over the window
+    vwap: float           # volume-weighted average price over the window (price if no volume)
+    volume_zscore: float  # latest volume against the window's mean and deviation
+    samples: int          # updates seen so far (the window is full once samples >= window)
+
+
+class SymbolIndicators:
+    """O(1) incremental EMA, volatility, VWAP and volume z-score for one symbol.
+
+    The last ``window`` returns, prices and volumes live in fixed-size ring
+    buffers next to running sums; each update adds the new sample to the
+    sums and subtracts the one it overwrites, so no update rescans the
+    window. The sums are rebuilt from the buffers every ``RESYNC_EVERY``
+    window lengths to keep floating-point error from accumulating.
+    """
+
+    RESYNC_EVERY = 64
+
+    __slots__ = ('window', 'alpha', 'ema', 'last_price', 'samples', '_pos',
+                 '_returns', '_prices', '_volumes', '_ret_sum', '_ret_sq', '_pv_sum',
+                 '_vol_sum', '_vol_sq', '_since_resync')
+
+    def __init__(self, window: int, ema_span: int):
+        self.window = window
+        self.alpha = 2.0 / (ema_span + 1)
+        self.ema = 0.0
+        self.last_price = 0.0
+        self.samples = 0
+        self._pos = 0
+        self._returns = array('d', bytes(8 * window))
+        self._prices = array('d', bytes(8 * window))
+        self._volumes = array('d', bytes(8 * window))
+        self._ret_sum = self._ret_sq = self._pv_sum = self._vol_sum = self._vol_sq = 0.0
+        self._since_resync = 0
+
+    def update(self, price: float, volume: float) -> Indicators:
+        pos = self._pos
+        if self.samples:
+            ret = math.log(price / self.last_price) if price > 0 and self.last_price > 0 else 0.0
+            self.ema += self.alpha * (price - self.ema)
+        else:
+            ret = 0.0
+            self.ema = price
+
+        old_ret, old_price, old_vol = self._returns[pos], self._prices[pos], self._volumes[pos]
+        self._ret_sum += ret - old_ret
+        self._ret_sq += ret * ret - old_ret * old_ret
+        self._pv_sum += price * volume - old_price * old_vol
+        self._vol_sum += volume - old_vol
+        self._vol_sq += volume * volume - old_vol * old_vol
+        self._returns[pos], self._prices[pos], self._volumes[pos] = ret, price, volume
+
+        self._pos = (pos + 1) % self.window
+        self.samples += 1
+        self.last_price = price
+        self._since_resync += 1
+        if self._since_resync >= self.RESYNC_EVERY * self.window:
+            self._resync()
+        return self.current(volume)
+
+    def _resync(self):
+        self._ret_sum = math.fsum(self._returns)
+        self._ret_sq = math.fsum(r * r for r in self._returns)
+        self._pv_sum = math.fsum(p * v for p, v in zip(self._prices, self._volumes))
+        self._vol_sum = math.fsum(self._volumes)
+        self._vol_sq = math.fsum(v * v for v in self._volumes)
+        self._since_resync = 0
+
+    def current(self, volume: Optional[float] = None) -> Indicators:
+        n = min(self.samples, self.window)
+        # The first sample has no return, so returns cover one sample less until the window fills
+        returns = n if self.samples > self.window else n - 1
+        volatility = 0.0
+        if returns > 1:
+            mean = self._ret_sum / returns
+            volatility = math.sqrt(max(self._ret_sq / returns - mean * mean, 0.0) * returns / (returns - 1))
+
+        vwap = self._pv_sum / self._vol_sum if self._vol_sum > 0 else self.last_price
+
+        if volume is None:
+            volume = self._volumes[(self._pos - 1) % self.window]
+        zscore = 0.0
+        if n > 1:
+            mean = self._vol_sum / n
+            variance = max(self._vol_sq / n - mean * mean, 0.0) * n / (n - 1)
+            if variance > 0:
+                zscore = (volume - mean) / math.sqrt(variance)
+
+        return Indicators(self.last_price, self.ema, volatility, vwap, zscore, self.samples)
+
+
+class IndicatorEngine:
+    """Per-symbol rolling indicators updated one price tick at a time.
+
+    ``update`` takes the volume traded since the symbol's previous update.
+    ``update_ticker`` accepts 24h ticker payloads and approximates that by
+    the increase of the rolling 24h volume since the previous snapshot
+    (clamped at zero, as the 24h window also drops old volume). For a
+    symbol already warmed through ``update`` the first snapshot only sets
+    that baseline, so no zero-volume sample lands on the warmed window.
+    """
+
+    def __init__(self, window: int = 60, ema_span: int = 20):
+        self.window = window
+        self.ema_span = ema_span
+        self._symbols: Dict[str, SymbolIndicators] = {}
+        self._last_volume_24h: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._symbols
+
+    def update(self, symbol: str, price: float, volume: float = 0.0) -> Indicators:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = self._symbols[symbol] = SymbolIndicators(self.window, self.ema_span)
+        return state.update(price, volume)
+
+    def update_ticker(self, symbol: str, price: float, volume_24h: float) -> Indicators:
+        """Update from a 24h ticker snapshot (price and rolling 24h volume)"""
+        previous = self._last_volume_24h.get(symbol)
+        self._last_volume_24h[symbol] = volume_24h
+        if previous is None:
+            state = self._symbols.get(symbol)
+            if state is not None:
+                return state.current()
+            return self.update(symbol, price, 0.0)
+        return self.update(symbol, price, max(volume_24h - previous, 0.0))
+
+    def update_many(self, symbols: Iterable[str], prices: Iterable[float],
+                    volumes_24h: Iterable[float]) -> Dict[str, Indicators]:
+        """Update from a whole-market snapshot; skips missing symbols and non-finite prices"""
+        results = {}
+        update_ticker = self.update_ticker
+        for symbol, price, volume in zip(symbols, prices, volumes_24h):
+            if symbol is not None and price > 0 and math.isfinite(price):
+                results[symbol] = update_ticker(symbol, price, volume if math.isfinite(volume) else 0.0)
+        return results
+
+    def get(self, symbol: str) -> Optional[Indicators]:
+        state = self._symbols.get(symbol)
+        return state.current() if state is not None else None
@@ -0,0 +1,320 @@
+"""Append-only binary journal of order and signal events with snapshots.
+
+Every group commit appends length-prefixed blocks (little endian)::
+
+    uint32 payload length | uint8 event type | uint32 crc32(payload) | payload
+
+An ORDER block holds variable-length order records, each the full current
+state of one order (an upsert keyed by order id). A SIGNAL block holds
+fixed-size signal records, so recovery can jump straight to the newest
+signals the store can hold. A snapshot file uses the same format and holds
+the complete validator state when it was taken; recovery replays the
+snapshot and then the journal written after it. A torn or corrupt tail block
+(crash mid-write) ends the replay and is truncated away.
+"""
+import asyncio
+import mmap
+import os
+import struct
+import zlib
+from collections import deque
+from typing import Dict, List, Tuple
+
+from src.compact import (
+    NO_TIMESTAMP, ORDER_STATUS_CODES, ORDER_STATUSES, ORDER_TYPE_CODES, ORDER_TYPES,
+    SIGNAL_TYPE_CODES, SIGNAL_TYPES, from_duration_ns, from_epoch_ns, to_duration_ns, to_epoch_ns
+)
+from src.schema import OrderStatus, PseudoOrder, TradingSignal
+
+ORDER_EVENT = 1
+SIGNAL_EVENT = 2
+
+SIGNAL_SYMBOL_SIZE = 24
+
+BLOCK_HEADER = struct.Struct('<IBI')
+# type, quantity, price, timestamp_ns, status, fill_price, fill_timestamp_ns, ttl_ns,
+# filled_quantity, id length, symbol length
+ORDER_RECORD = struct.Struct('<bddqbdqqdHH')
+# type, price, change_percent, volume, confidence, timestamp_ns, NUL-padded symbol
+SIGNAL_RECORD = struct.Struct(f'<bddddq{SIGNAL_SYMBOL_SIZE}s')
+
+PENDING_CODE = ORDER_STATUS_CODES[OrderStatus.PENDING]
+NAN = float('nan')
+
+
+def encode_order(order: PseudoOrder) -> bytes:
+    order_id = order.id.encode()
+    symbol = order.symbol.encode()
+    return ORDER_RECORD.pack(
+        ORDER_TYPE_CODES[order.order_type], order.quantity, order.price,
+        to_epoch_ns(order.timestamp), ORDER_STATUS_CODES[order.status],
+        order.fill_price if order.fill_price is not None else NAN,
+        to_epoch_ns(order.fill_timestamp) if order.fill_timestamp else NO_TIMESTAMP,
+        to_duration_ns(order.ttl), order.filled_quantity,
+        len(order_id), len(symbol)
+    ) + order_id + symbol
+
+
+def encode_signal(signal: TradingSignal) -> bytes:
+    symbol = signal.symbol.encode()
+    if len(symbol) > SIGNAL_SYMBOL_SIZE:
+        raise ValueError(f"Symbol too long for the journal: {signal.symbol}")
+    return SIGNAL_RECORD.pack(
+        SIGNAL_TYPE_CODES[signal.signal_type], signal.price, signal.change_percent,
+        signal.volume, signal.confidence, to_epoch_ns(signal.timestamp), symbol
+    )
+
+
+def encode_block(event_type: int, payload: bytes) -> bytes:
+    return BLOCK_HEADER.pack(len(payload), event_type, zlib.crc32(payload)) + payload
+
+
+def _decode_order(buffer, offset: int) -> PseudoOrder:
+    (order_type, quantity, price, timestamp_ns, status, fill_price, fill_ts, ttl_ns, filled_quantity,
+     id_length, symbol_length) = ORDER_RECORD.unpack_from(buffer, offset)
+    offset += ORDER_RECORD.size
+    order_id = bytes(buffer[offset:offset + id_length]).decode()
+    offset += id_length
+    symbol = bytes(buffer[offset:offset + symbol_length]).decode()
+    return PseudoOrder(
+        id=order_id,
+        symbol=symbol,
+        order_type=ORDER_TYPES[order_type],
+        quantity=quantity,
+        price=price,
+        timestamp=from_epoch_ns(timestamp_ns),
+        status=ORDER_STATUSES[status],
+        fill_price=None if fill_price != fill_price else fill_price,
+        fill_timestamp=from_epoch_ns(fill_ts) if fill_ts != NO_TIMESTAMP else None,
+        ttl=from_duration_ns(ttl_ns),
+        filled_quantity=filled_quantity
+    )
+
+
+def _decode_signal(buffer, offset: int) -> TradingSignal:
+    (signal_type, price, change_percent, volume, confidence, timestamp_ns,
+     symbol) = SIGNAL_RECORD.unpack_from(buffer, offset)
+    return TradingSignal(
+        symbol=symbol.rstrip(b'\0').decode(),
+        signal_type=SIGNAL_TYPES[signal_type],
+        price=price,
+        change_percent=change_percent,
+        volume=volume,
+        timestamp=from_epoch_ns(timestamp_ns),
+        confidence=confidence
+    )
+
+
+def decode_signals(buffer) -> List[TradingSignal]:
+    """Decode a buffer of back-to-back signal records (as written by encode_signal)"""
+    return [_decode_signal(buffer, offset) for offset in range(0, len(buffer), SIGNAL_RECORD.size)]
+
+
+def scan_blocks(buffer) -> Tuple[List[Tuple[int, int, int]], int]:
+    """Validate blocks in a buffer; return ([(event_type, start, stop)], valid_length)"""
+    blocks = []
+    offset = 0
+    end = len(buffer)
+    while offset + BLOCK_HEADER.size <= end:
+        length, event_type, checksum = BLOCK_HEADER.unpack_from(buffer, offset)
+        start = offset + BLOCK_HEADER.size
+        stop = start + length
+        if stop > end or zlib.crc32(buffer[start:stop]) != checksum:
+            break  # torn or corrupt tail
+        blocks.append((event_type, start, stop))
+        offset = stop
+    return blocks, offset
+
+
+class Journal:
+    """Group-committed write-ahead journal for a TradingSignalValidator.
+
+    ``record_*`` only encode into in-memory buffers, so they are cheap to
+    call from the event loop; ``run()`` commits the buffers in one write (and
+    fsync) per ``commit_interval`` on an executor thread and takes a
+    compacted snapshot every ``snapshot_interval`` seconds.
+    """
+
+    def __init__(self, path: str, commit_interval: float = 0.05, snapshot_interval: float = 300.0,
+                 fsync: bool = True):
+        self.path = path
+        self.snapshot_path = path + '.snapshot'
+        self.commit_interval = commit_interval
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self._orders = bytearray()
+        self._signals = bytearray()
+        self._lock = None  # created lazily inside the running loop
+        self._in_flight = None  # executor write of the last commit or compact
+
+    def record_order(self, order: PseudoOrder):
+        self._orders += encode_order(order)
+
+    def record_signal(self, signal: TradingSignal):
+        self._signals += encode_signal(signal)
+
+    # -- writing -----------------------------------------------------------
+
+    def _write(self, path: str, data: bytes, mode: str = 'ab'):
+        with open(path, mode) as f:
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _take_buffers(self) -> bytes:
+        data = b''
+        if self._orders:
+            data += encode_block(ORDER_EVENT, bytes(self._orders))
+        if self._signals:
+            data += encode_block(SIGNAL_EVENT, bytes(self._signals))
+        self._orders = bytearray()
+        self._signals = bytearray()
+        return data
+
+    def flush(self):
+        """Synchronously commit buffered events (for shutdown and tests)"""
+        data = self._take_buffers()
+        if data:
+            self._write(self.path, data)
+
+    def _snapshot_bytes(self, validator) -> bytes:
+        # The snapshot holds the full state, so buffered events are dropped
+        self._orders = bytearray()
+        self._signals = bytearray()
+        return (
+            encode_block(ORDER_EVENT, b''.join(encode_order(order) for order in validator.orders))
+            + encode_block(SIGNAL_EVENT, b''.join(encode_signal(signal) for signal in validator.signals))
+        )
+
+    def _install_snapshot(self, data: bytes):
+        tmp_path = self.snapshot_path + '.tmp'
+        self._write(tmp_path, data, mode='wb')
+        os.replace(tmp_path, self.snapshot_path)
+        self._write(self.path, b'', mode='wb')  # journal restarts after the snapshot
+
+    def snapshot(self, validator):
+        """Synchronously write a compacted snapshot and truncate the journal"""
+        self._install_snapshot(self._snapshot_bytes(validator))
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _in_executor(self, fn, *args):
+        # Shielded: cancelling the caller must not drop a write whose data already left the
+        # buffers, and run() waits for it before its final flush
+        self._in_flight = asyncio.get_running_loop().run_in_executor(None, fn, *args)
+        await asyncio.shield(self._in_flight)
+
+    async def commit(self):
+        """Commit buffered events on an executor thread"""
+        data = self._take_buffers()
+        if data:
+            async with self._get_lock():
+                await self._in_executor(self._write, self.path, data)
+
+    async def compact(self, validator):
+        """Take a snapshot off the event loop; events recorded meanwhile go to the new journal"""
+        data = self._snapshot_bytes(validator)
+        async with self._get_lock():
+            await self._in_executor(self._install_snapshot, data)
+
+    async def run(self, validator):
+        """Background task: group commit and periodic snapshots until cancelled"""
+        loop = asyncio.get_running_loop()
+        next_snapshot = loop.time() + self.snapshot_interval
+        try:
+            while True:
+                await asyncio.sleep(self.commit_interval)
+                if loop.time() >= next_snapshot:
+                    await self.compact(validator)
+                    next_snapshot = loop.time() + self.snapshot_interval
+                else:
+                    await self.commit()
+        finally:
+            try:
+                # A cancelled commit or compact keeps writing on its thread; flushing before it
+                # finishes could append out of order or be truncated by the snapshot
+                if self._in_flight is not None and not self._in_flight.done():
+                    await asyncio.wait([self._in_flight])
+            finally:
+                self.flush()
+
+    # -- recovery ----------------------------------------------------------
+
+    def _replay_file(self, path: str, orders: Dict[bytes, PseudoOrder], signals: deque,
+                     archive_limit: int) -> int:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+        replayed = 0
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            view = memoryview(buffer)
+            try:
+                blocks, valid_length = scan_blocks(view)
+
+                # Latest record of each order; re-assigning a key keeps its creation position
+                latest: Dict[bytes, Tuple[int, int]] = {}
+                signal_blocks = []
+                for event_type, start, stop in blocks:
+                    if event_type == ORDER_EVENT:
+                        offset = start
+                        while offset < stop:
+                            fields = ORDER_RECORD.unpack_from(view, offset)
+                            id_length, symbol_length = fields[-2:]
+                            id_start = offset + ORDER_RECORD.size
+                            latest[bytes(view[id_start:id_start + id_length])] = (offset, fields[4])
+                            offset = id_start + id_length + symbol_length
+                            replayed += 1
+                    elif event_type == SIGNAL_EVENT:
+                        signal_blocks.append((start, stop))
+                        replayed += (stop - start) // SIGNAL_RECORD.size
+
+                # Decode every pending order but only the settled ones the archive can hold
+                settled_left = archive_limit
+                keep = set()
+                for order_id, (_, status) in reversed(latest.items()):
+                    if status == PENDING_CODE:
+                        keep.add(order_id)
+                    elif settled_left > 0:
+                        keep.add(order_id)
+                        settled_left -= 1
+                for order_id, (offset, _) in latest.items():
+                    if order_id in keep:
+                        orders[order_id] = _decode_order(view, offset)
+                    else:
+                        orders.pop(order_id, None)
+
+                # Decode only the newest signals the store can hold
+                wanted = signals.maxlen
+                newest: List[int] = []
+                for start, stop in reversed(signal_blocks):
+                    offsets = range(start, stop, SIGNAL_RECORD.size)
+                    take = len(offsets) if wanted is None else min(len(offsets), wanted - len(newest))
+                    newest.extend(reversed(offsets[len(offsets) - take:]))
+                    if wanted is not None and len(newest) >= wanted:
+                        break
+                signals.extend(_decode_signal(view, offset) for offset in reversed(newest))
+            finally:
+                view.release()
+
+        if valid_length < os.path.getsize(path):
+            # Drop the torn tail so new records are appended after valid data
+            with open(path, 'r+b') as f:
+                f.truncate(valid_length)
+        return replayed
+
+    def recover(self, validator) -> int:
+        """Restore validator state from the snapshot and journal; returns events replayed"""
+        orders: Dict[bytes, PseudoOrder] = {}
+        signals: deque = deque(maxlen=validator.signals.max_signals)
+        archive_limit = validator.orders.archived.maxlen
+        if archive_limit is None:
+            archive_limit = float('inf')
+
+        replayed = self._replay_file(self.snapshot_path, orders, signals, archive_limit)
+        replayed += self._replay_file(self.path, orders, signals, archive_limit)
+
+        validator.restore_state(orders.values(), signals)
+        return replayed
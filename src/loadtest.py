@@ -0,0 +1,304 @@
+"""End-to-end load and soak test of the bot against in-process Discord and Binance stand-ins.
+
+The real Discord client and application (engine, journal, quote cache,
+polling loop, subscriptions and broadcasts) run on one event loop; only the
+edges are fake. src.testing.FakeDiscord delivers messages to ``on_message``
+and collects the replies, and FakeBinanceClient serves random-walk tickers
+with injected latency and errors. Commands arrive open-loop at a fixed rate,
+so a command's latency is measured from its scheduled arrival and includes
+any queueing behind slow ones.
+
+Usage: python -m src.loadtest [--rate N] [--duration SECONDS] [--mix price=6,order=2,signals=2] [--json]
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.app import Settings, create_app
+from src.broadcast import BroadcastScheduler
+from src.metrics import Histogram
+from src.testing import FakeBinanceClient, FakeDiscord
+
+COMMAND_MIX = {'price': 6.0, 'order': 2.0, 'signals': 2.0}
+# ~5% wide buckets from 10 us to 100 s: percentiles precise enough to compare runs
+FINE_BUCKETS = tuple(1e-5 * 1.05 ** i for i in range(331))
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'price=6,order=2,signals=2' -> command weights (commands: price, order, signals, pnl, stats)"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip().lstrip('!')
+        if name not in ('price', 'order', 'signals', 'pnl', 'stats'):
+            raise ValueError(f"Unknown command in mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def rss_bytes() -> int:
+    """Current resident set size (the peak where /proc is not available)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _percentiles(histogram: Histogram) -> Dict[str, float]:
+    return {'count': histogram.count,
+            'p50_ms': round(histogram.quantile(0.5) * 1000, 3),
+            'p99_ms': round(histogram.quantile(0.99) * 1000, 3),
+            'max_ms': round(histogram.max * 1000, 3)}
+
+
+def _growth_per_hour(samples: List[Tuple[float, int]]) -> float:
+    # Least-squares slope of RSS over time, so one late spike does not dominate
+    if len(samples) < 2 or samples[-1][0] <= samples[0][0]:
+        return 0.0
+    n = len(samples)
+    mean_t = sum(t for t, _ in samples) / n
+    mean_m = sum(m for _, m in samples) / n
+    var = sum((t - mean_t) ** 2 for t, _ in samples)
+    return sum((t - mean_t) * (m - mean_m) for t, m in samples) / var * 3600 if var else 0.0
+
+
+@dataclass
+class LoadReport:
+    duration: float
+    target_rate: float
+    commands: int = 0
+    completed: int = 0
+    shed: int = 0          # not started because max_in_flight commands were still running
+    failures: int = 0      # exceptions escaping on_message
+    error_replies: int = 0  # ❌ replies, e.g. commands hitting injected upstream errors
+    messages_sent: int = 0
+    latency: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    tick: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    memory: Dict[str, float] = field(default_factory=dict)
+    upstream_calls: Dict[str, int] = field(default_factory=dict)
+    state: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def achieved_rate(self) -> float:
+        return self.completed / self.duration if self.duration else 0.0
+
+    def summary(self) -> List[str]:
+        lines = [f"commands: {self.completed:,}/{self.commands:,} completed in {self.duration:.1f}s "
+                 f"({self.achieved_rate:,.0f}/s, target {self.target_rate:,.0f}/s), {self.shed:,} shed, "
+                 f"{self.failures:,} failed, {self.error_replies:,} error replies"]
+        for name, stats in self.latency.items():
+            lines.append(f"latency[{name}]: n={stats['count']:,} p50={stats['p50_ms']:.2f}ms "
+                         f"p99={stats['p99_ms']:.2f}ms max={stats['max_ms']:.2f}ms")
+        for name, stats in self.tick.items():
+            lines.append(f"{name}: n={stats['count']:,} p50={stats['p50_ms']:.2f}ms "
+                         f"p99={stats['p99_ms']:.2f}ms max={stats['max_ms']:.2f}ms")
+        memory = self.memory
+        lines.append(f"rss: {memory['start_mb']:.1f} -> {memory['end_mb']:.1f} MB "
+                     f"(peak {memory['peak_mb']:.1f}, {memory['growth_mb_per_hour']:+.1f} MB/h)")
+        lines.append("upstream calls: " + ', '.join(f"{k}={v:,}" for k, v in sorted(self.upstream_calls.items())))
+        lines.append("state: " + ', '.join(f"{k}={v:,}" for k, v in sorted(self.state.items())))
+        lines.append(f"discord messages sent: {self.messages_sent:,}")
+        return lines
+
+
+class LoadHarness:
+    """Drives the real bot with ``rate`` commands per second for ``duration`` seconds.
+
+    The polling loop ticks every ``poll_interval`` seconds against a market
+    of ``symbols`` random-walk prices, advanced every ``step_interval``.
+    Every fake channel subscribes to all fills and cancellations. Progress
+    lines go to ``progress`` every ``report_interval`` seconds, which, with
+    RSS sampled along the way, is what a multi-hour soak is watched by.
+    """
+
+    def __init__(self, rate: float = 1000.0, duration: float = 10.0, mix: Optional[Dict[str, float]] = None,
+                 symbols: int = 200, channels: int = 10, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, poll_interval: float = 1.0, step_interval: float = 0.5,
+                 max_in_flight: int = 10000, report_interval: float = 60.0, sample_interval: float = 5.0,
+                 directory: Optional[str] = None, seed: Optional[int] = None,
+                 progress: Optional[Callable[[str], None]] = None):
+        self.rate = rate
+        self.duration = duration
+        self.mix = mix or COMMAND_MIX
+        self.poll_interval = poll_interval
+        self.step_interval = step_interval
+        self.max_in_flight = max_in_flight
+        self.report_interval = report_interval
+        self.sample_interval = sample_interval
+        self.directory = directory
+        self.progress = progress
+        self.random = random.Random(seed)
+        self.binance = FakeBinanceClient(symbols=symbols, latency=latency, jitter=jitter,
+                                         error_rate=error_rate, seed=seed)
+        self.discord = FakeDiscord(channels=channels)
+        self.latency: Dict[str, Histogram] = {name: Histogram(FINE_BUCKETS) for name in ['all', *self.mix]}
+        self._in_flight: set = set()
+        self._memory: List[Tuple[float, int]] = []
+        self.report = LoadReport(duration=duration, target_rate=rate)
+
+    def _content(self, name: str) -> str:
+        symbol = self.random.choice(self.binance.symbols)
+        if name == 'price':
+            return f"!price {symbol}"
+        if name == 'order':
+            side = self.random.choice(('BUY', 'SELL'))
+            return f"!order {side} {symbol} {self.random.uniform(0.001, 1.0):.3f} {self.random.choice((1, 5))}"
+        return f"!{name}"
+
+    async def _command(self, client, name: str, scheduled: float):
+        loop = asyncio.get_running_loop()
+        try:
+            await client.on_message(self.discord.message(self._content(name)))
+        except Exception:
+            self.report.failures += 1
+        latency = loop.time() - scheduled
+        self.latency[name].observe(latency)
+        self.latency['all'].observe(latency)
+        self.report.completed += 1
+
+    async def _generate(self, client):
+        # Open loop: command i is due at start + i / rate whatever happened to earlier ones
+        loop = asyncio.get_running_loop()
+        names, weights = list(self.mix), list(self.mix.values())
+        start = loop.time()
+        total = int(self.rate * self.duration)
+        sent = 0
+        next_report = start + self.report_interval
+        while sent < total:
+            now = loop.time()
+            due = min(total, int((now - start) * self.rate) + 1)
+            for name in self.random.choices(names, weights, k=due - sent):
+                if len(self._in_flight) >= self.max_in_flight:
+                    self.report.shed += 1
+                else:
+                    task = loop.create_task(self._command(client, name, start + sent / self.rate))
+                    self._in_flight.add(task)
+                    task.add_done_callback(self._in_flight.discard)
+                sent += 1
+            self.report.commands = sent
+            if now >= next_report:
+                next_report += self.report_interval
+                self._progress(now - start)
+            await asyncio.sleep(0.001)
+
+    def _progress(self, elapsed: float):
+        if self.progress is None:
+            return
+        overall = self.latency['all']
+        self.progress(f"[{elapsed:8.0f}s] {self.report.completed:,} commands, {len(self._in_flight):,} in flight, "
+                      f"p50={overall.quantile(0.5) * 1000:.2f}ms p99={overall.quantile(0.99) * 1000:.2f}ms, "
+                      f"rss={rss_bytes() / 2 ** 20:.1f}MB")
+
+    async def _step_market(self):
+        while True:
+            await asyncio.sleep(self.step_interval)
+            self.binance.step()
+
+    async def _sample_memory(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        while True:
+            self._memory.append((loop.time() - start, rss_bytes()))
+            await asyncio.sleep(self.sample_interval)
+
+    async def run(self) -> LoadReport:
+        with contextlib.ExitStack() as stack:
+            directory = self.directory or stack.enter_context(tempfile.TemporaryDirectory())
+            # The bot prints every message it receives; keep that cost but not the output
+            stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, 'w'))))
+            settings = Settings(journal_path=os.path.join(directory, 'tradisb.journal'),
+                                ohlcv_dir=os.path.join(directory, 'ohlcv'),
+                                subscriptions_path=os.path.join(directory, 'subscriptions.json'),
+                                poll_interval=self.poll_interval, price_stream='off')
+            app = create_app(settings, client=self.binance)
+            client = app.create_client()
+            # Fake channels, and no Discord rate limits: the harness measures the bot, not the limiter
+            client.broadcaster = BroadcastScheduler(self.discord.get_channel, channel_rate=1e9, channel_burst=1e9,
+                                                    global_rate=1e9, global_burst=1e9)
+            for channel_id in self.discord.channels:
+                app.subscriptions.subscribe(channel_id, ['*'])
+
+            await client.setup_hook()
+            tasks = [asyncio.create_task(client.poll_forever()), asyncio.create_task(self._step_market()),
+                     asyncio.create_task(self._sample_memory())]
+            started = time.perf_counter()
+            try:
+                await self._generate(client)
+                if self._in_flight:
+                    await asyncio.wait(set(self._in_flight), timeout=30)
+            finally:
+                self.report.duration = time.perf_counter() - started
+                self._memory.append((self._memory[-1][0] + self.sample_interval if self._memory else 0.0,
+                                     rss_bytes()))
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await client.close()
+            self._finish(app)
+        return self.report
+
+    def _finish(self, app):
+        report = self.report
+        report.latency = {name: _percentiles(h) for name, h in self.latency.items()}
+        histograms = app.metrics.histograms
+        for name in ('poll_tick_drift_seconds', 'poll_tick_duration_seconds', 'event_loop_lag_seconds'):
+            series = histograms.get(name, {})
+            if series:
+                report.tick[name] = _percentiles(next(iter(series.values())))
+        sizes = [rss for _, rss in self._memory]
+        report.memory = {'start_mb': sizes[0] / 2 ** 20, 'end_mb': sizes[-1] / 2 ** 20,
+                         'peak_mb': max(sizes) / 2 ** 20,
+                         'growth_mb_per_hour': _growth_per_hour([(t, m / 2 ** 20) for t, m in self._memory])}
+        report.upstream_calls = dict(self.binance.calls)
+        report.error_replies = self.discord.error_replies
+        report.messages_sent = self.discord.messages_sent
+        validator = app.validator
+        report.state = {'pending_orders': len(validator.orders) - len(validator.orders.archived),
+                        'archived_orders': len(validator.orders.archived),
+                        'signals': len(validator.signals),
+                        'subscribed_channels': len(app.subscriptions)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load and soak test the bot against local Discord and Binance stand-ins")
+    parser.add_argument('--rate', type=float, default=1000.0, help='commands per second')
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds; hours for a soak, e.g. 14400')
+    parser.add_argument('--mix', type=parse_mix, default=COMMAND_MIX, help='command weights, e.g. price=6,order=2,signals=2')
+    parser.add_argument('--symbols', type=int, default=200)
+    parser.add_argument('--channels', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0, help='injected upstream latency, seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random upstream latency, up to seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of upstream calls that fail')
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--max-in-flight', type=int, default=10000)
+    parser.add_argument('--report-interval', type=float, default=60.0, help='seconds between progress lines')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', action='store_true', help='print machine-readable results')
+    args = parser.parse_args()
+
+    harness = LoadHarness(rate=args.rate, duration=args.duration, mix=args.mix, symbols=args.symbols,
+                          channels=args.channels, latency=args.latency, jitter=args.jitter,
+                          error_rate=args.error_rate, poll_interval=args.poll_interval,
+                          max_in_flight=args.max_in_flight, report_interval=args.report_interval,
+                          seed=args.seed, progress=lambda line: print(line, file=sys.stderr))
+    report = asyncio.run(harness.run())
+    if args.json:
+        print(json.dumps({**asdict(report), 'achieved_rate': report.achieved_rate}))
+        return
+    for line in report.summary():
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
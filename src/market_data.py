@@ -0,0 +1,119 @@
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class MarketDataTimeout(Exception):
+    """Raised when an upstream market data request takes too long"""
+
+
+class MarketDataClient:
+    """Async Binance market data access shared by the bot's coroutines.
+
+    All requests go through one pooled HTTP session, at most
+    ``max_concurrency`` of them are in flight at once and each one is
+    bounded by ``timeout`` seconds, so a slow REST round-trip never blocks
+    the Discord event loop.
+    """
+
+    # Above this many symbols the all-symbol ticker is cheaper in request weight
+    MAX_SYMBOLS_PER_REQUEST = 100
+
+    def __init__(self, api_key: str = '', api_secret: str = '', testnet: bool = True,
+                 max_concurrency: int = 10, timeout: float = 5.0, pool_size: int = 20,
+                 client=None, metrics=None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.client = client  # any object exposing async get_ticker(**params)
+        self._owns_client = client is None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.metrics = metrics  # optional src.metrics.Metrics receiving request latencies
+
+    async def connect(self):
+        """Open the pooled session (no-op if a client was injected)"""
+        if self.client is not None:
+            return self.client
+
+        import aiohttp
+        from binance import AsyncClient
+
+        self.client = AsyncClient(
+            api_key=self.api_key,
+            api_secret=self.api_secret,
+            testnet=self.testnet,
+            session_params={
+                'connector': aiohttp.TCPConnector(limit=self.pool_size),
+                'timeout': aiohttp.ClientTimeout(total=self.timeout),
+            },
+        )
+        return self.client
+
+    async def close(self):
+        """Close the pooled session if this instance created it"""
+        if self.client is not None and self._owns_client:
+            await self.client.close_connection()
+            self.client = None
+
+    async def _request(self, method: str, description: str, **params):
+        if self.client is None:
+            await self.connect()
+        async with self._semaphore:
+            start = time.perf_counter()
+            outcome = 'ok'
+            try:
+                return await asyncio.wait_for(
+                    getattr(self.client, method)(**params), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                outcome = 'timeout'
+                raise MarketDataTimeout(
+                    f"Timed out after {self.timeout:g}s fetching {description}"
+                ) from None
+            except Exception:
+                outcome = 'error'
+                raise
+            finally:
+                if self.metrics is not None:
+                    kind = 'symbol' if 'symbol' in params else 'symbols' if 'symbols' in params else 'all'
+                    self.metrics.observe('upstream_request_seconds', time.perf_counter() - start,
+                                         method=method, kind=kind, outcome=outcome)
+
+    async def get_ticker(self, symbol: str) -> Dict:
+        """Get the 24h ticker for a symbol"""
+        return await self._request('get_ticker', f"ticker for {symbol}", symbol=symbol)
+
+    async def get_tickers(self, symbols: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """Get one 24h ticker snapshot for many symbols, keyed by symbol.
+
+        Symbols are deduplicated and fetched with a single request: a
+        symbols-list request for small sets, the all-symbol ticker otherwise.
+        """
+        wanted = sorted(set(symbols)) if symbols is not None else None
+        if wanted is not None and not wanted:
+            return {}
+
+        if wanted is not None and len(wanted) <= self.MAX_SYMBOLS_PER_REQUEST:
+            tickers = await self._request(
+                'get_ticker', f"tickers for {len(wanted)} symbols",
+                symbols=json.dumps(wanted, separators=(',', ':'))
+            )
+        else:
+            tickers = await self._request('get_ticker', "all-symbol tickers")
+
+        snapshot = {t['symbol']: t for t in tickers}
+        if wanted is not None:
+            snapshot = {s: snapshot[s] for s in wanted if s in snapshot}
+        return snapshot
+
+    async def get_order_book(self, symbol: str, limit: int = 100) -> Dict:
+        """Get a depth snapshot (best ``limit`` bid and ask levels) for a symbol"""
+        return await self._request('get_order_book', f"order book for {symbol}", symbol=symbol, limit=limit)
+
+    async def get_klines(self, symbol: str, interval: str, **params) -> List[list]:
+        """Get klines of a symbol; ``params`` are startTime, endTime and limit as in GET /api/v3/klines"""
+        return await self._request('get_klines', f"{interval} klines for {symbol}",
+                                   symbol=symbol, interval=interval, **params)
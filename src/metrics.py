@@ -0,0 +1,228 @@
+import asyncio
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Latency bucket upper bounds in seconds: 100us to ~100s, roughly x2.5 per step
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 100.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = '') -> str:
+    parts = [f'{k}="{v}"' for k, v in key]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class Histogram:
+    """Fixed-bucket histogram: O(log buckets) per observation, no per-sample storage"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (the max for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class Metrics:
+    """In-process metrics registry: counters, gauges and latency histograms.
+
+    Metrics are identified by name plus labels. Gauges may be backed by a
+    callback that is evaluated only when the metrics are read, so store
+    sizes cost nothing on the hot path.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], float]] = {}
+        self._help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        """Set the HELP line of a metric in the Prometheus export"""
+        self._help[name] = help_text
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        series = self.histograms.setdefault(name, {})
+        key = _label_key(labels)
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        return histogram
+
+    def observe(self, name: str, value: float, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels):
+        self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def gauge_callback(self, name: str, callback: Callable[[], float]):
+        """Register a gauge whose value is read from ``callback`` at export time"""
+        self._gauge_callbacks[name] = callback
+
+    @contextmanager
+    def time(self, name: str, **labels):
+        """Observe the duration of the ``with`` block (also around awaits) in seconds"""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.histogram(name, **labels).observe(self.clock() - start)
+
+    def gauge_values(self) -> Dict[str, Dict[LabelKey, float]]:
+        gauges = {name: dict(series) for name, series in self.gauges.items()}
+        for name, callback in self._gauge_callbacks.items():
+            try:
+                gauges[name] = {(): float(callback())}
+            except Exception as e:
+                print(f"Error reading gauge {name}: {e}")
+        return gauges
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f"# HELP {name} {self._help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        for name, series in sorted(self.counters.items()):
+            header(name, 'counter')
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        for name, series in sorted(self.gauge_values().items()):
+            header(name, 'gauge')
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        for name, series in sorted(self.histograms.items()):
+            header(name, 'histogram')
+            for key, histogram in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    le = 'le="%g"' % bound
+                    lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                le = 'le="+Inf"'
+                lines.append(f"{name}_bucket{_format_labels(key, le)} {histogram.count}")
+                lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:g}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return '\n'.join(lines) + '\n'
+
+    def summary(self) -> List[str]:
+        """Human-readable lines: p50/p99/max per histogram series, then gauges and counters"""
+        lines = []
+        for name, series in sorted(self.histograms.items()):
+            for key, h in sorted(series.items()):
+                labels = ','.join(v for _, v in key)
+                title = f"{name}[{labels}]" if labels else name
+                lines.append(f"{title}: n={h.count} p50={h.quantile(0.5) * 1000:.1f}ms "
+                             f"p99={h.quantile(0.99) * 1000:.1f}ms max={h.max * 1000:.1f}ms")
+        for name, series in sorted(self.gauge_values().items()):
+            for key, value in sorted(series.items()):
+                labels = ','.join(v for _, v in key)
+                lines.append(f"{name}[{labels}]: {value:g}" if labels else f"{name}: {value:g}")
+        for name, series in sorted(self.counters.items()):
+            for key, value in sorted(series.items()):
+                labels = ','.join(v for _, v in key)
+                lines.append(f"{name}[{labels}]: {value:g}" if labels else f"{name}: {value:g}")
+        return lines
+
+
+async def monitor_event_loop(metrics: Metrics, interval: float = 0.5):
+    """Measure event-loop lag: how late a sleep of ``interval`` seconds wakes up"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        metrics.observe('event_loop_lag_seconds', lag)
+        metrics.set('event_loop_lag_last_seconds', lag)
+
+
+class TickTimer:
+    """Tracks the duration and drift of a fixed-interval loop.
+
+    Drift is how much later than ``interval`` after the previous tick a
+    tick started, i.e. the time the loop loses per iteration to slow ticks
+    and a busy event loop.
+    """
+
+    def __init__(self, metrics: Metrics, name: str, interval: float,
+                 clock: Callable[[], float] = time.monotonic):
+        self.metrics = metrics
+        self.name = name
+        self.interval = interval
+        self.clock = clock
+        self._last_start: Optional[float] = None
+
+    @contextmanager
+    def tick(self):
+        start = self.clock()
+        if self._last_start is not None:
+            drift = start - self._last_start - self.interval
+            self.metrics.observe(f'{self.name}_drift_seconds', max(0.0, drift))
+            self.metrics.set(f'{self.name}_drift_last_seconds', drift)
+        self._last_start = start
+        try:
+            yield
+        finally:
+            self.metrics.observe(f'{self.name}_duration_seconds', self.clock() - start)
+            self.metrics.inc(f'{self.name}_ticks_total')
+
+
+async def serve_metrics(metrics: Metrics, host: str = '127.0.0.1', port: int = 9108):
+    """Serve ``GET /metrics`` in the Prometheus text format until cancelled (requires aiohttp)"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(text=metrics.render_prometheus(), content_type='text/plain')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
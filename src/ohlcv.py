@@ -0,0 +1,298 @@
+"""Local on-disk OHLCV (kline) history, memory-mapped for zero-copy NumPy reads.
+
+Each symbol has one data file per interval, ``<root>/<interval>/<SYMBOL>.ohlcv``:
+a dense array of fixed-size ``KLINE_DTYPE`` rows where row ``i`` is the
+kline opening at ``base + i * interval`` (``base`` is kept in the index).
+A range of time is therefore a slice of the file, gap fills are in-place
+writes, and rows never fetched, or without trading, have ``open_time == 0``.
+
+Next to it, ``<SYMBOL>.index.json`` records ``base`` and the time ranges
+already fetched from Binance ("covered"), so only missing ranges are ever
+requested again. The index is replaced atomically after the data is
+flushed; a crash in between only causes a range to be fetched twice.
+Directories are created by the first write, so opening a store does no I/O.
+"""
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+KLINE_DTYPE = np.dtype([
+    ('open_time', '<i8'),     # epoch ms, 0 for an empty slot
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),        # base asset volume traded during the kline
+    ('quote_volume', '<f8'),
+    ('trades', '<i8'),
+])
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+KLINES_PER_REQUEST = 1000  # Binance's maximum page size
+
+
+def parse_klines(klines: List[list]) -> np.ndarray:
+    """Rows of a GET /api/v3/klines response as a KLINE_DTYPE array"""
+    rows = np.zeros(len(klines), dtype=KLINE_DTYPE)
+    if klines:
+        rows['open_time'] = [k[0] for k in klines]
+        for i, field in enumerate(('open', 'high', 'low', 'close', 'volume'), start=1):
+            rows[field] = np.array([k[i] for k in klines], dtype=np.float64)
+        rows['quote_volume'] = np.array([k[7] for k in klines], dtype=np.float64)
+        rows['trades'] = [k[8] for k in klines]
+    return rows
+
+
+def _merge(ranges: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class OHLCVStore:
+    """Per-symbol kline history under ``root`` for one interval, filled incrementally from Binance"""
+
+    def __init__(self, root: str, interval: str = '1m'):
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported kline interval: {interval}")
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.directory = os.path.join(root, interval)
+        self._indexes: Dict[str, dict] = {}
+        self._maps: Dict[str, np.memmap] = {}
+
+    # -- index -------------------------------------------------------------
+
+    def _path(self, symbol: str, suffix: str) -> str:
+        return os.path.join(self.directory, f"{symbol}{suffix}")
+
+    def _index(self, symbol: str) -> dict:
+        index = self._indexes.get(symbol)
+        if index is None:
+            try:
+                with open(self._path(symbol, '.index.json')) as f:
+                    index = json.load(f)
+                index['covered'] = [tuple(r) for r in index['covered']]
+            except FileNotFoundError:
+                index = {'base': None, 'covered': []}
+            self._indexes[symbol] = index
+        return index
+
+    def _save_index(self, symbol: str):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(symbol, '.index.json')
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self._indexes[symbol], f)
+        os.replace(path + '.tmp', path)
+
+    def symbols(self) -> List[str]:
+        suffix = '.index.json'
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.directory) if name.endswith(suffix))
+
+    def covered(self, symbol: str) -> List[Tuple[int, int]]:
+        """Fetched [start, end) ranges of a symbol, in epoch ms"""
+        return list(self._index(symbol)['covered'])
+
+    def _align(self, start: int, end: int) -> Tuple[int, int]:
+        step = self.interval_ms
+        return start // step * step, -(-end // step) * step
+
+    def gaps(self, symbol: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Interval-aligned [start, end) ranges within [start, end) not fetched yet"""
+        start, end = self._align(start, end)
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self._index(symbol)['covered']:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def mark_covered(self, symbol: str, start: int, end: int):
+        index = self._index(symbol)
+        index['covered'] = _merge(index['covered'] + [self._align(start, end)])
+        self._save_index(symbol)
+
+    # -- data --------------------------------------------------------------
+
+    def _map(self, symbol: str) -> Optional[np.memmap]:
+        mapped = self._maps.get(symbol)
+        if mapped is None:
+            path = self._path(symbol, '.ohlcv')
+            if not os.path.exists(path) or os.path.getsize(path) < KLINE_DTYPE.itemsize:
+                return None
+            mapped = self._maps[symbol] = np.memmap(path, dtype=KLINE_DTYPE, mode='r+')
+        return mapped
+
+    def write(self, symbol: str, rows: np.ndarray):
+        """Store KLINE_DTYPE rows in their time slots, growing the file as needed"""
+        rows = rows[rows['open_time'] > 0]
+        if not len(rows):
+            return
+        index = self._index(symbol)
+        step = self.interval_ms
+        first = int(rows['open_time'].min()) // step * step
+        path = self._path(symbol, '.ohlcv')
+        os.makedirs(self.directory, exist_ok=True)
+
+        if index['base'] is None:
+            index['base'] = first
+        elif first < index['base']:
+            # Rare: history before the first stored kline. Write a shifted copy and
+            # swap it in, so views of the old file stay valid
+            shift = (index['base'] - first) // step
+            existing = self._maps.pop(symbol, None)
+            if existing is None:
+                existing = self._map(symbol)
+                self._maps.pop(symbol, None)
+            with open(path + '.tmp', 'wb') as f:
+                f.write(bytes(shift * KLINE_DTYPE.itemsize))
+                if existing is not None:
+                    f.write(existing.tobytes())
+            os.replace(path + '.tmp', path)
+            index['base'] = first
+
+        slots = (rows['open_time'] - index['base']) // step
+        needed = int(slots.max()) + 1
+        current = os.path.getsize(path) // KLINE_DTYPE.itemsize if os.path.exists(path) else 0
+        if needed > current:
+            # Grow by at least a day of rows so appending one kline at a time stays
+            # cheap; the file only ever grows, so existing views remain valid
+            grow_to = max(needed, current + max(1, 86_400_000 // step))
+            self._maps.pop(symbol, None)
+            with open(path, 'ab') as f:
+                f.truncate(grow_to * KLINE_DTYPE.itemsize)
+
+        mapped = self._map(symbol)
+        mapped[slots] = rows
+        mapped.flush()
+        self._save_index(symbol)
+
+    def read(self, symbol: str, start: int, end: int) -> np.ndarray:
+        """Zero-copy view of the kline slots opening in [start, end); empty slots have open_time 0"""
+        mapped = self._map(symbol)
+        base = self._index(symbol)['base']
+        if mapped is None or base is None:
+            return np.zeros(0, dtype=KLINE_DTYPE)
+        first = max((start - base + self.interval_ms - 1) // self.interval_ms, 0)
+        last = min(max((end - base + self.interval_ms - 1) // self.interval_ms, 0), len(mapped))
+        return mapped[first:max(first, last)]
+
+    def tail(self, symbol: str, count: int) -> np.ndarray:
+        """The last ``count`` stored klines of a symbol (empty slots skipped)"""
+        mapped = self._map(symbol)
+        if mapped is None:
+            return np.zeros(0, dtype=KLINE_DTYPE)
+        filled = np.flatnonzero(mapped['open_time'] != 0)
+        return mapped[filled[-count:]] if count > 0 else mapped[:0]
+
+    # -- fetching ----------------------------------------------------------
+
+    async def _get_klines(self, client, **params) -> List[list]:
+        if asyncio.iscoroutinefunction(client.get_klines):
+            return await client.get_klines(**params)
+        # Synchronous python-binance Client: keep the event loop free
+        return await asyncio.to_thread(client.get_klines, **params)
+
+    async def sync(self, client, symbol: str, start: int, end: Optional[int] = None,
+                   now: Optional[int] = None) -> int:
+        """Fetch the missing klines of [start, end) (epoch ms) through ``client``; returns rows fetched.
+
+        ``client`` is a python-binance ``Client`` or ``AsyncClient``. Only
+        closed klines are fetched, so a covered range never changes later.
+        """
+        if now is None:
+            now = int(time.time() * 1000)
+        end = min(end if end is not None else now, now // self.interval_ms * self.interval_ms)
+        fetched = 0
+        for gap_start, gap_end in self.gaps(symbol, start, end):
+            cursor = gap_start
+            while cursor < gap_end:
+                klines = await self._get_klines(
+                    client, symbol=symbol, interval=self.interval, startTime=cursor,
+                    endTime=gap_end - 1, limit=KLINES_PER_REQUEST
+                )
+                rows = parse_klines(klines)
+                self.write(symbol, rows)
+                fetched += len(rows)
+                if len(rows) < KLINES_PER_REQUEST:
+                    break
+                cursor = int(rows['open_time'][-1]) + self.interval_ms
+            self.mark_covered(symbol, gap_start, gap_end)
+        return fetched
+
+
+def resample_ticks(rows: np.ndarray, interval_ms: int, tick_ms: int, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The last ``count`` (price, volume) samples of ``rows`` on a ``tick_ms`` grid ending at the last close.
+
+    Prices are interpolated linearly between kline opens and closes and each
+    sample's volume is what traded since the previous one, assuming trading
+    is spread evenly over a kline, so the samples match ticks polled every
+    ``tick_ms``. Gaps between stored klines are bridged.
+    """
+    if not len(rows):
+        return np.zeros(0), np.zeros(0)
+    times = np.concatenate(([rows['open_time'][0]], rows['open_time'] + interval_ms)).astype(np.float64)
+    prices = np.concatenate(([rows['open'][0]], rows['close']))
+    traded = np.concatenate(([0.0], np.cumsum(rows['volume'])))
+    grid = times[-1] - tick_ms * np.arange(count, -1, -1, dtype=np.float64)
+    grid = grid[grid >= times[0]]
+    volumes = np.diff(np.interp(grid, times, traded))
+    return np.interp(grid[1:], times, prices), volumes
+
+
+def warm_indicators(store: OHLCVStore, indicators, symbols: Optional[Iterable[str]] = None,
+                    tick_interval: float = 5.0) -> int:
+    """Replay the newest stored klines into a src.indicators.IndicatorEngine; returns symbols warmed.
+
+    The engine is fed one polled ticker every ``tick_interval`` seconds, so the
+    klines are resampled to that interval (see resample_ticks) rather than
+    replayed one kline per update.
+    """
+    tick_ms = max(int(tick_interval * 1000), 1)
+    count = indicators.window + 1
+    klines = -(-count * tick_ms // store.interval_ms) + 1
+    warmed = 0
+    for symbol in symbols if symbols is not None else store.symbols():
+        rows = store.tail(symbol, klines)
+        if not len(rows):
+            continue
+        prices, volumes = resample_ticks(rows, store.interval_ms, tick_ms, count)
+        for price, volume in zip(prices.tolist(), volumes.tolist()):
+            indicators.update(symbol, price, volume)
+        warmed += 1
+    return warmed
+
+
+async def sync_history_periodically(store: OHLCVStore, client, symbols: Iterable[str], lookback_ms: int,
+                                    interval: float = 60.0):
+    """Background task: keep the last ``lookback_ms`` of each symbol's history filled"""
+    symbols = list(symbols)
+    while True:
+        start = int(time.time() * 1000) - lookback_ms
+        for symbol in symbols:
+            try:
+                await store.sync(client, symbol, start)
+            except Exception as e:
+                print(f"Error syncing {symbol} history: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,117 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from itertools import count
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.timer_wheel import TimingWheel
+
+
+class SymbolBook:
+    """Pending orders of one symbol kept sorted by order price.
+
+    Fill bands (order price +/- tolerance) are monotonic in the order price,
+    so the orders one market price can fill form a contiguous slice that is
+    found with two bisections.
+    """
+
+    def __init__(self):
+        self.keys: List[Tuple[float, int]] = []
+        self.orders: Dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key: Tuple[float, int], order):
+        insort(self.keys, key)
+        self.orders[key[1]] = order
+
+    def remove(self, key: Tuple[float, int]):
+        index = bisect_left(self.keys, key)
+        if index < len(self.keys) and self.keys[index] == key:
+            del self.keys[index]
+            del self.orders[key[1]]
+
+    def in_price_range(self, low: float, high: float) -> List:
+        start = bisect_left(self.keys, (low, -1))
+        end = bisect_right(self.keys, (high, float('inf')))
+        return [self.orders[seq] for _, seq in self.keys[start:end]]
+
+
+class OrderBook:
+    """Order store with a per-symbol price index for pending orders.
+
+    Orders stay in the pending index until they are archived; archived
+    (filled or cancelled) orders go to a bounded history that the fill path
+    never touches. With a ``deadline`` function (order -> epoch seconds)
+    pending orders are also kept in a timing wheel, and ``due`` returns
+    the ones whose deadline has passed.
+    """
+
+    def __init__(self, archive_size: int = 10000, deadline: Optional[Callable[[object], float]] = None,
+                 archive=None):
+        self._pending: Dict[str, object] = {}  # insertion (creation) order
+        self._keys: Dict[str, Tuple[float, int]] = {}
+        self._symbols: Dict[str, SymbolBook] = {}
+        self._seq = count()
+        self._deadline = deadline
+        self._expiry = TimingWheel()
+        # Any bounded append-only sequence, e.g. src.compact.OrderArchive
+        self.archived = archive if archive is not None else deque(maxlen=archive_size)
+
+    def __len__(self) -> int:
+        return len(self._pending) + len(self.archived)
+
+    def __iter__(self) -> Iterator:
+        yield from self.archived
+        yield from list(self._pending.values())
+
+    def __contains__(self, order) -> bool:
+        return order.id in self._pending
+
+    def append(self, order):
+        """Add a pending order to the index"""
+        key = (order.price, next(self._seq))
+        self._pending[order.id] = order
+        self._keys[order.id] = key
+        self._symbols.setdefault(order.symbol, SymbolBook()).add(key, order)
+        if self._deadline is not None:
+            self._expiry.schedule(order.id, self._deadline(order), order)
+
+    def archive(self, order):
+        """Move an order out of the pending index into the archive"""
+        key = self._keys.pop(order.id, None)
+        if key is None:
+            return
+        del self._pending[order.id]
+        self._expiry.cancel(order.id)
+        book = self._symbols[order.symbol]
+        book.remove(key)
+        if not book:
+            del self._symbols[order.symbol]
+        self.archived.append(order)
+
+    def pending(self) -> List:
+        """All indexed pending orders, oldest first"""
+        return list(self._pending.values())
+
+    def iter_pending(self) -> Iterator:
+        """Iterate indexed pending orders lazily, oldest first (do not archive while iterating)"""
+        return iter(self._pending.values())
+
+    def pending_symbols(self) -> List[str]:
+        """Symbols that have at least one pending order"""
+        return list(self._symbols)
+
+    def in_price_range(self, symbol: str, low: float, high: float) -> List:
+        """Pending orders of a symbol whose price lies in [low, high]"""
+        book = self._symbols.get(symbol)
+        if book is None:
+            return []
+        return book.in_price_range(low, high)
+
+    def due(self, now: float) -> List:
+        """Pending orders whose deadline is at or before ``now`` (epoch seconds), earliest first.
+
+        They leave the expiry schedule but stay pending until archived.
+        """
+        return self._expiry.advance(now)
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Dict, List
+
+from src.depth import DepthSnapshot
+from src.schema import OrderStatus, OrderType, PseudoOrder, TradingSignalValidator
+
+
+def format_fill_message(order: PseudoOrder) -> str:
+    """Discord message announcing a filled order"""
+    fill_msg = f"✅ **Order Filled**\n"
+    fill_msg += f"🆔 {order.id}\n"
+    fill_msg += f"📊 {order.order_type.value} {order.quantity} {order.symbol}\n"
+    fill_msg += f"💰 Fill Price: ${order.fill_price:,.4f}"
+    if order.fill_price != order.price:
+        slippage = (order.fill_price - order.price) / order.price * 100
+        if order.order_type == OrderType.SELL:
+            slippage = -slippage
+        fill_msg += f" ({slippage:+.3f}% slippage)"
+    return fill_msg
+
+
+def format_cancel_message(order: PseudoOrder) -> str:
+    """Discord message announcing an order cancelled on timeout"""
+    cancel_msg = "⌛ **Order Expired**\n"
+    cancel_msg += f"🆔 {order.id}\n"
+    cancel_msg += f"📊 {order.order_type.value} {order.quantity} {order.symbol} @ ${order.price:,.4f}"
+    return cancel_msg
+
+
+async def apply(engine, fn, *args, **kwargs):
+    """Run a validator state change on the engine task when there is one, inline otherwise"""
+    if engine is None:
+        return fn(*args, **kwargs)
+    return await engine.submit(fn, *args, **kwargs)
+
+
+async def expire_orders_periodically(validator: TradingSignalValidator, interval: float = 1.0, engine=None):
+    """Background task: cancel orders as their deadlines pass, independent of price checks"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await apply(engine, validator.expire_orders)
+        except Exception as e:
+            print(f"Error expiring orders: {e}")
+
+
+def fill_from_tickers(validator: TradingSignalValidator, tickers: Dict[str, Dict]) -> List[PseudoOrder]:
+    """Fill pending orders at the last prices of a ticker snapshot"""
+    prices = {
+        symbol: float(tickers[symbol]['lastPrice'])
+        for symbol in validator.orders.pending_symbols() if symbol in tickers
+    }
+    return validator.process_price_snapshot(prices)
+
+
+def process_market_snapshot(validator: TradingSignalValidator, tickers: Dict[str, Dict]) -> List[PseudoOrder]:
+    """Scan an all-symbol snapshot for signals and fill pending orders at its last prices"""
+    validator.generate_trading_signals(tickers.values())
+    return fill_from_tickers(validator, tickers)
+
+
+async def poll_market(market_data, validator: TradingSignalValidator, quotes=None,
+                      depth=None, engine=None, scanner=None) -> List[PseudoOrder]:
+    """One background tick: fetch an all-symbol snapshot, scan it for signals and fill pending orders.
+
+    The snapshot also warms ``quotes`` (a src.quote_cache.QuoteCache) when
+    given. With ``depth`` (a src.depth.DepthFillSimulator) pending orders
+    are matched against order-book snapshots of their symbols instead of
+    the last price. With ``engine`` (a src.engine.TradingEngine) validator
+    changes run on the engine task. With ``scanner`` (a
+    src.sharding.ShardedScanner) signals are generated by its worker
+    processes. Returns the orders completely filled on this tick.
+    """
+    tickers = await market_data.get_tickers()
+    if quotes is not None:
+        quotes.update(tickers)
+
+    if depth is None and scanner is None:
+        return await apply(engine, process_market_snapshot, validator, tickers)
+
+    if scanner is not None:
+        await apply(engine, validator.add_signals, await scanner.scan(tickers.values()))
+    else:
+        await apply(engine, validator.generate_trading_signals, list(tickers.values()))
+    if depth is not None:
+        return await fill_from_depth(market_data, validator, depth, engine)
+    return await apply(engine, fill_from_tickers, validator, tickers)
+
+
+def process_depth_snapshots(validator: TradingSignalValidator, depth,
+                            snapshots: List[DepthSnapshot]) -> List[PseudoOrder]:
+    """Fill pending orders from depth snapshots and expire overdue ones"""
+    filled = []
+    for snapshot in snapshots:
+        fills = depth.process_snapshot(snapshot)
+        filled.extend(fill.order for fill in fills if fill.order.status == OrderStatus.FILLED)
+    validator.expire_orders()
+    return filled
+
+
+async def fill_from_depth(market_data, validator: TradingSignalValidator, depth, engine=None) -> List[PseudoOrder]:
+    """Fetch one depth snapshot per symbol with pending orders and fill them through ``depth``"""
+    symbols = await apply(engine, lambda: list(validator.orders.pending_symbols()))
+    books = await asyncio.gather(*(market_data.get_order_book(symbol) for symbol in symbols),
+                                 return_exceptions=True)
+    snapshots = []
+    for symbol, book in zip(symbols, books):
+        if isinstance(book, Exception):
+            print(f"Error fetching order book for {symbol}: {book}")
+        else:
+            snapshots.append(DepthSnapshot.from_binance(symbol, book))
+    return await apply(engine, process_depth_snapshots, validator, depth, snapshots)
@@ -0,0 +1,178 @@
+import math
+from array import array
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional
+
+from src.schema import OrderType, PseudoOrder
+
+
+class PositionMark(NamedTuple):
+    """One position valued at a market price"""
+    symbol: str
+    quantity: float        # signed: positive long, negative short
+    average_cost: float
+    price: float           # NaN when the snapshot had no price for the symbol
+    unrealized_pnl: float
+    realized_pnl: float
+
+
+class PortfolioMark(NamedTuple):
+    """Totals of a mark-to-market pass over every position"""
+    realized_pnl: float
+    unrealized_pnl: float
+    exposure: float        # sum of |quantity| * price over priced open positions
+    open_positions: int
+    unpriced: int          # open positions the snapshot had no price for
+    positions: List[PositionMark]
+
+
+class Portfolio:
+    """Net positions, average cost and realized PnL built up one fill at a time.
+
+    Each symbol owns one slot in parallel ``array('d')`` columns (signed
+    quantity, average cost, realized PnL), so a fill is an O(1) update of
+    three floats, and ``mark`` values every position at once through
+    zero-copy NumPy views of the columns. Fills that reduce a position
+    realize (price - average cost) on the closed quantity; fills that flip
+    it open the remainder at the fill price.
+    """
+
+    def __init__(self):
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self.quantities = array('d')
+        self.average_costs = array('d')
+        self.realized = array('d')
+        self.fills = 0
+        self.open_positions = 0
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def _slot(self, symbol: str) -> int:
+        index = self._index.get(symbol)
+        if index is None:
+            index = self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            self.quantities.append(0.0)
+            self.average_costs.append(0.0)
+            self.realized.append(0.0)
+        return index
+
+    def apply_fill(self, symbol: str, quantity: float, price: float):
+        """Add a fill of signed ``quantity`` (positive buys, negative sells) at ``price``"""
+        if not quantity:
+            return
+        i = self._slot(symbol)
+        position = self.quantities[i]
+        cost = self.average_costs[i]
+        new_position = position + quantity
+
+        if position == 0 or (position > 0) == (quantity > 0):
+            self.average_costs[i] = (cost * abs(position) + price * abs(quantity)) / abs(new_position)
+        else:
+            closed = min(abs(quantity), abs(position))
+            self.realized[i] += closed * (price - cost) * (1.0 if position > 0 else -1.0)
+            if abs(new_position) <= abs(position) * 1e-12:
+                new_position = 0.0  # flat, including float dust from partial fills
+                self.average_costs[i] = 0.0
+            elif (new_position > 0) != (position > 0):
+                self.average_costs[i] = price  # flipped: the remainder opens at the fill price
+        self.quantities[i] = new_position
+        self.open_positions += bool(new_position) - bool(position)
+        self.fills += 1
+
+    def apply_order_fill(self, order: PseudoOrder, quantity: float, price: float):
+        """Add a fill of a pseudo order (the validator's fill hook)"""
+        self.apply_fill(order.symbol, quantity if order.order_type == OrderType.BUY else -quantity, price)
+
+    def open_symbols(self) -> List[str]:
+        return [symbol for symbol, quantity in zip(self.symbols, self.quantities) if quantity]
+
+    def position(self, symbol: str) -> Optional[PositionMark]:
+        """Position of a symbol without a price (unrealized PnL is NaN)"""
+        i = self._index.get(symbol)
+        if i is None:
+            return None
+        return PositionMark(symbol, self.quantities[i], self.average_costs[i], float('nan'),
+                            float('nan'), self.realized[i])
+
+    def mark(self, prices: Mapping[str, float], limit: Optional[int] = None) -> PortfolioMark:
+        """Value every position against one price snapshot (symbol -> price).
+
+        ``positions`` lists the open positions by exposure, largest first
+        and unpriced ones last, cut to the first ``limit`` when given.
+        """
+        n = len(self.symbols)
+        if not n:
+            return PortfolioMark(0.0, 0.0, 0.0, 0, 0, [])
+        import numpy as np  # imported on first use so building the app does not load NumPy
+
+        # Views share the columns' memory; they must not outlive this call, as
+        # an array('d') with exported buffers cannot grow
+        quantities = np.frombuffer(self.quantities, dtype=np.float64)
+        costs = np.frombuffer(self.average_costs, dtype=np.float64)
+        realized = np.frombuffer(self.realized, dtype=np.float64)
+        nan = float('nan')
+        market = np.fromiter((prices.get(symbol, nan) for symbol in self.symbols), dtype=np.float64, count=n)
+
+        open_ = quantities != 0
+        priced = open_ & ~np.isnan(market)
+        unrealized = np.where(priced, quantities * (market - costs), 0.0)
+        exposure = np.where(priced, np.abs(quantities * market), 0.0)
+
+        # Largest exposure first; unpriced open positions sort after every priced one
+        order = np.flatnonzero(open_)
+        order = order[np.argsort(np.where(priced[order], -exposure[order], np.inf), kind='stable')]
+        if limit is not None:
+            order = order[:limit]
+        positions = [
+            PositionMark(self.symbols[i], float(quantities[i]), float(costs[i]), float(market[i]),
+                         float(unrealized[i]) if priced[i] else nan, float(realized[i]))
+            for i in order.tolist()
+        ]
+        return PortfolioMark(
+            realized_pnl=float(realized.sum()),
+            unrealized_pnl=float(unrealized.sum()),
+            exposure=float(exposure.sum()),
+            open_positions=int(open_.sum()),
+            unpriced=int((open_ & ~priced).sum()),
+            positions=positions,
+        )
+
+    def rebuild(self, orders: Iterable[PseudoOrder]):
+        """Replay the filled quantity of recovered orders, oldest first.
+
+        Each order counts as one fill at its average fill price, which only
+        approximates realized PnL when an order's fills interleaved with
+        fills of other orders on the same symbol.
+        """
+        for order in orders:
+            if order.filled_quantity > 0 and order.fill_price is not None:
+                self.apply_order_fill(order, order.filled_quantity, order.fill_price)
+
+
+def format_pnl_message(mark: PortfolioMark) -> str:
+    """Discord message summarizing a portfolio mark and its listed positions"""
+    if not mark.open_positions and not mark.realized_pnl:
+        return "💼 No open positions or realized PnL yet."
+
+    total = mark.realized_pnl + mark.unrealized_pnl
+    response = "💼 **Portfolio PnL**\n"
+    response += f"💰 Total: ${total:+,.2f} (realized ${mark.realized_pnl:+,.2f}, unrealized ${mark.unrealized_pnl:+,.2f})\n"
+    response += f"📊 Exposure: ${mark.exposure:,.2f} across {mark.open_positions} open positions"
+    if mark.unpriced:
+        response += f" ({mark.unpriced} without a price)"
+
+    if mark.positions:
+        response += "\n"
+        for position in mark.positions:
+            emoji = "🟢" if position.quantity > 0 else "🔴"
+            response += f"\n{emoji} {position.symbol} {position.quantity:+g} @ ${position.average_cost:,.4f}"
+            if not math.isnan(position.price):
+                response += f" → ${position.price:,.4f} ({position.unrealized_pnl:+,.2f})"
+        if mark.open_positions > len(mark.positions):
+            response += f"\n… and {mark.open_positions - len(mark.positions)} more"
+    return response
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+
+class QuoteCache:
+    """Shared short-lived ticker cache for the command path.
+
+    Fresh quotes (younger than ``ttl`` seconds) are answered from memory;
+    concurrent misses for one symbol share a single in-flight upstream
+    request, so the upstream request rate stays flat however many users ask
+    at once. At most ``max_size`` symbols are kept, least recently used
+    evicted first. ``update`` warms the cache from snapshots the background
+    loop already fetched.
+    """
+
+    def __init__(self, fetch: Callable[[str], Awaitable[Dict]], ttl: float = 2.0,
+                 max_size: int = 5000, clock: Callable[[], float] = time.monotonic,
+                 metrics=None):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+        self.metrics = metrics  # optional src.metrics.Metrics counting hits and misses
+        self._quotes: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def _count(self, result: str):
+        if self.metrics is not None:
+            self.metrics.inc('quote_cache_requests_total', result=result)
+
+    def put(self, symbol: str, ticker: Dict, fetched_at: Optional[float] = None):
+        """Store a quote, evicting the least recently used symbol when full"""
+        self._quotes[symbol] = (self.clock() if fetched_at is None else fetched_at, ticker)
+        self._quotes.move_to_end(symbol)
+        while len(self._quotes) > self.max_size:
+            self._quotes.popitem(last=False)
+
+    def update(self, tickers: Dict[str, Dict]):
+        """Warm the cache from a symbol-keyed ticker snapshot.
+
+        Cached symbols are refreshed in place; new ones are added only while
+        there is room, so warming never evicts symbols users asked for.
+        """
+        now = self.clock()
+        quotes = self._quotes
+        for symbol, ticker in tickers.items():
+            if symbol in quotes or len(quotes) < self.max_size:
+                quotes[symbol] = (now, ticker)
+
+    def peek(self, symbol: str) -> Optional[Dict]:
+        """The cached quote if it is still fresh, without fetching"""
+        entry = self._quotes.get(symbol)
+        if entry is None or self.clock() - entry[0] > self.ttl:
+            return None
+        self._quotes.move_to_end(symbol)
+        return entry[1]
+
+    async def get(self, symbol: str) -> Dict:
+        """A quote no older than ``ttl`` seconds, fetching it at most once for concurrent callers"""
+        ticker = self.peek(symbol)
+        if ticker is not None:
+            self._count('hit')
+            return ticker
+
+        future = self._in_flight.get(symbol)
+        if future is not None:
+            self._count('coalesced')
+            # Shield so one cancelled waiter does not cancel the shared request
+            return await asyncio.shield(future)
+
+        self._count('miss')
+        future = asyncio.ensure_future(self._fetch(symbol))
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())  # mark errors retrieved
+        self._in_flight[symbol] = future
+        return await asyncio.shield(future)
+
+    async def _fetch(self, symbol: str) -> Dict:
+        try:
+            ticker = await self.fetch(symbol)
+            self.put(symbol, ticker)
+            return ticker
+        finally:
+            del self._in_flight[symbol]
@@ -0,0 +1,399 @@
+"""Offline replay / backtest of the signal and fill logic over historical data.
+
+Historical ticker or kline files (CSV or Parquet) are streamed in chunks of
+NumPy columns, merged across files by timestamp and fed step by step (one
+step per distinct timestamp) through a TradingSignalValidator running on a
+simulated clock.
+
+Usage: python -m src.replay FILE [FILE ...] [--format kline|ticker] [--quantity Q]
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+from src.scanner import TickerColumns
+from src.schema import OrderType, TradingSignalValidator
+
+# Column names of headerless Binance kline dumps (data.binance.vision)
+KLINE_COLUMNS = ['open_time', 'open', 'high', 'low', 'close', 'volume', 'close_time',
+                 'quote_volume', 'count', 'taker_buy_volume', 'taker_buy_quote_volume', 'ignore']
+
+
+class SimulatedClock:
+    """Settable time source for TradingSignalValidator(clock=...)"""
+
+    def __init__(self, start: Optional[datetime] = None):
+        self.current = start or datetime.fromtimestamp(0)
+
+    def __call__(self) -> datetime:
+        return self.current
+
+    def set(self, timestamp: datetime):
+        self.current = timestamp
+
+
+class TickBatch(NamedTuple):
+    """A chunk of ticker rows sorted by timestamp (epoch milliseconds)"""
+    timestamps: np.ndarray      # int64
+    symbols: np.ndarray         # object
+    last_price: np.ndarray      # float64
+    change_percent: np.ndarray  # float64
+    volume: np.ndarray          # float64
+
+    def take(self, index) -> 'TickBatch':
+        return TickBatch(*(column[index] for column in self))
+
+
+# -- reading ---------------------------------------------------------------
+
+def _csv_chunks(path: str, chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+        if first[0].strip().lstrip('-').replace('.', '', 1).isdigit():
+            names, pending = KLINE_COLUMNS[:len(first)], [first]
+        else:
+            names, pending = [name.strip() for name in first], []
+
+        while True:
+            rows = pending
+            pending = []
+            for row in reader:
+                rows.append(row)
+                if len(rows) >= chunk_rows:
+                    break
+            if not rows:
+                return
+            yield {name: np.array(column) for name, column in zip(names, zip(*rows))}
+
+
+def _parquet_chunks(path: str, chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)") from None
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows):
+        yield {name: column.to_numpy(zero_copy_only=False)
+               for name, column in zip(batch.schema.names, batch.columns)}
+
+
+def read_chunks(path: str, chunk_rows: int = 100000) -> Iterator[Dict[str, np.ndarray]]:
+    """Stream a CSV or Parquet file as dicts of NumPy columns, chunk_rows rows at a time"""
+    if path.endswith('.parquet'):
+        return _parquet_chunks(path, chunk_rows)
+    return _csv_chunks(path, chunk_rows)
+
+
+def _timestamps_ms(column: np.ndarray) -> np.ndarray:
+    if column.dtype.kind in 'iuf':
+        return column.astype(np.int64)
+    try:
+        return column.astype(np.float64).astype(np.int64)
+    except ValueError:
+        # ISO-8601 strings
+        return np.array([int(datetime.fromisoformat(value).timestamp() * 1000) for value in column],
+                        dtype=np.int64)
+
+
+def _symbol_column(chunk: Dict[str, np.ndarray], symbol: Optional[str], rows: int) -> np.ndarray:
+    if 'symbol' in chunk:
+        return chunk['symbol'].astype(object)
+    if symbol is None:
+        raise ValueError("Data has no symbol column; pass symbol= (or name the file SYMBOL-....csv)")
+    return np.full(rows, symbol, dtype=object)
+
+
+def ticker_batches(path: str, symbol: Optional[str] = None, chunk_rows: int = 100000) -> Iterator[TickBatch]:
+    """Stream a ticker history file (timestamp, symbol, lastPrice, priceChangePercent, volume)"""
+    for chunk in read_chunks(path, chunk_rows):
+        timestamps = _timestamps_ms(chunk['timestamp'])
+        yield TickBatch(
+            timestamps=timestamps,
+            symbols=_symbol_column(chunk, symbol, len(timestamps)),
+            last_price=chunk['lastPrice'].astype(np.float64),
+            change_percent=chunk['priceChangePercent'].astype(np.float64),
+            volume=chunk['volume'].astype(np.float64),
+        )
+
+
+class RollingTicker:
+    """Turns per-symbol kline closes into 24h-ticker-style rows.
+
+    ``priceChangePercent`` is the change against the close ``window`` rows
+    earlier and ``volume`` the rolling volume sum over the same rows, both
+    computed vectorized per symbol and chunk. The last ``window`` rows of
+    each symbol are carried over between chunks. Klines are assumed to be
+    gap-free at a fixed interval; a gap only stretches the window.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._carry: Dict[str, tuple] = {}  # symbol -> (closes, volumes) of the last window rows
+
+    def transform(self, timestamps: np.ndarray, symbols: np.ndarray, close: np.ndarray,
+                  volume: np.ndarray) -> TickBatch:
+        change = np.full(len(close), np.nan)
+        rolling_volume = np.full(len(close), np.nan)
+
+        order = np.argsort(symbols, kind='stable')
+        sorted_symbols = symbols[order]
+        bounds = np.flatnonzero(sorted_symbols[1:] != sorted_symbols[:-1]) + 1
+        for rows in np.split(order, bounds):
+            if not len(rows):
+                continue
+            symbol = symbols[rows[0]]
+            carried_close, carried_volume = self._carry.get(symbol, (np.empty(0), np.empty(0)))
+            closes = np.concatenate([carried_close, close[rows]])
+            volumes = np.concatenate([carried_volume, volume[rows]])
+            offset = len(carried_close)
+
+            # Change vs. the close `window` rows back (NaN until the window is full)
+            positions = np.arange(offset, len(closes))
+            back = positions - self.window
+            valid = back >= 0
+            change[rows[valid]] = (closes[positions[valid]] / closes[back[valid]] - 1.0) * 100.0
+
+            cumulative = np.concatenate([[0.0], np.cumsum(volumes)])
+            rolling_volume[rows] = cumulative[positions + 1] - cumulative[np.maximum(back + 1, 0)]
+
+            self._carry[symbol] = (closes[-self.window:], volumes[-self.window:])
+
+        return TickBatch(timestamps, symbols, close, change, rolling_volume)
+
+
+def kline_batches(path: str, symbol: Optional[str] = None, interval: timedelta = timedelta(minutes=1),
+                  window: timedelta = timedelta(hours=24), chunk_rows: int = 100000) -> Iterator[TickBatch]:
+    """Stream a kline file as rolling 24h ticker rows keyed by the kline close time"""
+    if symbol is None:
+        symbol = os.path.basename(path).split('-')[0].split('.')[0].upper() or None
+    rolling = RollingTicker(window=int(window / interval))
+    for chunk in read_chunks(path, chunk_rows):
+        open_time = _timestamps_ms(chunk['open_time'] if 'open_time' in chunk else chunk['timestamp'])
+        timestamps = open_time + int(interval.total_seconds() * 1000)
+        yield rolling.transform(
+            timestamps,
+            _symbol_column(chunk, symbol, len(open_time)),
+            chunk['close'].astype(np.float64),
+            chunk['volume'].astype(np.float64),
+        )
+
+
+def store_batches(store, symbol: str, start: int, end: int, window: timedelta = timedelta(hours=24),
+                  chunk_rows: int = 100000) -> Iterator[TickBatch]:
+    """Stream a symbol's klines from a src.ohlcv.OHLCVStore as rolling 24h ticker rows"""
+    rolling = RollingTicker(window=int(window / timedelta(milliseconds=store.interval_ms)))
+    rows = store.read(symbol, start, end)
+    for offset in range(0, len(rows), chunk_rows):
+        chunk = rows[offset:offset + chunk_rows]
+        chunk = chunk[chunk['open_time'] != 0]
+        if len(chunk):
+            yield rolling.transform(
+                chunk['open_time'] + store.interval_ms,
+                np.full(len(chunk), symbol, dtype=object),
+                chunk['close'].astype(np.float64),
+                chunk['volume'].astype(np.float64),
+            )
+
+
+def merge_streams(streams: List[Iterable[TickBatch]]) -> Iterator[TickBatch]:
+    """Merge timestamp-sorted batch streams into one timestamp-sorted stream.
+
+    Only rows up to the smallest "latest timestamp" among the buffered
+    batches are emitted each round, so no stream ever needs to be read
+    ahead by more than one chunk.
+    """
+    iterators = [iter(stream) for stream in streams]
+    buffers: List[Optional[TickBatch]] = [next(it, None) for it in iterators]
+
+    while True:
+        live = [i for i, batch in enumerate(buffers) if batch is not None]
+        if not live:
+            return
+        watermark = min(buffers[i].timestamps[-1] for i in live)
+
+        parts = []
+        for i in live:
+            batch = buffers[i]
+            cut = np.searchsorted(batch.timestamps, watermark, side='right')
+            parts.append(batch.take(slice(0, cut)))
+            if cut == len(batch.timestamps):
+                buffers[i] = next(iterators[i], None)
+            else:
+                buffers[i] = batch.take(slice(cut, None))
+
+        merged = TickBatch(*(np.concatenate(columns) for columns in zip(*parts)))
+        yield merged.take(np.argsort(merged.timestamps, kind='stable'))
+
+
+# -- replay ----------------------------------------------------------------
+
+@dataclass
+class ReplayStats:
+    steps: int = 0
+    rows: int = 0
+    signals: int = 0
+    orders: int = 0
+    fills: int = 0
+    cancelled: int = 0
+    pending: int = 0
+    total_fill_latency_seconds: float = 0.0
+    cash: float = 0.0
+    positions: Dict[str, float] = field(default_factory=dict)
+    last_prices: Dict[str, float] = field(default_factory=dict)
+    pnl: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def fill_rate(self) -> float:
+        return self.fills / self.orders if self.orders else 0.0
+
+    @property
+    def avg_fill_latency_seconds(self) -> float:
+        return self.total_fill_latency_seconds / self.fills if self.fills else 0.0
+
+    def to_dict(self) -> Dict:
+        result = asdict(self)
+        del result['last_prices']
+        result['fill_rate'] = self.fill_rate
+        result['avg_fill_latency_seconds'] = self.avg_fill_latency_seconds
+        return result
+
+
+class ReplayEngine:
+    """Replays tick batches through a TradingSignalValidator on a simulated clock.
+
+    Every step runs the vectorized signal scan, optionally opens one pseudo
+    order per signal (at most one pending order per symbol), then fills
+    pending orders against the step's prices. Fills update cash and
+    positions in O(1); the final PnL marks positions to the last prices.
+    """
+
+    def __init__(self, validator: Optional[TradingSignalValidator] = None, order_quantity: float = 1.0,
+                 trade_signals: bool = True, order_storage: str = 'dataclass'):
+        self.clock = SimulatedClock()
+        self.validator = validator or TradingSignalValidator(None, order_storage=order_storage)
+        self.validator.clock = self.clock
+        self.order_quantity = order_quantity
+        self.trade_signals = trade_signals
+        self.stats = ReplayStats()
+
+    def run(self, batches: Iterable[TickBatch]) -> ReplayStats:
+        started = time.perf_counter()
+        for batch in batches:
+            self.replay_batch(batch)
+        return self.finish(time.perf_counter() - started)
+
+    def replay_batch(self, batch: TickBatch):
+        timestamps = batch.timestamps
+        if not len(timestamps):
+            return
+        bounds = np.flatnonzero(timestamps[1:] != timestamps[:-1]) + 1
+        starts = [0, *bounds.tolist()]
+        stops = [*bounds.tolist(), len(timestamps)]
+        for start, stop in zip(starts, stops):
+            self._step(batch, start, stop)
+
+        # Last price per symbol in this batch (first occurrence in reverse)
+        symbols = batch.symbols[::-1]
+        _, first = np.unique(symbols.astype(str), return_index=True)
+        self.stats.last_prices.update(zip(symbols[first].tolist(), batch.last_price[::-1][first].tolist()))
+        self.stats.rows += len(timestamps)
+
+    def _step(self, batch: TickBatch, start: int, stop: int):
+        validator = self.validator
+        stats = self.stats
+        self.clock.set(datetime.fromtimestamp(int(batch.timestamps[start]) / 1000))
+        stats.steps += 1
+
+        columns = TickerColumns(
+            symbols=batch.symbols[start:stop],
+            last_price=batch.last_price[start:stop],
+            change_percent=batch.change_percent[start:stop],
+            volume=batch.volume[start:stop],
+        )
+        # Fill orders opened on earlier steps first, so an order never fills on its own tick
+        pending_symbols = validator.orders.pending_symbols()
+        if pending_symbols:
+            step_prices = dict(zip(columns.symbols.tolist(), columns.last_price.tolist()))
+            prices = {s: step_prices[s] for s in pending_symbols if s in step_prices}
+            for order in validator.process_price_snapshot(prices):
+                self._record_fill(order)
+
+        signals = validator.generate_signals_from_columns(columns)
+        stats.signals += len(signals)
+
+        if self.trade_signals and signals:
+            busy = set(validator.orders.pending_symbols())
+            for signal in signals:
+                if signal.symbol not in busy:
+                    validator.create_pseudo_order(signal, self.order_quantity)
+                    busy.add(signal.symbol)
+                    stats.orders += 1
+
+    def _record_fill(self, order):
+        stats = self.stats
+        stats.fills += 1
+        stats.total_fill_latency_seconds += (order.fill_timestamp - order.timestamp).total_seconds()
+        signed = order.quantity if order.order_type == OrderType.BUY else -order.quantity
+        stats.cash -= signed * order.fill_price
+        stats.positions[order.symbol] = stats.positions.get(order.symbol, 0.0) + signed
+
+    def finish(self, elapsed_seconds: float = 0.0) -> ReplayStats:
+        stats = self.stats
+        stats.pending = len(self.validator.get_pending_orders())
+        stats.cancelled = stats.orders - stats.fills - stats.pending
+        stats.pnl = stats.cash + sum(
+            quantity * stats.last_prices.get(symbol, 0.0) for symbol, quantity in stats.positions.items()
+        )
+        stats.elapsed_seconds = elapsed_seconds
+        return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical market data through the signal and fill logic")
+    parser.add_argument('files', nargs='+', help='timestamp-sorted CSV or Parquet files (symbols with --store)')
+    parser.add_argument('--format', choices=['kline', 'ticker'], default='kline')
+    parser.add_argument('--store', help='replay symbols from a local OHLCV store directory instead of files')
+    parser.add_argument('--store-interval', default='1m', help='kline interval of the store')
+    parser.add_argument('--start', help='first day to replay from the store (ISO date)')
+    parser.add_argument('--end', help='day after the last one to replay from the store (ISO date)')
+    parser.add_argument('--interval-minutes', type=float, default=1.0, help='kline interval')
+    parser.add_argument('--quantity', type=float, default=1.0, help='quantity of each simulated order')
+    parser.add_argument('--no-trade', action='store_true', help='only count signals, open no orders')
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    parser.add_argument('--order-storage', choices=['dataclass', 'columnar'], default='dataclass',
+                        help='how settled orders are kept in memory')
+    args = parser.parse_args()
+
+    if args.store:
+        from src.ohlcv import OHLCVStore
+
+        store = OHLCVStore(args.store, interval=args.store_interval)
+        start = int(datetime.fromisoformat(args.start).timestamp() * 1000) if args.start else 0
+        end = int(datetime.fromisoformat(args.end).timestamp() * 1000) if args.end else int(time.time() * 1000)
+        streams = [store_batches(store, symbol.upper(), start, end, chunk_rows=args.chunk_rows)
+                   for symbol in args.files]
+    elif args.format == 'kline':
+        interval = timedelta(minutes=args.interval_minutes)
+        streams = [kline_batches(path, interval=interval, chunk_rows=args.chunk_rows) for path in args.files]
+    else:
+        streams = [ticker_batches(path, chunk_rows=args.chunk_rows) for path in args.files]
+
+    engine = ReplayEngine(order_quantity=args.quantity, trade_signals=not args.no_trade,
+                          order_storage=args.order_storage)
+    stats = engine.run(merge_streams(streams) if len(streams) > 1 else streams[0])
+    print(json.dumps(stats.to_dict(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+
+class TickerColumns(NamedTuple):
+    """Column view of an all-symbols ticker response"""
+    symbols: np.ndarray         # object
+    last_price: np.ndarray      # float64, NaN where missing/malformed
+    change_percent: np.ndarray  # float64, NaN where missing/malformed
+    volume: np.ndarray          # float64, NaN where missing/malformed
+
+
+def _float_column(tickers: List[Dict], key: str) -> np.ndarray:
+    try:
+        return np.array([t.get(key, 'nan') for t in tickers], dtype=np.float64)
+    except (TypeError, ValueError):
+        # Slow path for snapshots with malformed values
+        column = np.empty(len(tickers), dtype=np.float64)
+        for i, t in enumerate(tickers):
+            try:
+                column[i] = float(t[key])
+            except (KeyError, TypeError, ValueError):
+                column[i] = np.nan
+        return column
+
+
+def parse_tickers(tickers: Iterable[Dict]) -> TickerColumns:
+    """Parse ticker dicts into NumPy columns, parsing every field exactly once"""
+    tickers = list(tickers)
+    return TickerColumns(
+        symbols=np.array([t.get('symbol') for t in tickers], dtype=object),
+        last_price=_float_column(tickers, 'lastPrice'),
+        change_percent=_float_column(tickers, 'priceChangePercent'),
+        volume=_float_column(tickers, 'volume'),
+    )
+
+
+def signal_mask(columns: TickerColumns, min_change_percent: float, min_volume: float) -> np.ndarray:
+    """Boolean mask of tickers meeting the signal criteria (NaN never matches)"""
+    return (
+        (np.abs(columns.change_percent) > min_change_percent)
+        & (columns.volume > min_volume)
+        & (columns.symbols != None)  # noqa: E711 - elementwise comparison
+        & ~np.isnan(columns.last_price)
+    )
+
+
+def scan_tickers(tickers: Iterable[Dict], min_change_percent: float, min_volume: float,
+                 full_confidence_change_percent: float) -> Iterator[Tuple[str, str, float, float, float, float]]:
+    """Yield (symbol, signal_type, price, change_percent, volume, confidence) for matching tickers"""
+    return scan_columns(parse_tickers(tickers), min_change_percent, min_volume,
+                        full_confidence_change_percent)
+
+
+def scan_columns(columns: TickerColumns, min_change_percent: float, min_volume: float,
+                 full_confidence_change_percent: float) -> Iterator[Tuple[str, str, float, float, float, float]]:
+    """Same as scan_tickers for already-parsed ticker columns"""
+    matches = np.flatnonzero(signal_mask(columns, min_change_percent, min_volume))
+    if not matches.size:
+        return
+
+    change_percent = columns.change_percent[matches]
+    confidence = np.minimum(np.abs(change_percent) / full_confidence_change_percent, 1.0)
+    signal_type = np.where(change_percent > 0, "BUY", "SELL")
+
+    yield from zip(
+        columns.symbols[matches].tolist(),
+        signal_type.tolist(),
+        columns.last_price[matches].tolist(),
+        change_percent.tolist(),
+        columns.volume[matches].tolist(),
+        confidence.tolist(),
+    )
@@ -1,8 +1,11 @@
 import asyncio
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
+from itertools import count
+from src.order_book import OrderBook
+from src.signal_store import SignalStore
 
 class OrderType(Enum):
     BUY = "BUY"
@@ -24,6 +27,8 @@ class PseudoOrder:
     status: OrderStatus = OrderStatus.PENDING
     fill_price: Optional[float] = None
     fill_timestamp: Optional[datetime] = None
+    ttl: Optional[timedelta] = None  # time to expiry; TradingSignalValidator.ORDER_TIMEOUT if None
+    filled_quantity: float = 0.0  # fill_price is the average price of the filled quantity
 
 @dataclass
 class TradingSignal:
@@ -36,47 +41,168 @@ class TradingSignal:
     confidence: float = 0.0  # 0.0 to 1.0
 
 class TradingSignalValidator:
-    def __init__(self, binance_client):
+    MIN_CHANGE_PERCENT = 5.0
+    MIN_VOLUME = 1000.0
+    FULL_CONFIDENCE_CHANGE_PERCENT = 10.0  # Max confidence at 10% change
+    # With an indicator engine, confidence also rewards trend agreement and unusual volume
+    TREND_CONFIDENCE_WEIGHT = 0.2
+    VOLUME_CONFIDENCE_WEIGHT = 0.2
+    FULL_CONFIDENCE_VOLUME_ZSCORE = 3.0
+    FILL_TOLERANCE_PERCENT = 1.0
+    ORDER_TIMEOUT = timedelta(minutes=5)
+
+    def __init__(self, binance_client, order_archive_size: int = 10000,
+                 max_signals: int = 10000, signal_retention: timedelta = timedelta(hours=24),
+                 journal=None, clock: Optional[Callable[[], datetime]] = None,
+                 indicators=None, on_cancel: Optional[Callable[[List[PseudoOrder]], None]] = None,
+                 portfolio=None, order_storage: str = 'dataclass'):
         self.binance_client = binance_client
-        self.orders: List[PseudoOrder] = []
-        self.signals: List[TradingSignal] = []
+        self.clock = clock  # injectable time source (e.g. a replay clock); datetime.now by default
+        # 'columnar' keeps filled/cancelled orders in typed arrays instead of dataclasses
+        if order_storage == 'columnar':
+            from src.compact import OrderArchive
+
+            archive = OrderArchive(order_archive_size)
+        elif order_storage == 'dataclass':
+            archive = None
+        else:
+            raise ValueError(f"Unknown order storage: {order_storage}")
+        self.orders = OrderBook(archive_size=order_archive_size, archive=archive,
+                                deadline=lambda order: self.order_expiry(order).timestamp())
+        self._order_seq = count(1)
+        self.signals = SignalStore(max_signals=max_signals, max_age=signal_retention)
+        self.journal = journal  # optional src.journal.Journal receiving state changes
+        self.indicators = indicators  # optional src.indicators.IndicatorEngine fed by every ticker
+        self.on_cancel = on_cancel  # called with each batch of orders cancelled on timeout
+        self.portfolio = portfolio  # optional src.portfolio.Portfolio receiving every fill
+
+    def now(self) -> datetime:
+        """Current time according to the validator's clock"""
+        return self.clock() if self.clock is not None else datetime.now()
+
+    def _record_order(self, order: PseudoOrder):
+        if self.journal is not None:
+            self.journal.record_order(order)
+
+    def _record_signal(self, signal: TradingSignal):
+        if self.journal is not None:
+            self.journal.record_signal(signal)
         
-    def validate_signal_criteria(self, ticker_data: Dict) -> bool:
-        """Validate if ticker data meets trading signal criteria"""
+    def _parse_ticker(self, ticker_data: Dict) -> Optional[Tuple[float, float]]:
+        """Parse (change_percent, volume) from ticker data, or None if malformed"""
         try:
-            change_percent = float(ticker_data['priceChangePercent'])
-            volume = float(ticker_data['volume'])
-            
-            # Signal criteria: >5% change and volume > 1000
-            return abs(change_percent) > 5.0 and volume > 1000
+            return float(ticker_data['priceChangePercent']), float(ticker_data['volume'])
         except (KeyError, ValueError):
-            return False
+            return None
+
+    def _meets_signal_criteria(self, change_percent: float, volume: float) -> bool:
+        # Signal criteria: >5% change and volume > 1000
+        return abs(change_percent) > self.MIN_CHANGE_PERCENT and volume > self.MIN_VOLUME
+
+    def _confidence(self, change_percent: float, indicators=None) -> float:
+        """Signal confidence from the change magnitude, refined by rolling indicators when available"""
+        confidence = min(abs(change_percent) / self.FULL_CONFIDENCE_CHANGE_PERCENT, 1.0)
+        if indicators is None or indicators.samples < 2:
+            return confidence
+
+        # Trend: the price is on the signal's side of its EMA
+        trend = 1.0 if (indicators.price - indicators.ema) * change_percent > 0 else 0.0
+        volume = min(max(indicators.volume_zscore / self.FULL_CONFIDENCE_VOLUME_ZSCORE, 0.0), 1.0)
+        base_weight = 1.0 - self.TREND_CONFIDENCE_WEIGHT - self.VOLUME_CONFIDENCE_WEIGHT
+        return (base_weight * confidence + self.TREND_CONFIDENCE_WEIGHT * trend
+                + self.VOLUME_CONFIDENCE_WEIGHT * volume)
+
+    def validate_signal_criteria(self, ticker_data: Dict) -> bool:
+        """Validate if ticker data meets trading signal criteria"""
+        parsed = self._parse_ticker(ticker_data)
+        return parsed is not None and self._meets_signal_criteria(*parsed)
     
     def generate_trading_signal(self, ticker_data: Dict) -> Optional[TradingSignal]:
         """Generate a trading signal from ticker data"""
-        if not self.validate_signal_criteria(ticker_data):
+        parsed = self._parse_ticker(ticker_data)
+        if parsed is None:
             return None
-            
-        change_percent = float(ticker_data['priceChangePercent'])
+
+        change_percent, volume = parsed
+        indicators = None
+        if self.indicators is not None:
+            try:
+                price = float(ticker_data['lastPrice'])
+            except (KeyError, ValueError):
+                return None
+            indicators = self.indicators.update_ticker(ticker_data['symbol'], price, volume)
+
+        if not self._meets_signal_criteria(change_percent, volume):
+            return None
+
         signal_type = "BUY" if change_percent > 0 else "SELL"
-        confidence = min(abs(change_percent) / 10.0, 1.0)  # Max confidence at 10% change
-        
+        confidence = self._confidence(change_percent, indicators)
+
         signal = TradingSignal(
             symbol=ticker_data['symbol'],
             signal_type=signal_type,
             price=float(ticker_data['lastPrice']),
             change_percent=change_percent,
-            volume=float(ticker_data['volume']),
-            timestamp=datetime.now(),
+            volume=volume,
+            timestamp=self.now(),
             confidence=confidence
         )
         
         self.signals.append(signal)
+        self._record_signal(signal)
         return signal
+
+    def generate_trading_signals(self, tickers: Iterable[Dict]) -> List[TradingSignal]:
+        """Generate trading signals for a whole-market ticker snapshot in one vectorized pass"""
+        from src.scanner import parse_tickers
+
+        return self.generate_signals_from_columns(parse_tickers(tickers))
+
+    def generate_signals_from_columns(self, columns) -> List[TradingSignal]:
+        """Generate trading signals from parsed src.scanner.TickerColumns"""
+        from src.scanner import scan_columns
+
+        indicators = {}
+        if self.indicators is not None:
+            indicators = self.indicators.update_many(
+                columns.symbols.tolist(), columns.last_price.tolist(), columns.volume.tolist()
+            )
+
+        now = self.now()
+        signals = [
+            TradingSignal(
+                symbol=symbol,
+                signal_type=signal_type,
+                price=price,
+                change_percent=change_percent,
+                volume=volume,
+                timestamp=now,
+                confidence=self._confidence(change_percent, indicators[symbol]) if symbol in indicators else confidence
+            )
+            for symbol, signal_type, price, change_percent, volume, confidence in scan_columns(
+                columns,
+                min_change_percent=self.MIN_CHANGE_PERCENT,
+                min_volume=self.MIN_VOLUME,
+                full_confidence_change_percent=self.FULL_CONFIDENCE_CHANGE_PERCENT
+            )
+        ]
+        self.add_signals(signals)
+        return signals
     
-    def create_pseudo_order(self, signal: TradingSignal, quantity: float) -> PseudoOrder:
-        """Create a pseudo order based on trading signal"""
-        order_id = f"ORDER_{len(self.orders) + 1}_{signal.symbol}_{int(datetime.now().timestamp())}"
+    def add_signals(self, signals: Iterable[TradingSignal]):
+        """Store signals generated elsewhere (e.g. by scanning workers)"""
+        for signal in signals:
+            self.signals.append(signal)
+            self._record_signal(signal)
+
+    def order_expiry(self, order: PseudoOrder) -> datetime:
+        """When a pending order times out"""
+        return order.timestamp + (order.ttl if order.ttl is not None else self.ORDER_TIMEOUT)
+
+    def create_pseudo_order(self, signal: TradingSignal, quantity: float,
+                            ttl: Optional[timedelta] = None) -> PseudoOrder:
+        """Create a pseudo order based on trading signal, expiring after ``ttl`` (ORDER_TIMEOUT by default)"""
+        order_id = f"ORDER_{next(self._order_seq)}_{signal.symbol}_{int(self.now().timestamp())}"
         
         order = PseudoOrder(
             id=order_id,
@@ -84,37 +210,128 @@ class TradingSignalValidator:
             order_type=OrderType(signal.signal_type),
             quantity=quantity,
             price=signal.price,
-            timestamp=datetime.now()
+            timestamp=self.now(),
+            ttl=ttl
         )
         
         self.orders.append(order)
+        self._record_order(order)
         return order
     
+    def apply_fill(self, order: PseudoOrder, quantity: float, price: float) -> bool:
+        """Fill ``quantity`` of a pending order at ``price``; returns True once it is completely filled"""
+        quantity = min(quantity, order.quantity - order.filled_quantity)
+        if order.status != OrderStatus.PENDING or quantity <= 0:
+            return False
+
+        filled = order.filled_quantity + quantity
+        previous = order.fill_price * order.filled_quantity if order.fill_price is not None else 0.0
+        order.fill_price = (previous + price * quantity) / filled
+        order.filled_quantity = filled
+        order.fill_timestamp = self.now()
+        if self.portfolio is not None:
+            self.portfolio.apply_order_fill(order, quantity, price)
+        # Float sums may fall short of the order quantity by rounding
+        complete = filled >= order.quantity * (1 - 1e-12)
+        if complete:
+            order.status = OrderStatus.FILLED
+            self.orders.archive(order)
+        self._record_order(order)
+        return complete
+
     def simulate_order_fill(self, order: PseudoOrder, market_price: float) -> bool:
         """Simulate order execution based on market conditions"""
         if order.status != OrderStatus.PENDING:
+            self.orders.archive(order)
             return False
             
         # Simple fill logic: fill if price is within 1% of order price
         price_diff_percent = abs(market_price - order.price) / order.price * 100
         
-        if price_diff_percent <= 1.0:  # Fill within 1% of order price
-            order.status = OrderStatus.FILLED
-            order.fill_price = market_price
-            order.fill_timestamp = datetime.now()
-            return True
+        if price_diff_percent <= self.FILL_TOLERANCE_PERCENT:
+            return self.apply_fill(order, order.quantity - order.filled_quantity, market_price)
         
-        # Cancel order if it's older than 5 minutes
-        if datetime.now() - order.timestamp > timedelta(minutes=5):
-            order.status = OrderStatus.CANCELLED
-            
+        # Cancel order if it's past its expiry (5 minutes by default)
+        if self.now() > self.order_expiry(order):
+            self._cancel([order])
+
         return False
     
+    def process_price_snapshot(self, prices: Dict[str, float]) -> List[PseudoOrder]:
+        """Run the fill simulation for every pending order against one price snapshot"""
+        filled = []
+        for symbol in self.orders.pending_symbols():
+            market_price = prices.get(symbol)
+            if market_price is not None:
+                filled.extend(self.process_price_update(symbol, market_price))
+        self.expire_orders()
+        return filled
+
+    def process_price_update(self, symbol: str, market_price: float) -> List[PseudoOrder]:
+        """Run the fill simulation for the pending orders of one symbol that a new price can fill"""
+        tolerance = self.FILL_TOLERANCE_PERCENT / 100
+        # Orders this price can fill have their price in [p / (1 + tol), p / (1 - tol)];
+        # the range is padded for float rounding and simulate_order_fill does the exact check
+        low = market_price / (1 + tolerance) * (1 - 1e-9)
+        high = market_price / (1 - tolerance) * (1 + 1e-9)
+        return [
+            order for order in self.orders.in_price_range(symbol, low, high)
+            if self.simulate_order_fill(order, market_price)
+        ]
+
+    def _cancel(self, orders: List[PseudoOrder]):
+        for order in orders:
+            order.status = OrderStatus.CANCELLED
+            self.orders.archive(order)
+            self._record_order(order)
+        if orders and self.on_cancel is not None:
+            self.on_cancel(orders)
+
+    def expire_orders(self) -> List[PseudoOrder]:
+        """Cancel pending orders whose expiry has passed, using the order book's timing wheel"""
+        expired = []
+        for order in self.orders.due(self.now().timestamp()):
+            if order.status == OrderStatus.PENDING:
+                expired.append(order)
+            else:
+                self.orders.archive(order)  # status changed outside the validator
+        self._cancel(expired)
+        return expired
+
+    def restore_state(self, orders: Iterable[PseudoOrder], signals: Iterable[TradingSignal]):
+        """Load recovered orders (in creation order) and signals without journaling them"""
+        orders = list(orders)
+        last_seq = 0
+        for order in orders:
+            if order.status == OrderStatus.PENDING:
+                self.orders.append(order)
+            else:
+                self.orders.archived.append(order)
+            seq = order.id.split('_')[1] if order.id.startswith('ORDER_') else ''
+            if seq.isdigit():
+                last_seq = max(last_seq, int(seq))
+        self._order_seq = count(last_seq + 1)
+        if self.portfolio is not None:
+            self.portfolio.rebuild(orders)
+
+        for signal in signals:
+            self.signals.append(signal)
+
     def get_active_signals(self, max_age_minutes: int = 10) -> List[TradingSignal]:
         """Get signals within specified time window"""
-        cutoff_time = datetime.now() - timedelta(minutes=max_age_minutes)
-        return [s for s in self.signals if s.timestamp > cutoff_time]
+        cutoff_time = self.now() - timedelta(minutes=max_age_minutes)
+        return self.signals.since(cutoff_time)
+
+    def get_latest_signal(self, symbol: str) -> Optional[TradingSignal]:
+        """Get the most recent signal for a symbol"""
+        return self.signals.latest(symbol)
     
     def get_pending_orders(self) -> List[PseudoOrder]:
         """Get all pending orders"""
-        return [o for o in self.orders if o.status == OrderStatus.PENDING]
\ No newline at end of file
+        pending = []
+        for order in self.orders.pending():
+            if order.status == OrderStatus.PENDING:
+                pending.append(order)
+            else:
+                self.orders.archive(order)  # settled outside simulate_order_fill
+        return pending
\ No newline at end of file
@@ -0,0 +1,199 @@
+import asyncio
+import hashlib
+import multiprocessing
+import struct
+from bisect import bisect_right
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.journal import decode_signals, encode_signal
+from src.scanner import TickerColumns, parse_tickers
+from src.schema import TradingSignal, TradingSignalValidator
+
+# Worker request: uint32 ticker count | float64 last_price[n] | float64 change_percent[n]
+# | float64 volume[n] | newline-separated symbols. Replies are back-to-back journal
+# signal records; an empty request stops the worker.
+BATCH_HEADER = struct.Struct('<I')
+
+
+def _hash(key: str) -> int:
+    # Stable across processes and runs, unlike hash()
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little')
+
+
+class ConsistentHashRing:
+    """Maps keys to shards so that adding or removing a shard moves only ~1/N of the keys.
+
+    Each shard owns ``replicas`` points on a 64-bit ring; a key belongs to
+    the first point at or after its own hash. Lookups are cached, as the
+    symbol universe is small and stable.
+    """
+
+    def __init__(self, shards: Sequence, replicas: int = 64):
+        points = sorted((_hash(f"{shard}#{i}"), shard) for shard in shards for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+        self._cache: Dict[str, object] = {}
+
+    def shard_for(self, key: str):
+        shard = self._cache.get(key)
+        if shard is None:
+            index = bisect_right(self._hashes, _hash(key)) % len(self._hashes)
+            shard = self._cache[key] = self._shards[index]
+        return shard
+
+
+def encode_batch(columns: TickerColumns) -> bytes:
+    symbols = '\n'.join(columns.symbols.tolist()).encode()
+    values = np.concatenate((columns.last_price, columns.change_percent, columns.volume))
+    return BATCH_HEADER.pack(len(columns.symbols)) + values.astype('<f8').tobytes() + symbols
+
+
+def decode_batch(message: bytes) -> TickerColumns:
+    count, = BATCH_HEADER.unpack_from(message)
+    start = BATCH_HEADER.size
+    values = np.frombuffer(message, dtype='<f8', count=3 * count, offset=start)
+    symbols = message[start + values.nbytes:].decode().split('\n') if count else []
+    return TickerColumns(
+        symbols=np.array(symbols, dtype=object),
+        last_price=values[:count],
+        change_percent=values[count:2 * count],
+        volume=values[2 * count:],
+    )
+
+
+def default_validator() -> TradingSignalValidator:
+    """Worker validator: signal criteria and rolling indicators, no journal or orders"""
+    from src.indicators import IndicatorEngine
+
+    return TradingSignalValidator(None, indicators=IndicatorEngine())
+
+
+def scan_worker(connection, validator_factory: Callable[[], TradingSignalValidator]):
+    """Worker process loop: scan each ticker batch of this shard and reply with its signals"""
+    validator = validator_factory()
+    try:
+        while True:
+            message = connection.recv_bytes()
+            if not message:
+                break
+            signals = validator.generate_signals_from_columns(decode_batch(message))
+            connection.send_bytes(b''.join(encode_signal(signal) for signal in signals))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        connection.close()
+
+
+class ShardedScanner:
+    """Signal scanning spread over worker processes, one shard of the symbol universe each.
+
+    Symbols are assigned to workers by consistent hash, so each worker
+    always sees the same symbols and keeps their rolling indicators (its
+    own slice of validator state). A scan splits the snapshot into per-worker
+    column batches, every worker scans its batch in parallel, and only the
+    generated signals come back, as fixed-size journal records. A worker
+    that dies is restarted on the next scan with fresh state for its symbols.
+    Workers are spawned rather than forked by default: the bot's process has
+    an event loop, network sessions and executor threads, and restarts run
+    in a worker thread, where a fork could copy a lock held by another thread.
+    """
+
+    def __init__(self, workers: int, validator_factory: Callable[[], TradingSignalValidator] = default_validator,
+                 replicas: int = 64, start_method: str = 'spawn'):
+        self.workers = workers
+        self.validator_factory = validator_factory
+        self.ring = ConsistentHashRing(range(workers), replicas=replicas)
+        self._context = multiprocessing.get_context(start_method)
+        self._processes: List = [None] * workers
+        self._connections: List = [None] * workers
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _start_worker(self, shard: int):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=scan_worker, args=(child, self.validator_factory),
+                                        name=f"scan-shard-{shard}", daemon=True)
+        process.start()
+        child.close()
+        self._processes[shard] = process
+        self._connections[shard] = parent
+
+    def start(self):
+        for shard in range(self.workers):
+            if self._processes[shard] is None or not self._processes[shard].is_alive():
+                self._start_worker(shard)
+
+    def close(self):
+        for shard, (process, connection) in enumerate(zip(self._processes, self._connections)):
+            if process is None:
+                continue
+            try:
+                connection.send_bytes(b'')
+            except OSError:
+                pass
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+            self._processes[shard] = self._connections[shard] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def partition(self, columns: TickerColumns) -> List[TickerColumns]:
+        """Split ticker columns into one batch per worker"""
+        valid = columns.symbols != None  # noqa: E711 - elementwise comparison
+        shard_for = self.ring.shard_for
+        shards = np.fromiter((shard_for(symbol) if ok else -1
+                              for symbol, ok in zip(columns.symbols.tolist(), valid.tolist())),
+                             dtype=np.int64, count=len(columns.symbols))
+        batches = []
+        for shard in range(self.workers):
+            index = np.flatnonzero(shards == shard)
+            batches.append(TickerColumns(*(column[index] for column in columns)))
+        return batches
+
+    def scan_columns(self, columns: TickerColumns) -> List[TradingSignal]:
+        """Scan parsed columns on the workers (blocking); signals come back grouped by shard.
+
+        A worker that fails mid-scan loses its shard's signals for this scan
+        only; the other shards' signals are still returned.
+        """
+        self.start()
+        for shard, batch in enumerate(self.partition(columns)):
+            try:
+                self._connections[shard].send_bytes(encode_batch(batch))
+            except OSError as e:
+                self._fail(shard, e)
+        signals = []
+        for shard, connection in enumerate(self._connections):
+            if connection is None:
+                continue
+            try:
+                signals.extend(decode_signals(connection.recv_bytes()))
+            except (EOFError, OSError) as e:
+                self._fail(shard, e)
+        return signals
+
+    def _fail(self, shard: int, error: Exception):
+        # Drop the broken worker; start() replaces it before the next scan
+        print(f"Scan worker {shard} failed, restarting it: {error!r}")
+        process, connection = self._processes[shard], self._connections[shard]
+        if process is not None and process.is_alive():
+            process.terminate()
+        if connection is not None:
+            connection.close()
+        self._processes[shard] = self._connections[shard] = None
+
+    async def scan(self, tickers: Iterable[Dict]) -> List[TradingSignal]:
+        """Scan a ticker snapshot on the workers without blocking the event loop"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        columns = parse_tickers(tickers)
+        async with self._lock:  # one scan in flight: each worker handles one batch at a time
+            return await asyncio.to_thread(self.scan_columns, columns)
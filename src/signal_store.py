@@ -0,0 +1,95 @@
+from bisect import bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterator, List
+
+
+class SignalStore:
+    """Bounded, timestamp-ordered store of trading signals.
+
+    Signals are kept sorted by timestamp in parallel lists (epoch seconds and
+    signals) read from ``_head``, so window queries are a bisection plus a
+    slice and eviction from the old end only moves the head. Signals older
+    than ``max_age`` (relative to the newest signal) or beyond
+    ``max_signals`` are evicted on append. A per-symbol view keeps the
+    latest signal of every symbol reachable in O(1).
+    """
+
+    def __init__(self, max_signals: int = 10000, max_age: timedelta = timedelta(hours=24)):
+        self.max_signals = max_signals
+        self.max_age = max_age
+        self._times: List[float] = []
+        self._signals: List = []
+        self._head = 0
+        self._by_symbol: Dict[str, Deque] = {}
+
+    def __len__(self) -> int:
+        return len(self._signals) - self._head
+
+    def __iter__(self) -> Iterator:
+        return iter(self._signals[self._head:])
+
+    def append(self, signal):
+        """Insert a signal in timestamp order, then evict by age and count"""
+        ts = signal.timestamp.timestamp()
+        if not len(self) or ts >= self._times[-1]:
+            self._times.append(ts)
+            self._signals.append(signal)
+        else:
+            index = bisect_right(self._times, ts, lo=self._head)
+            self._times.insert(index, ts)
+            self._signals.insert(index, signal)
+
+        view = self._by_symbol.setdefault(signal.symbol, deque())
+        view.append(signal)
+        if len(view) > 1 and view[-2].timestamp > signal.timestamp:
+            self._by_symbol[signal.symbol] = deque(sorted(view, key=lambda s: s.timestamp))
+
+        self.evict_before_ts(self._times[-1] - self.max_age.total_seconds())
+        overflow = len(self) - self.max_signals
+        if overflow > 0:
+            self._evict(self._head + overflow)
+
+    def since(self, cutoff: datetime) -> List:
+        """Signals with a timestamp strictly after cutoff, oldest first"""
+        start = bisect_right(self._times, cutoff.timestamp(), lo=self._head)
+        return self._signals[start:]
+
+    def latest(self, symbol: str):
+        """Most recent signal for a symbol, or None"""
+        view = self._by_symbol.get(symbol)
+        return view[-1] if view else None
+
+    def for_symbol(self, symbol: str) -> List:
+        """All retained signals for a symbol, oldest first"""
+        return list(self._by_symbol.get(symbol, ()))
+
+    def latest_symbols(self) -> Dict[str, object]:
+        """Latest signal of every symbol"""
+        return {symbol: view[-1] for symbol, view in self._by_symbol.items()}
+
+    def evict_before(self, cutoff: datetime):
+        """Drop signals with a timestamp at or before cutoff"""
+        self.evict_before_ts(cutoff.timestamp())
+
+    def evict_before_ts(self, cutoff_ts: float):
+        end = bisect_right(self._times, cutoff_ts, lo=self._head)
+        if end > self._head:
+            self._evict(end)
+
+    def _evict(self, end: int):
+        for signal in self._signals[self._head:end]:
+            view = self._by_symbol[signal.symbol]
+            if view[0] is signal:
+                view.popleft()
+            else:
+                view.remove(signal)
+            if not view:
+                del self._by_symbol[signal.symbol]
+        self._head = end
+
+        # Compact once the evicted prefix dominates the lists
+        if self._head > len(self._signals) // 2:
+            del self._times[:self._head]
+            del self._signals[:self._head]
+            self._head = 0
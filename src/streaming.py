@@ -0,0 +1,165 @@
+import asyncio
+import time
+from typing import AsyncIterator, Callable, Iterable, List, NamedTuple, Optional
+
+from src.schema import PseudoOrder, TradingSignalValidator
+
+
+class PriceUpdate(NamedTuple):
+    """One pushed price for a symbol (a trade or a best bid/ask change)"""
+    symbol: str
+    price: float
+    event_time: int = 0  # exchange event time in epoch ms, 0 if unknown
+
+
+async def replay_source(updates: Iterable[PriceUpdate], delay: float = 0.0) -> AsyncIterator[PriceUpdate]:
+    """Yield recorded updates in order, ``delay`` seconds apart (0 just yields to the loop)"""
+    for update in updates:
+        await asyncio.sleep(delay)
+        yield update
+
+
+class BinanceStreamSource:
+    """Price updates from Binance WebSocket streams for the symbols that need them.
+
+    Subscribes to ``<symbol>@bookTicker`` (mid price) or ``<symbol>@trade``
+    streams for the symbols returned by ``symbols()`` (e.g. the symbols with
+    pending orders) over one multiplexed connection, and reconnects with the
+    new stream list whenever that set changes.
+    """
+
+    def __init__(self, market_data, symbols: Callable[[], Iterable[str]], stream: str = 'bookTicker',
+                 refresh_interval: float = 1.0):
+        if stream not in ('bookTicker', 'trade'):
+            raise ValueError(f"Unsupported stream type: {stream}")
+        self.market_data = market_data
+        self.symbols = symbols
+        self.stream = stream
+        self.refresh_interval = refresh_interval
+
+    def parse(self, message: dict) -> Optional[PriceUpdate]:
+        data = message.get('data', message)
+        if self.stream == 'trade':
+            if 'p' not in data:
+                return None
+            return PriceUpdate(data['s'], float(data['p']), data.get('T', 0))
+        if 'b' not in data or 'a' not in data:
+            return None
+        return PriceUpdate(data['s'], (float(data['b']) + float(data['a'])) / 2, data.get('E', 0))
+
+    async def __aiter__(self) -> AsyncIterator[PriceUpdate]:
+        from binance import BinanceSocketManager
+
+        loop = asyncio.get_running_loop()
+        manager = BinanceSocketManager(await self.market_data.connect())
+        while True:
+            wanted = frozenset(self.symbols())
+            if not wanted:
+                await asyncio.sleep(self.refresh_interval)
+                continue
+            streams = [f"{symbol.lower()}@{self.stream}" for symbol in sorted(wanted)]
+            async with manager.multiplex_socket(streams) as socket:
+                # The symbol set is re-read once per refresh_interval, not per message
+                refresh_at = loop.time() + self.refresh_interval
+                while True:
+                    try:
+                        message = await asyncio.wait_for(socket.recv(), timeout=max(refresh_at - loop.time(), 0))
+                    except asyncio.TimeoutError:
+                        message = None
+                    update = self.parse(message) if isinstance(message, dict) else None
+                    if update is not None:
+                        yield update
+                    if loop.time() >= refresh_at:
+                        if frozenset(self.symbols()) != wanted:
+                            break
+                        refresh_at = loop.time() + self.refresh_interval
+
+
+class StreamingFillEngine:
+    """Push-driven order fills: each price update is checked only against its own symbol.
+
+    Work per update is a price-range lookup in the symbol's order index, so
+    cost tracks the number of ticks rather than orders x polling interval
+    and an order fills as soon as a matching price arrives. Filled orders
+    are collected and handed to ``on_fill`` together at most once every
+    ``flush_interval`` seconds, so a busy symbol causes one announcement
+    per window rather than one per update. When the source fails the engine
+    logs it and reconnects after ``retry_delay`` seconds; the polling loop
+    keeps filling orders in the meantime.
+    """
+
+    def __init__(self, validator: TradingSignalValidator, source_factory: Callable[[], AsyncIterator[PriceUpdate]],
+                 on_fill: Optional[Callable[[List[PseudoOrder]], None]] = None,
+                 metrics=None, retry_delay: float = 5.0, engine=None, flush_interval: float = 0.25):
+        self.validator = validator
+        self.engine = engine  # optional src.engine.TradingEngine that applies updates in micro-batches
+        self.source_factory = source_factory
+        self.on_fill = on_fill
+        self.metrics = metrics  # optional src.metrics.Metrics receiving per-update latency
+        self.retry_delay = retry_delay
+        self.flush_interval = flush_interval
+        self.updates = 0
+        self.fills = 0
+        self._filled: List[PseudoOrder] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+    def handle(self, update: PriceUpdate) -> List[PseudoOrder]:
+        """Fill the pending orders of the update's symbol that its price reaches"""
+        start = time.perf_counter()
+        filled = self.validator.process_price_update(update.symbol, update.price)
+        self.updates += 1
+        if filled:
+            self.fills += len(filled)
+            if self.on_fill is not None:
+                self._filled.extend(filled)
+                self._schedule_flush()
+        if self.metrics is not None:
+            self.metrics.observe('stream_update_seconds', time.perf_counter() - start)
+            self.metrics.inc('stream_fills_total', len(filled))
+        return filled
+
+    def _schedule_flush(self):
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is None or self.flush_interval <= 0:
+            self.flush()
+        else:
+            self._flush_handle = loop.call_later(self.flush_interval, self.flush)
+
+    def flush(self):
+        """Hand the fills collected since the last flush to ``on_fill`` in one call"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._filled:
+            filled, self._filled = self._filled, []
+            self.on_fill(filled)
+
+    async def consume(self, source: AsyncIterator[PriceUpdate]):
+        """Process every update of one source until it ends"""
+        try:
+            async for update in source:
+                if self.engine is not None:
+                    self.engine.post(self.handle, update)
+                else:
+                    self.handle(update)
+        finally:
+            if self.engine is None:
+                self.flush()
+
+    async def run(self):
+        """Consume the source forever, reconnecting after errors"""
+        while True:
+            try:
+                await self.consume(self.source_factory())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.metrics is not None:
+                    self.metrics.inc('stream_errors_total')
+                print(f"Price stream error, falling back to polling: {e}")
+            await asyncio.sleep(self.retry_delay)
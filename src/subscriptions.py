@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+ALL = '*'
+SIGNAL_TYPES = ('BUY', 'SELL')
+
+
+def normalize_topic(topic: str) -> str:
+    """A symbol (BTC is read as BTCUSDT), a signal type (BUY/SELL) or '*' for every event"""
+    topic = topic.upper()
+    if topic == ALL or topic in SIGNAL_TYPES or topic.endswith('USDT'):
+        return topic
+    return topic + 'USDT'
+
+
+class SubscriptionRegistry:
+    """Which channels want which events, indexed by topic for O(subscribers) routing.
+
+    A channel subscribes to topics: symbols, signal types or '*'. Besides the
+    forward map (channel -> topics) an inverted index maps each topic to its
+    channels, so routing an event only touches the channels interested in
+    its symbol, its signal type or everything. Channels discovered without
+    any subscription get ``default_topics``; a channel that unsubscribes from
+    everything stays known and is not re-subscribed. A muted channel (one
+    the bot cannot write to) keeps its topics but is left out of the index
+    until it is discovered again. With a ``path`` the topics are saved to a
+    JSON file, replaced atomically: changes only mark the registry dirty and
+    the ``run`` task writes them in a worker thread every ``save_interval``
+    seconds, so discovering a large guild costs one write. The file is read
+    by ``load`` or on first use, not by the constructor.
+    """
+
+    def __init__(self, path: Optional[str] = None, default_topics: Iterable[str] = (ALL,),
+                 save_interval: float = 1.0):
+        self.path = path
+        self.save_interval = save_interval
+        self.default_topics = [normalize_topic(topic) for topic in default_topics]
+        self._topics: Dict[int, Set[str]] = {}
+        self._channels: Dict[str, Set[int]] = defaultdict(set)
+        self._muted: Set[int] = set()
+        self._loaded = path is None
+        self._dirty = False
+        self._in_flight = None  # executor write started by run()
+
+    def load(self) -> int:
+        """Read the saved subscriptions (once); returns the channels known"""
+        if not self._loaded:
+            self._loaded = True
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    for channel_id, topics in json.load(f).items():
+                        self._set(int(channel_id), topics)
+        return len(self._topics)
+
+    def __len__(self):
+        return self.load()
+
+    def __contains__(self, channel_id: int):
+        self.load()
+        return channel_id in self._topics
+
+    def _set(self, channel_id: int, topics: Iterable[str]):
+        current = self._topics.setdefault(channel_id, set())
+        for topic in topics:
+            if topic not in current:
+                current.add(topic)
+                if channel_id not in self._muted:
+                    self._channels[topic].add(channel_id)
+
+    def _unindex(self, channel_id: int, topics: Iterable[str]):
+        for topic in topics:
+            channels = self._channels.get(topic)
+            if channels is not None:
+                channels.discard(channel_id)
+                if not channels:
+                    del self._channels[topic]
+
+    def _save(self):
+        self._dirty = self.path is not None
+
+    def _take_changes(self) -> Optional[Dict[str, List[str]]]:
+        # Copied on the event loop, so the worker thread never reads the live sets
+        if not self._dirty:
+            return None
+        self._dirty = False
+        return {str(channel_id): sorted(topics) for channel_id, topics in self._topics.items()}
+
+    def _write(self, data: Dict[str, List[str]]):
+        with open(self.path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(self.path + '.tmp', self.path)
+
+    def flush(self):
+        """Synchronously save pending changes (for shutdown and tests)"""
+        data = self._take_changes()
+        if data is not None:
+            self._write(data)
+
+    async def run(self):
+        """Background task: save changes every ``save_interval`` seconds until cancelled"""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                await asyncio.sleep(self.save_interval)
+                data = self._take_changes()
+                if data is not None:
+                    self._in_flight = loop.run_in_executor(None, self._write, data)
+                    await asyncio.shield(self._in_flight)
+        finally:
+            try:
+                # Let a cancelled write finish first: both replace the same file
+                if self._in_flight is not None and not self._in_flight.done():
+                    await asyncio.wait([self._in_flight])
+            finally:
+                self.flush()
+
+    def topics(self, channel_id: int) -> List[str]:
+        self.load()
+        return sorted(self._topics.get(channel_id, ()))
+
+    def subscribe(self, channel_id: int, topics: Iterable[str]) -> List[str]:
+        """Add topics to a channel; returns its topics"""
+        self.load()
+        self._set(channel_id, [normalize_topic(topic) for topic in topics])
+        self._save()
+        return self.topics(channel_id)
+
+    def unsubscribe(self, channel_id: int, topics: Optional[Iterable[str]] = None) -> List[str]:
+        """Remove topics (all of them by default) from a channel; returns its remaining topics"""
+        self.load()
+        current = self._topics.setdefault(channel_id, set())
+        removed = set(current) if topics is None else {normalize_topic(topic) for topic in topics} & current
+        current -= removed
+        self._unindex(channel_id, removed)
+        self._save()
+        return self.topics(channel_id)
+
+    def discover(self, channel_id: int) -> bool:
+        """Give a channel seen for the first time the default topics; returns whether it was new.
+
+        A known channel that was muted is routed to again with its own topics.
+        """
+        self.load()
+        if channel_id in self._topics:
+            if channel_id in self._muted:
+                self._muted.discard(channel_id)
+                for topic in self._topics[channel_id]:
+                    self._channels[topic].add(channel_id)
+            return False
+        self._set(channel_id, self.default_topics)
+        self._save()
+        return True
+
+    def mute(self, channel_id: int):
+        """Stop routing to a channel the bot can no longer write to, keeping its topics"""
+        self.load()
+        if channel_id in self._topics and channel_id not in self._muted:
+            self._muted.add(channel_id)
+            self._unindex(channel_id, self._topics[channel_id])
+
+    def remove_channel(self, channel_id: int):
+        """Forget a deleted channel"""
+        self.load()
+        if channel_id not in self._topics:
+            return
+        self._unindex(channel_id, self._topics.pop(channel_id))
+        self._muted.discard(channel_id)
+        self._save()
+
+    def channels_for(self, symbol: str, signal_type: Optional[str] = None) -> Set[int]:
+        """Channels interested in an event about ``symbol`` of ``signal_type``"""
+        self.load()
+        channels = set(self._channels.get(ALL, ()))
+        channels.update(self._channels.get(symbol, ()))
+        if signal_type is not None:
+            channels.update(self._channels.get(signal_type, ()))
+        return channels
+
+    def route(self, events: Iterable[Tuple[str, Optional[str], str]]) -> List[Tuple[List[int], List[str]]]:
+        """Group (symbol, signal_type, content) events into (channel_ids, contents) broadcasts.
+
+        Channels that receive the same contents share a broadcast, so the
+        usual batch where every subscriber wants every event is one broadcast.
+        """
+        self.load()
+        per_channel: Dict[int, List[str]] = defaultdict(list)
+        for symbol, signal_type, content in events:
+            for channel_id in self.channels_for(symbol, signal_type):
+                per_channel[channel_id].append(content)
+        groups: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for channel_id, contents in per_channel.items():
+            groups[tuple(contents)].append(channel_id)
+        return [(sorted(channel_ids), list(contents)) for contents, channel_ids in groups.items()]
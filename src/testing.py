@@ -0,0 +1,209 @@
+"""Local stand-ins for upstream services (Binance and Discord), for benchmarks and load tests."""
+import asyncio
+import json
+import math
+import random
+from collections import Counter, deque
+from itertools import count
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+
+class FakeBinanceError(Exception):
+    """Injected upstream failure raised by FakeBinanceClient"""
+
+
+class FakeBinanceClient:
+    """In-process async stand-in for binance.AsyncClient's 24h ticker, depth and kline endpoints.
+
+    Prices follow a per-symbol geometric random walk that advances on every
+    ``step()``. ``latency`` (seconds, optionally jittered) and ``error_rate``
+    let callers inject slow or failing upstream calls; ``calls`` counts
+    requests by kind ("symbol", "symbols", "all").
+    """
+
+    def __init__(self, symbols: int = 2000, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, volatility: float = 0.002, seed: Optional[int] = None):
+        self.random = random.Random(seed)
+        self.symbols: List[str] = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT'][:symbols]
+        self.symbols += [f"COIN{i}USDT" for i in range(symbols - len(self.symbols))]
+        self.prices: Dict[str, float] = {s: self.random.uniform(0.1, 1000.0) for s in self.symbols}
+        self.open_prices: Dict[str, float] = dict(self.prices)
+        self.volumes: Dict[str, float] = {s: self.random.uniform(100.0, 1e6) for s in self.symbols}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.volatility = volatility
+        self.calls: Counter = Counter()
+
+    def step(self):
+        """Advance every symbol's random walk by one step"""
+        gauss = self.random.gauss
+        for symbol, price in self.prices.items():
+            self.prices[symbol] = price * math.exp(gauss(0.0, self.volatility))
+
+    def ticker(self, symbol: str) -> Dict:
+        price = self.prices[symbol]
+        return {
+            'symbol': symbol,
+            'lastPrice': f"{price:.8f}",
+            'priceChangePercent': f"{(price / self.open_prices[symbol] - 1) * 100:.3f}",
+            'volume': f"{self.volumes[symbol]:.2f}",
+        }
+
+    async def _simulate_network(self):
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise FakeBinanceError("Injected upstream error")
+
+    async def get_ticker(self, **params):
+        if 'symbol' in params:
+            self.calls['symbol'] += 1
+            await self._simulate_network()
+            if params['symbol'] not in self.prices:
+                raise FakeBinanceError("APIError(code=-1121): Invalid symbol.")
+            return self.ticker(params['symbol'])
+
+        if 'symbols' in params:
+            self.calls['symbols'] += 1
+            symbols = [s for s in json.loads(params['symbols']) if s in self.prices]
+        else:
+            self.calls['all'] += 1
+            symbols = self.symbols
+        await self._simulate_network()
+        return [self.ticker(symbol) for symbol in symbols]
+
+    def order_book(self, symbol: str, limit: int = 100, spread: float = 0.001,
+                   step: float = 0.0005) -> Dict:
+        """Synthetic depth around the current price: levels ``step`` apart, random sizes"""
+        price = self.prices[symbol]
+        uniform = self.random.uniform
+        half = spread / 2
+        return {
+            'lastUpdateId': self.calls['depth'],
+            'bids': [[f"{price * (1 - half - i * step):.8f}", f"{uniform(0.1, 10.0):.4f}"] for i in range(limit)],
+            'asks': [[f"{price * (1 + half + i * step):.8f}", f"{uniform(0.1, 10.0):.4f}"] for i in range(limit)],
+        }
+
+    async def get_order_book(self, **params):
+        self.calls['depth'] += 1
+        await self._simulate_network()
+        if params['symbol'] not in self.prices:
+            raise FakeBinanceError("APIError(code=-1121): Invalid symbol.")
+        return self.order_book(params['symbol'], params.get('limit', 100))
+
+    def klines(self, symbol: str, interval_ms: int, start: int, end: int, limit: int = 1000) -> List[list]:
+        """Deterministic klines opening in [start, end] around the symbol's opening price"""
+        base = self.open_prices[symbol]
+        rows = []
+        open_time = -(-start // interval_ms) * interval_ms
+        while open_time <= end and len(rows) < limit:
+            minute = open_time // interval_ms
+            close = base * (1 + 0.01 * math.sin(minute / 30))
+            volume = 10.0 + minute % 7
+            rows.append([open_time, f"{close:.8f}", f"{close * 1.001:.8f}", f"{close * 0.999:.8f}",
+                         f"{close:.8f}", f"{volume:.4f}", open_time + interval_ms - 1,
+                         f"{close * volume:.4f}", 5, "0", "0", "0"])
+            open_time += interval_ms
+        return rows
+
+    async def get_klines(self, **params):
+        from src.ohlcv import INTERVAL_MS
+
+        self.calls['klines'] += 1
+        await self._simulate_network()
+        if params['symbol'] not in self.prices:
+            raise FakeBinanceError("APIError(code=-1121): Invalid symbol.")
+        return self.klines(params['symbol'], INTERVAL_MS[params.get('interval', '1m')],
+                           params.get('startTime', 0), params.get('endTime', 2 ** 62), params.get('limit', 500))
+
+    async def close_connection(self):
+        pass
+
+    async def price_updates(self, interval: float = 0.0, symbols: Optional[Iterable[str]] = None,
+                            steps: Optional[int] = None):
+        """Push-style source for src.streaming: step the random walk and yield one update per symbol"""
+        from src.streaming import PriceUpdate
+
+        symbols = list(symbols) if symbols is not None else self.symbols
+        step = 0
+        while steps is None or step < steps:
+            await asyncio.sleep(interval)
+            self.step()
+            self.calls['stream'] += 1
+            for symbol in symbols:
+                yield PriceUpdate(symbol, self.prices[symbol])
+            step += 1
+
+
+class FakeUser(NamedTuple):
+    """Message author for FakeDiscord"""
+    id: int
+    name: str
+
+    def __str__(self):
+        return self.name
+
+
+class FakeChannel:
+    """Text channel stand-in: counts what the bot sends and keeps only the latest ``keep`` messages.
+
+    Replies starting with ❌ (the bot's error replies) are counted
+    separately. ``latency`` delays every send like a Discord round-trip.
+    """
+
+    def __init__(self, channel_id: int, latency: float = 0.0, keep: int = 20):
+        self.id = channel_id
+        self.latency = latency
+        self.sent: deque = deque(maxlen=keep)
+        self.messages = 0
+        self.errors = 0
+
+    async def send(self, content: str):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.messages += 1
+        if content.startswith('❌'):
+            self.errors += 1
+        self.sent.append(content)
+
+
+class FakeMessage(NamedTuple):
+    id: int
+    content: str
+    author: FakeUser
+    channel: FakeChannel
+
+
+class FakeDiscord:
+    """In-process stand-in for the Discord side of the bot: channels, users and incoming messages.
+
+    Pass ``get_channel`` where the bot resolves channel ids (e.g. its
+    BroadcastScheduler) and feed ``message(...)`` results to ``on_message``.
+    """
+
+    def __init__(self, channels: int = 10, users: int = 100, latency: float = 0.0):
+        self.channels: Dict[int, FakeChannel] = {
+            1000 + i: FakeChannel(1000 + i, latency=latency) for i in range(channels)
+        }
+        self.users = [FakeUser(2 + i, f"user{i}") for i in range(users)]
+        self._channel_list = list(self.channels.values())
+        self._ids = count(1)
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channels.get(channel_id)
+
+    def message(self, content: str, channel_id: Optional[int] = None, author: Optional[FakeUser] = None) -> FakeMessage:
+        message_id = next(self._ids)
+        channels = self._channel_list
+        channel = self.channels[channel_id] if channel_id is not None else channels[message_id % len(channels)]
+        return FakeMessage(message_id, content, author or self.users[message_id % len(self.users)], channel)
+
+    @property
+    def messages_sent(self) -> int:
+        return sum(channel.messages for channel in self.channels.values())
+
+    @property
+    def error_replies(self) -> int:
+        return sum(channel.errors for channel in self.channels.values())
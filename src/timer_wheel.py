@@ -0,0 +1,70 @@
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TimingWheel:
+    """Hashed timing wheel of keyed deadlines (epoch seconds).
+
+    ``slots`` buckets of ``resolution`` seconds each; an entry lives in the
+    bucket of its deadline's tick. ``schedule`` and ``cancel`` are O(1) and
+    ``advance`` only visits the buckets of the ticks that passed, so the
+    cost of expiring an entry is O(1) amortized. Deadlines more than one
+    revolution (``slots * resolution`` seconds) ahead stay in their bucket
+    and are skipped on each pass until they are due.
+    """
+
+    def __init__(self, resolution: float = 1.0, slots: int = 512):
+        self.resolution = resolution
+        self._slots: List[Dict[Hashable, Tuple[float, object]]] = [{} for _ in range(slots)]
+        self._where: Dict[Hashable, int] = {}
+        self._tick: Optional[int] = None  # first tick not fully expired yet
+        self._advanced = False
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, deadline: float, item: object):
+        """Schedule (or reschedule) ``item`` under ``key`` to expire at ``deadline``"""
+        self.cancel(key)
+        tick = int(deadline // self.resolution)
+        if self._tick is None or (not self._advanced and tick < self._tick):
+            self._tick = tick  # nothing expired yet: start from the earliest deadline
+        elif tick < self._tick:
+            tick = self._tick  # already overdue: expire on the next advance
+        index = tick % len(self._slots)
+        self._slots[index][key] = (deadline, item)
+        self._where[key] = index
+
+    def cancel(self, key: Hashable) -> bool:
+        index = self._where.pop(key, None)
+        if index is None:
+            return False
+        del self._slots[index][key]
+        return True
+
+    def advance(self, now: float) -> List:
+        """Remove and return the items whose deadline is at or before ``now``, earliest first"""
+        if self._tick is None:
+            return []
+        now_tick = int(now // self.resolution)
+        if now_tick < self._tick:
+            return []
+
+        due = []
+        slots = self._slots
+        # A gap longer than one revolution still visits each bucket only once
+        for tick in range(self._tick, min(now_tick, self._tick + len(slots) - 1) + 1):
+            slot = slots[tick % len(slots)]
+            if not slot:
+                continue
+            expired = [key for key, (deadline, _) in slot.items() if deadline <= now]
+            for key in expired:
+                due.append(slot.pop(key))
+                del self._where[key]
+        self._tick = now_tick
+        self._advanced = True
+
+        due.sort(key=lambda entry: entry[0])
+        return [item for _, item in due]
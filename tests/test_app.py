@@ -0,0 +1,109 @@
+import asyncio
+import os
+import subprocess
+import sys
+import pytest
+
+pytest.importorskip('numpy')
+
+from src.app import Settings, create_app
+from src.ohlcv import OHLCVStore
+from src.testing import FakeBinanceClient
+
+START = 1704067200000  # 2024-01-01T00:00:00Z
+
+
+@pytest.fixture
+def settings(tmp_path):
+    return Settings(journal_path=str(tmp_path / 'tradisb.journal'), ohlcv_dir=str(tmp_path / 'ohlcv'),
+                    subscriptions_path=str(tmp_path / 'subscriptions.json'))
+
+
+def test_settings_from_env():
+    """Test environment variables are parsed and missing ones keep their defaults"""
+    settings = Settings.from_env({
+        'TRADISB_OHLCV_SYMBOLS': 'btcusdt, ethusdt',
+        'TRADISB_SCAN_WORKERS': '2',
+        'TRADISB_METRICS_PORT': '',
+        'TRADISB_DEFAULT_TOPICS': 'BTC,SELL',
+    })
+
+    assert settings.ohlcv_symbols == ('BTCUSDT', 'ETHUSDT')
+    assert settings.scan_workers == 2 and settings.metrics_port == 0
+    assert settings.default_topics == ('BTC', 'SELL')
+    assert settings.journal_path == 'tradisb.journal' and settings.price_stream == 'bookTicker'
+
+
+def test_import_and_build_have_no_side_effects(tmp_path):
+    """Test importing main and building the app loads neither discord.py, python-binance nor NumPy
+    and creates no files"""
+    code = (
+        "import sys, main\n"
+        "from src.app import create_app\n"
+        "create_app()\n"
+        "print(sorted(m for m in ('discord', 'binance', 'aiohttp', 'numpy') if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = {k: v for k, v in os.environ.items() if not k.startswith('TRADISB_')}
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                            cwd=str(tmp_path), env=dict(env, PYTHONPATH=root))
+
+    assert result.stdout.strip() == '[]'
+    assert list(tmp_path.iterdir()) == []
+
+
+class TestApp:
+
+    def test_preload_restores_state_once(self, settings):
+        """Test the preload recovers the journal and warms indicators in the background"""
+        previous = create_app(settings)
+        fake = FakeBinanceClient(symbols=2, seed=1)
+        signal = previous.validator.generate_trading_signal({
+            'symbol': 'BTCUSDT', 'lastPrice': '50000', 'priceChangePercent': '7.5', 'volume': '5000'
+        })
+        previous.validator.create_pseudo_order(signal, 0.5)
+        previous.journal.flush()
+        asyncio.run(OHLCVStore(settings.ohlcv_dir).sync(fake, 'BTCUSDT', START, START + 3_600_000))
+
+        app = create_app(settings)
+
+        async def scenario():
+            first = app.preload()
+            assert app.preload() is first
+            return await first
+
+        assert asyncio.run(scenario()) == [2, 1, 0]
+        assert len(app.validator.get_pending_orders()) == 1
+        assert app.indicators.get('BTCUSDT').samples > 0
+        stages = app.metrics.gauge_values()['startup_seconds']
+        assert sorted(v for (_, v), in stages) == ['built', 'preloaded']
+
+    def test_scan_workers_skip_parent_warm_up(self, settings):
+        """Test indicators are not warmed in the bot process when scan workers own them"""
+        asyncio.run(OHLCVStore(settings.ohlcv_dir).sync(FakeBinanceClient(symbols=2, seed=1), 'BTCUSDT',
+                                                        START, START + 3_600_000))
+        app = create_app(settings._replace(scan_workers=2))
+
+        assert app.warm_indicators() == 0
+        assert 'BTCUSDT' not in app.indicators
+
+    def test_market_data_uses_injected_client(self, settings):
+        """Test an injected Binance client is used without connecting"""
+        fake = FakeBinanceClient(symbols=3, seed=2)
+        app = create_app(settings, client=fake)
+
+        ticker = asyncio.run(app.quotes.get('BTCUSDT'))
+
+        assert ticker['symbol'] == 'BTCUSDT'
+        assert fake.calls['symbol'] == 1
+
+
+def test_create_client_is_wired_to_app(settings):
+    """Test the Discord client is built lazily around the app"""
+    pytest.importorskip('discord')
+    app = create_app(settings)
+
+    client = app.create_client()
+
+    assert client.app is app
+    assert client.intents.message_content
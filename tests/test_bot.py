@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+pytest.importorskip('numpy')
+pytest.importorskip('discord')
+
+from src.app import Settings, create_app
+from src.testing import FakeBinanceClient, FakeDiscord
+
+
+@pytest.fixture
+def client(tmp_path):
+    settings = Settings(journal_path=str(tmp_path / 'tradisb.journal'), ohlcv_dir=str(tmp_path / 'ohlcv'),
+                        subscriptions_path=str(tmp_path / 'subscriptions.json'))
+    return create_app(settings, client=FakeBinanceClient(symbols=3, seed=1)).create_client()
+
+
+def test_stats_reply_reaches_uncached_channel(client):
+    """Test !stats replies in the message's channel even when get_channel cannot resolve it (DMs)"""
+    discord = FakeDiscord(channels=1)
+    message = discord.message('!stats')
+
+    asyncio.run(client.on_message(message))
+
+    assert client.get_channel(message.channel.id) is None
+    assert message.channel.messages >= 1
+    assert message.channel.sent[0].startswith('⏱️ **Bot Stats**')
+    assert all(len(part) <= 2000 for part in message.channel.sent)
+
+
+def test_pnl_reply_reaches_uncached_channel(client):
+    """Test !pnl marks positions and replies in the message's channel"""
+    app = client.app
+    app.portfolio.apply_fill('BTCUSDT', 1.0, 100.0)
+    discord = FakeDiscord(channels=1)
+    message = discord.message('!pnl')
+
+    async def scenario():
+        engine = asyncio.create_task(app.engine.run())
+        await client.on_message(message)
+        engine.cancel()
+
+    asyncio.run(scenario())
+
+    assert message.channel.errors == 0
+    assert message.channel.sent[0].startswith('💼')
+    assert 'BTCUSDT' in message.channel.sent[0]
+
+
+def test_permission_loss_mutes_channel_and_keeps_topics(client):
+    """Test a channel that loses send permission stops receiving fills and keeps its subscriptions"""
+    import discord
+
+    subscriptions = client.app.subscriptions
+    subscriptions.subscribe(7, ['BTC'])
+    channel = Mock(spec=discord.TextChannel, id=7)
+
+    channel.permissions_for.return_value.send_messages = False
+    asyncio.run(client.on_guild_channel_update(channel, channel))
+
+    assert subscriptions.channels_for('BTCUSDT') == set()
+    assert subscriptions.topics(7) == ['BTCUSDT']
+
+    channel.permissions_for.return_value.send_messages = True
+    asyncio.run(client.on_guild_channel_update(channel, channel))
+
+    assert subscriptions.channels_for('BTCUSDT') == {7}
+
+
+def test_subscription_changes_require_manage_channels(client):
+    """Test members without Manage Channels can list but not change a channel's subscriptions"""
+    subscriptions = client.app.subscriptions
+    subscriptions.subscribe(7, ['BTC'])
+    sent = []
+
+    async def send(content):
+        sent.append(content)
+
+    channel = Mock(id=7, send=send)
+    channel.permissions_for.return_value.manage_channels = False
+
+    for content in ('!unsubscribe', '!subscriptions'):
+        message = Mock(content=content, channel=channel, author=Mock())
+        asyncio.run(client.handle_subscription_command(message, content))
+
+    assert sent[0].startswith('❌') and 'Manage Channels' in sent[0]
+    assert '`BTCUSDT`' in sent[1]
+    assert subscriptions.topics(7) == ['BTCUSDT']
+
+    channel.permissions_for.return_value.manage_channels = True
+    message = Mock(content='!unsubscribe', channel=channel, author=Mock())
+    asyncio.run(client.handle_subscription_command(message, '!unsubscribe'))
+
+    assert subscriptions.topics(7) == []
@@ -0,0 +1,100 @@
+import asyncio
+from src.broadcast import BroadcastScheduler, TokenBucket, split_message
+
+
+class Forbidden(Exception):
+    pass
+
+
+class FakeChannel:
+    def __init__(self, forbidden=False, delay=0.0):
+        self.forbidden = forbidden
+        self.delay = delay
+        self.sent = []
+
+    async def send(self, content):
+        await asyncio.sleep(self.delay)
+        if self.forbidden:
+            raise Forbidden()
+        self.sent.append(content)
+
+
+class TestSplitMessage:
+
+    def test_merges_parts_under_limit(self):
+        """Test small parts are merged into one message"""
+        assert split_message(['a', 'b', 'c'], limit=20) == ['a\n\nb\n\nc']
+
+    def test_splits_at_limit_without_reordering(self):
+        """Test parts overflow into new messages in order"""
+        parts = ['x' * 8, 'y' * 8, 'z' * 8]
+
+        messages = split_message(parts, limit=20)
+
+        assert messages == ['x' * 8 + '\n\n' + 'y' * 8, 'z' * 8]
+        assert all(len(m) <= 20 for m in messages)
+
+    def test_oversized_part_split_on_lines(self):
+        """Test a single part longer than the limit is split on line breaks"""
+        part = '\n'.join(['line%02d' % i for i in range(10)])
+
+        messages = split_message([part], limit=20)
+
+        assert all(len(m) <= 20 for m in messages)
+        assert '\n'.join(messages).replace('\n\n', '\n') == part
+
+
+def test_token_bucket_limits_rate():
+    """Test a bucket allows its burst immediately and then waits for refills"""
+    async def scenario():
+        bucket = TokenBucket(rate=100.0, capacity=2)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(4):
+            await bucket.acquire()
+        return loop.time() - start
+
+    assert asyncio.run(scenario()) >= 0.015
+
+
+class TestBroadcastScheduler:
+
+    def test_broadcast_concurrent_and_merged(self):
+        """Test one merged message goes to every channel concurrently"""
+        channels = {i: FakeChannel(delay=0.05) for i in range(20)}
+        scheduler = BroadcastScheduler(channels.get, max_concurrency=20)
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            sent = await scheduler.broadcast(channels, ['fill 1', 'fill 2', 'fill 3'])
+            return sent, loop.time() - start
+
+        sent, elapsed = asyncio.run(scenario())
+
+        assert sent == 20
+        assert elapsed < 0.5  # sequential sends would take 1s
+        assert all(c.sent == ['fill 1\n\nfill 2\n\nfill 3'] for c in channels.values())
+
+    def test_broadcast_skips_forbidden_and_missing_channels(self):
+        """Test forbidden or unknown channels do not stop the broadcast"""
+        channels = {1: FakeChannel(forbidden=True), 2: FakeChannel()}
+        scheduler = BroadcastScheduler(channels.get, skip_exceptions=(Forbidden,))
+
+        sent = asyncio.run(scheduler.broadcast([1, 2, 3], ['fill']))
+
+        assert sent == 1
+        assert channels[2].sent == ['fill']
+
+    def test_submit_runs_in_background(self):
+        """Test submit returns immediately and the task completes later"""
+        channel = FakeChannel(delay=0.01)
+        scheduler = BroadcastScheduler({1: channel}.get)
+
+        async def scenario():
+            task = scheduler.submit([1], ['fill'])
+            assert channel.sent == []
+            return await task
+
+        assert asyncio.run(scenario()) == 1
+        assert channel.sent == ['fill']
@@ -0,0 +1,90 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from src.compact import OrderArchive, OrderColumns, from_epoch_ns, to_epoch_ns
+from src.journal import Journal
+from src.schema import PseudoOrder, TradingSignalValidator, OrderType, OrderStatus
+
+
+@pytest.fixture
+def sample_order():
+    return PseudoOrder(
+        id='ORDER_1_BTCUSDT_1704067200',
+        symbol='BTCUSDT',
+        order_type=OrderType.SELL,
+        quantity=0.5,
+        price=42000.0,
+        timestamp=datetime(2024, 1, 1, 12, 0, 0, 123456)
+    )
+
+
+def test_epoch_ns_round_trip():
+    """Test epoch-ns conversion is exact to the microsecond"""
+    timestamp = datetime(2024, 3, 10, 8, 30, 15, 654321)
+
+    assert to_epoch_ns(timestamp) % 1000 == 0
+    assert from_epoch_ns(to_epoch_ns(timestamp)) == timestamp
+
+
+class TestColumns:
+
+    def test_order_columns_copies(self, sample_order):
+        """Test OrderColumns hands out dataclass copies that change rows only when written back"""
+        sample_order.ttl = timedelta(minutes=10, microseconds=5)
+        columns = OrderColumns()
+        index = columns.append(sample_order)
+
+        view = columns[index]
+        assert view == sample_order
+        assert view.fill_price is None and view.fill_timestamp is None
+
+        view.status = OrderStatus.FILLED
+        assert columns[index].status == OrderStatus.PENDING
+        view.fill_price = 41990.0
+        view.fill_timestamp = datetime(2024, 1, 1, 12, 2, 0)
+        view.filled_quantity = view.quantity
+        columns.update(index, view)
+
+        assert columns[-1] == view
+        assert list(columns) == [view]
+
+
+class TestOrderArchive:
+
+    def make_order(self, sample_order, i):
+        return PseudoOrder(id=f"ORDER_{i}", symbol=sample_order.symbol, order_type=sample_order.order_type,
+                           quantity=float(i), price=sample_order.price, timestamp=sample_order.timestamp,
+                           status=OrderStatus.CANCELLED)
+
+    def test_keeps_newest_orders_oldest_first(self, sample_order):
+        """Test the ring overwrites the oldest order like deque(maxlen=...)"""
+        archive = OrderArchive(maxlen=3)
+        for i in range(5):
+            archive.append(self.make_order(sample_order, i))
+
+        assert len(archive) == 3 and archive.maxlen == 3
+        assert [o.id for o in archive] == ['ORDER_2', 'ORDER_3', 'ORDER_4']
+        assert archive[0].id == 'ORDER_2' and archive[-1].id == 'ORDER_4'
+        with pytest.raises(IndexError):
+            archive[3]
+
+    def test_validator_columnar_mode_round_trip(self, tmp_path):
+        """Test a validator with columnar order storage archives and journals settled orders"""
+        journal = Journal(str(tmp_path / 'tradisb.journal'), fsync=False)
+        validator = TradingSignalValidator(Mock(), journal=journal, order_storage='columnar', order_archive_size=2)
+        signal = validator.generate_trading_signal({
+            'symbol': 'BTCUSDT', 'lastPrice': '50000', 'priceChangePercent': '7.5', 'volume': '5000'
+        })
+        orders = [validator.create_pseudo_order(signal, 0.001) for _ in range(3)]
+        for order in orders:
+            validator.simulate_order_fill(order, 50010.0)
+        journal.flush()
+
+        assert isinstance(validator.orders.archived, OrderArchive)
+        assert list(validator.orders.archived) == orders[1:]
+
+        restored = TradingSignalValidator(Mock(), order_storage='columnar', order_archive_size=2)
+        journal.recover(restored)
+        assert list(restored.orders.archived) == orders[1:]
+        with pytest.raises(ValueError):
+            TradingSignalValidator(Mock(), order_storage='slots')
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+np = pytest.importorskip('numpy')
+
+from src.depth import DepthFillSimulator, DepthSnapshot, read_depth_snapshots, walk_book
+from src.market_data import MarketDataClient
+from src.polling import poll_market
+from src.schema import OrderStatus, TradingSignal, TradingSignalValidator
+from src.testing import FakeBinanceClient
+
+
+@pytest.fixture
+def validator():
+    return TradingSignalValidator(Mock())
+
+
+def make_order(validator, price, quantity, signal_type="BUY", symbol='BTCUSDT'):
+    return validator.create_pseudo_order(TradingSignal(
+        symbol=symbol, signal_type=signal_type, price=price, change_percent=6.0,
+        volume=2000.0, timestamp=datetime.now(), confidence=0.6
+    ), quantity)
+
+
+def book(bids=(), asks=()):
+    return DepthSnapshot.from_binance('BTCUSDT', {
+        'bids': [[str(p), str(q)] for p, q in bids],
+        'asks': [[str(p), str(q)] for p, q in asks],
+    })
+
+
+class TestWalkBook:
+
+    def test_orders_share_liquidity_in_priority_order(self):
+        """Test later orders only get the depth left by more aggressive ones"""
+        levels = np.array([[100.0, 1.0], [101.0, 1.0], [102.0, 1.0]])
+        filled, vwap = walk_book(levels, np.array([1.5, 1.0, 5.0]), np.array([110.0, 101.5, 101.5]), buy=True)
+
+        np.testing.assert_allclose(filled, [1.5, 0.5, 0.0])
+        np.testing.assert_allclose(vwap[:2], [(100.0 + 0.5 * 101.0) / 1.5, 101.0])
+        assert np.isnan(vwap[2])
+
+    def test_sell_walks_bids_down_to_limit(self):
+        """Test sell orders consume bids from the best price down to their limit"""
+        levels = np.array([[100.0, 1.0], [99.0, 2.0], [98.0, 4.0]])
+        filled, vwap = walk_book(levels, np.array([5.0]), np.array([99.0]), buy=False)
+
+        np.testing.assert_allclose(filled, [3.0])
+        np.testing.assert_allclose(vwap, [(100.0 + 2 * 99.0) / 3])
+
+
+class TestDepthFillSimulator:
+
+    def test_partial_fill_stays_pending(self, validator):
+        """Test thin depth fills part of an order and tracks its average price"""
+        order = make_order(validator, 100.0, 3.0)
+        simulator = DepthFillSimulator(validator)
+
+        fills = simulator.process_snapshot(book(asks=[(100.0, 1.0), (100.5, 1.0), (105.0, 10.0)]))
+
+        assert [(f.order, f.quantity) for f in fills] == [(order, 2.0)]
+        assert order.status == OrderStatus.PENDING
+        assert order.filled_quantity == 2.0
+        assert order.fill_price == pytest.approx(100.25)
+        assert fills[0].slippage_percent == pytest.approx(0.25)
+
+        simulator.process_snapshot(book(asks=[(99.0, 5.0)]))
+
+        assert order.status == OrderStatus.FILLED
+        assert order.filled_quantity == 3.0
+        assert order.fill_price == pytest.approx((200.5 + 99.0) / 3)
+        assert order not in validator.get_pending_orders()
+
+    def test_sell_slippage_sign(self, validator):
+        """Test selling below the order price counts as positive slippage"""
+        order = make_order(validator, 100.0, 1.0, signal_type="SELL")
+
+        fills = DepthFillSimulator(validator).process_snapshot(book(bids=[(99.5, 2.0)]))
+
+        assert order.status == OrderStatus.FILLED
+        assert fills[0].price == 99.5
+        assert fills[0].slippage_percent == pytest.approx(0.5)
+
+    def test_most_aggressive_order_fills_first(self, validator):
+        """Test price priority decides which order gets scarce depth"""
+        low = make_order(validator, 100.0, 1.0)
+        high = make_order(validator, 100.5, 1.0)
+
+        DepthFillSimulator(validator).process_snapshot(book(asks=[(100.8, 1.0)]))
+
+        assert high.status == OrderStatus.FILLED
+        assert low.status == OrderStatus.PENDING and low.filled_quantity == 0.0
+
+    def test_match_does_not_apply(self, validator):
+        """Test match only computes fills"""
+        order = make_order(validator, 100.0, 1.0)
+
+        fills = DepthFillSimulator(validator).match(book(asks=[(100.0, 1.0)]), [order])
+
+        assert len(fills) == 1
+        assert order.status == OrderStatus.PENDING
+
+    def test_empty_side_fills_nothing(self, validator):
+        """Test an empty book side leaves orders untouched"""
+        make_order(validator, 100.0, 1.0)
+
+        assert DepthFillSimulator(validator).process_snapshot(book(bids=[(100.0, 1.0)])) == []
+
+
+def test_read_depth_snapshots(tmp_path):
+    """Test snapshots stream from a JSON-lines file"""
+    path = tmp_path / 'depth.jsonl'
+    path.write_text(json.dumps({'symbol': 'BTCUSDT', 'timestamp': 5,
+                                'bids': [['99', '1']], 'asks': [['101', '2'], ['102', '0']]}) + '\n\n')
+
+    [snapshot] = list(read_depth_snapshots(str(path)))
+
+    assert snapshot.symbol == 'BTCUSDT' and snapshot.timestamp == 5
+    assert snapshot.asks.tolist() == [[101.0, 2.0]]
+    assert snapshot.mid_price == 100.0
+
+
+def test_poll_market_fills_from_depth(validator):
+    """Test a depth-model tick fetches books only for symbols with pending orders"""
+    fake = FakeBinanceClient(symbols=10, seed=3)
+    order = make_order(validator, fake.prices['ETHUSDT'], 0.05, symbol='ETHUSDT')
+
+    filled = asyncio.run(poll_market(MarketDataClient(client=fake), validator,
+                                     depth=DepthFillSimulator(validator)))
+
+    assert filled == [order]
+    assert order.fill_price > order.price  # bought above the mid across the spread
+    assert fake.calls == {'all': 1, 'depth': 1}
@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+from src.engine import TradingEngine
+from src.market_data import MarketDataClient
+from src.polling import poll_market
+from src.portfolio import Portfolio
+from src.schema import OrderStatus, TradingSignal, TradingSignalValidator
+from src.streaming import PriceUpdate, StreamingFillEngine, replay_source
+from src.testing import FakeBinanceClient
+
+
+@pytest.fixture
+def validator():
+    return TradingSignalValidator(Mock())
+
+
+def make_signal(symbol='BTCUSDT', price=100.0):
+    return TradingSignal(
+        symbol=symbol, signal_type="BUY", price=price, change_percent=6.0,
+        volume=2000.0, timestamp=datetime.now(), confidence=0.6
+    )
+
+
+async def with_engine(engine, scenario):
+    task = asyncio.create_task(engine.run())
+    try:
+        return await scenario()
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class TestTradingEngine:
+
+    def test_submit_returns_result_and_fresh_snapshot(self, validator):
+        """Test a submitted command runs on the engine and is visible in the next snapshot"""
+        engine = TradingEngine(validator, snapshot_interval=60)
+
+        async def scenario():
+            order = await engine.submit(validator.create_pseudo_order, make_signal(), 1.0, fresh=True)
+            return order, engine.snapshot
+
+        order, snapshot = asyncio.run(with_engine(engine, scenario))
+
+        assert snapshot.version == 1
+        assert [o.id for o in snapshot.pending_orders] == [order.id]
+        assert snapshot.pending_symbols == {'BTCUSDT'}
+
+    def test_create_order_returns_copy_and_expiry(self, validator):
+        """Test create_order resolves to an order copy and its expiry, computed on the engine"""
+        engine = TradingEngine(validator, snapshot_interval=60)
+
+        async def scenario():
+            return await engine.create_order(make_signal(), 1.0, ttl=timedelta(minutes=5))
+
+        order, expires_at = asyncio.run(with_engine(engine, scenario))
+        live, = validator.get_pending_orders()
+
+        assert order == live and order is not live
+        assert expires_at == order.timestamp + timedelta(minutes=5)
+        assert [o.id for o in engine.snapshot.pending_orders] == [order.id]
+
+    def test_snapshot_publishes_portfolio_totals(self):
+        """Test the snapshot carries the portfolio's realized PnL and open positions"""
+        pytest.importorskip('numpy')
+        portfolio = Portfolio()
+        validator = TradingSignalValidator(Mock(), portfolio=portfolio)
+        engine = TradingEngine(validator)
+        assert engine.snapshot.portfolio.open_positions == 0
+
+        portfolio.apply_fill('BTCUSDT', 2.0, 100.0)
+        portfolio.apply_fill('BTCUSDT', -1.0, 110.0)
+        engine.publish()
+
+        mark = engine.snapshot.portfolio
+        assert (mark.realized_pnl, mark.open_positions) == (10.0, 1)
+        assert [p.symbol for p in mark.positions] == ['BTCUSDT']
+
+    def test_snapshot_is_isolated_from_later_changes(self, validator):
+        """Test published orders are copies that later fills do not change"""
+        engine = TradingEngine(validator)
+        order = validator.create_pseudo_order(make_signal(), 1.0)
+        engine.publish()
+        published, = engine.snapshot.pending_orders
+
+        validator.simulate_order_fill(order, 100.0)
+
+        assert order.status == OrderStatus.FILLED
+        assert published.status == OrderStatus.PENDING
+        assert len(engine.snapshot.pending_orders) == 1
+
+    def test_events_run_in_micro_batches_in_order(self, validator):
+        """Test queued events are drained in batches of at most max_batch, in queue order"""
+        engine = TradingEngine(validator, max_batch=4, snapshot_interval=60)
+        seen = []
+
+        async def scenario():
+            for i in range(10):
+                engine.post(seen.append, i)
+            await engine.submit(seen.append, 'done')
+
+        asyncio.run(with_engine(engine, scenario))
+
+        assert seen == list(range(10)) + ['done']
+        assert engine.version == 3  # 4 + 4 + 3 items
+
+    def test_errors_reach_the_submitter(self, validator):
+        """Test a failing command raises in the caller and the engine keeps running"""
+        engine = TradingEngine(validator)
+
+        def fail():
+            raise ValueError('bad order')
+
+        async def scenario():
+            engine.post(fail)
+            with pytest.raises(ValueError):
+                await engine.submit(fail)
+            return await engine.submit(len, 'abc')
+
+        assert asyncio.run(with_engine(engine, scenario)) == 3
+
+    def test_deferred_snapshot_published_when_idle(self, validator):
+        """Test changes without fresh are published once the queue goes quiet"""
+        engine = TradingEngine(validator, snapshot_interval=0.01)
+        engine.publish()
+
+        async def scenario():
+            engine._published_at = float('inf')  # next batch is not due to publish
+            await engine.submit(validator.create_pseudo_order, make_signal(), 1.0)
+            before = len(engine.snapshot.pending_orders)
+            await asyncio.sleep(0.05)
+            return before, len(engine.snapshot.pending_orders)
+
+        assert asyncio.run(with_engine(engine, scenario)) == (0, 1)
+
+
+class TestEngineIntegration:
+
+    def test_poll_market_through_engine(self, validator):
+        """Test a polling tick applies its snapshot on the engine task"""
+        fake = FakeBinanceClient(symbols=20, seed=7)
+        order = validator.create_pseudo_order(make_signal('ETHUSDT', fake.prices['ETHUSDT']), 1.0)
+        engine = TradingEngine(validator)
+
+        filled = asyncio.run(with_engine(engine, lambda: poll_market(
+            MarketDataClient(client=fake), validator, engine=engine)))
+
+        assert filled == [order]
+        assert engine.version == 1
+
+    def test_stream_updates_posted_to_engine(self, validator):
+        """Test stream updates are applied by the engine rather than the stream task"""
+        order = validator.create_pseudo_order(make_signal(), 1.0)
+        engine = TradingEngine(validator)
+        streaming = StreamingFillEngine(validator, None, engine=engine)
+
+        async def scenario():
+            await streaming.consume(replay_source([PriceUpdate('BTCUSDT', 150.0), PriceUpdate('BTCUSDT', 100.0)]))
+            await engine.submit(lambda: None)
+
+        asyncio.run(with_engine(engine, scenario))
+
+        assert order.status == OrderStatus.FILLED
+        assert streaming.updates == 2
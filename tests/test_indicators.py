@@ -0,0 +1,133 @@
+import math
+import random
+import statistics
+import pytest
+from unittest.mock import Mock
+
+from src.indicators import IndicatorEngine, SymbolIndicators
+from src.schema import TradingSignalValidator
+
+
+@pytest.fixture
+def ticks():
+    rng = random.Random(5)
+    price = 100.0
+    rows = []
+    for _ in range(500):
+        price *= math.exp(rng.gauss(0, 0.01))
+        rows.append((price, rng.uniform(0, 50)))
+    return rows
+
+
+def brute_force(rows, window):
+    """Recompute the indicators of the last window from scratch"""
+    prices = [p for p, _ in rows]
+    volumes = [v for _, v in rows][-window:]
+    returns = [math.log(b / a) for a, b in zip(prices, prices[1:])][-window:]
+    vwap = sum(p * v for p, v in rows[-window:]) / sum(volumes)
+    zscore = (volumes[-1] - statistics.mean(volumes)) / statistics.stdev(volumes)
+    return statistics.stdev(returns), vwap, zscore
+
+
+class TestSymbolIndicators:
+
+    def test_matches_full_recomputation(self, ticks):
+        """Test incremental values equal a from-scratch computation over the window"""
+        state = SymbolIndicators(window=20, ema_span=10)
+        for i, (price, volume) in enumerate(ticks):
+            result = state.update(price, volume)
+            if i in (5, 19, 20, 21, 250, 499):
+                volatility, vwap, zscore = brute_force(ticks[:i + 1], 20)
+                assert result.volatility == pytest.approx(volatility, rel=1e-6)
+                assert result.vwap == pytest.approx(vwap, rel=1e-9)
+                assert result.volume_zscore == pytest.approx(zscore, rel=1e-6)
+
+    def test_ema(self):
+        """Test the EMA starts at the first price and moves by alpha"""
+        state = SymbolIndicators(window=5, ema_span=3)  # alpha = 0.5
+        state.update(100.0, 1.0)
+        result = state.update(110.0, 1.0)
+
+        assert result.ema == pytest.approx(105.0)
+        assert result.samples == 2
+
+    def test_resync_keeps_values(self, ticks, monkeypatch):
+        """Test periodic resynchronisation of running sums changes nothing observable"""
+        monkeypatch.setattr(SymbolIndicators, 'RESYNC_EVERY', 1)
+        state = SymbolIndicators(window=4, ema_span=3)
+        for price, volume in ticks:
+            result = state.update(price, volume)
+
+        volatility, vwap, _ = brute_force(ticks, 4)
+        assert result.volatility == pytest.approx(volatility, rel=1e-9)
+        assert result.vwap == pytest.approx(vwap, rel=1e-9)
+
+
+class TestIndicatorEngine:
+
+    def test_ticker_volume_becomes_increments(self):
+        """Test 24h volumes are turned into volume traded between snapshots"""
+        engine = IndicatorEngine(window=10)
+        engine.update_ticker('BTCUSDT', 100.0, 1000.0)
+        engine.update_ticker('BTCUSDT', 101.0, 1010.0)
+        result = engine.update_ticker('BTCUSDT', 102.0, 1005.0)  # old volume left the 24h window
+
+        assert result.vwap == pytest.approx(101.0)  # only the 10-unit increment carries weight
+        assert len(engine) == 1
+
+    def test_update_many_skips_bad_rows(self):
+        """Test missing symbols and NaN prices are skipped"""
+        engine = IndicatorEngine()
+
+        results = engine.update_many(['A', None, 'C'], [1.0, 2.0, float('nan')], [1.0, 1.0, 1.0])
+
+        assert list(results) == ['A']
+
+
+class TestValidatorConfidence:
+
+    def ticker(self, price, change_percent, volume):
+        return {'symbol': 'BTCUSDT', 'lastPrice': str(price),
+                'priceChangePercent': str(change_percent), 'volume': str(volume)}
+
+    def test_without_engine_unchanged(self):
+        """Test confidence stays |change| / 10 without an indicator engine"""
+        validator = TradingSignalValidator(Mock())
+
+        assert validator.generate_trading_signal(self.ticker(100, 6.0, 2000)).confidence == pytest.approx(0.6)
+
+    def test_trend_and_volume_raise_confidence(self):
+        """Test a rising price above its EMA with a volume spike scores higher"""
+        validator = TradingSignalValidator(Mock(), indicators=IndicatorEngine(window=30))
+        volume = 2000.0
+        for i in range(30):
+            volume += 10
+            validator.generate_trading_signal(self.ticker(100 + i * 0.1, 1.0, volume))
+
+        signal = validator.generate_trading_signal(self.ticker(106.0, 6.0, volume + 500))
+
+        # 0.6 * 0.6 base + 0.2 trend + 0.2 full volume score
+        assert signal.confidence == pytest.approx(0.36 + 0.2 + 0.2)
+
+    def test_counter_trend_lowers_confidence(self):
+        """Test a BUY signal below the EMA loses the trend component"""
+        validator = TradingSignalValidator(Mock(), indicators=IndicatorEngine(window=10))
+        for i in range(10):
+            validator.generate_trading_signal(self.ticker(110 - i, 1.0, 2000))
+
+        signal = validator.generate_trading_signal(self.ticker(95.0, 6.0, 2000))
+
+        assert signal.confidence == pytest.approx(0.36)
+
+    def test_vectorized_path_uses_indicators(self):
+        """Test whole-market scans feed the engine and use its confidence"""
+        pytest.importorskip('numpy')
+        engine = IndicatorEngine(window=10)
+        validator = TradingSignalValidator(Mock(), indicators=engine)
+        for i in range(10):
+            validator.generate_trading_signals([self.ticker(110 - i, 1.0, 2000)])
+
+        signal, = validator.generate_trading_signals([self.ticker(95.0, 6.0, 2000)])
+
+        assert engine.get('BTCUSDT').samples == 11
+        assert signal.confidence == pytest.approx(0.36)
@@ -0,0 +1,184 @@
+import asyncio
+import threading
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import Mock
+from src.journal import Journal
+from src.schema import TradingSignalValidator, OrderStatus
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return Journal(str(tmp_path / 'tradisb.journal'), fsync=False)
+
+
+@pytest.fixture
+def sample_ticker_data():
+    return {
+        'symbol': 'BTCUSDT',
+        'lastPrice': '50000.00',
+        'priceChangePercent': '7.5',
+        'volume': '5000.0'
+    }
+
+
+def populate(validator, ticker):
+    signal = validator.generate_trading_signal(ticker)
+    filled = validator.create_pseudo_order(signal, 0.001)
+    pending = validator.create_pseudo_order(signal, 0.002)
+    validator.simulate_order_fill(filled, 50100.0)
+    return signal, filled, pending
+
+
+class TestJournal:
+
+    def test_recover_round_trip(self, journal, sample_ticker_data):
+        """Test orders, fills and signals survive a restart"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        signal, filled, pending = populate(validator, sample_ticker_data)
+        journal.flush()
+
+        restored = TradingSignalValidator(Mock())
+        replayed = Journal(journal.path).recover(restored)
+
+        assert replayed == 4  # signal, 2 creations, 1 fill
+        assert list(restored.signals) == [signal]
+        assert restored.get_pending_orders() == [pending]
+        assert list(restored.orders.archived) == [filled]
+        assert restored.orders.archived[0].status == OrderStatus.FILLED
+
+    def test_order_ids_continue_after_recovery(self, journal, sample_ticker_data):
+        """Test recovered validators keep numbering orders after the last id"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        populate(validator, sample_ticker_data)
+        journal.flush()
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+        order = restored.create_pseudo_order(restored.get_latest_signal('BTCUSDT'), 1.0)
+
+        assert order.id.startswith('ORDER_3_')
+
+    def test_torn_tail_is_ignored(self, journal, sample_ticker_data):
+        """Test a partially written block is dropped on recovery"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        populate(validator, sample_ticker_data)
+        journal.flush()
+        validator.generate_trading_signal(sample_ticker_data)
+        journal.flush()
+        with open(journal.path, 'r+b') as f:
+            f.truncate(f.seek(0, 2) - 3)
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+
+        assert len(restored.signals) == 1
+        assert len(restored.orders) == 2
+
+    def test_snapshot_compacts_journal(self, journal, sample_ticker_data, tmp_path):
+        """Test snapshots replace the journal and recovery combines both"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        _, _, pending = populate(validator, sample_ticker_data)
+        journal.snapshot(validator)
+        validator.simulate_order_fill(pending, 50000.0)
+        journal.flush()
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+
+        assert restored.get_pending_orders() == []
+        assert [o.id for o in restored.orders.archived] == [o.id for o in validator.orders.archived]
+
+    def test_recover_keeps_newest_signals_only(self, journal, sample_ticker_data):
+        """Test recovery decodes only as many signals as the store holds"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        for _ in range(5):
+            validator.generate_trading_signal(sample_ticker_data)
+            journal.flush()
+
+        restored = TradingSignalValidator(Mock(), max_signals=2)
+        journal.recover(restored)
+
+        assert list(restored.signals) == list(validator.signals)[-2:]
+
+    def test_run_group_commits_in_background(self, journal, sample_ticker_data):
+        """Test the background task commits buffered events and flushes on cancel"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        journal.commit_interval = 0.01
+
+        async def scenario():
+            task = asyncio.create_task(journal.run(validator))
+            populate(validator, sample_ticker_data)
+            await asyncio.sleep(0.05)
+            validator.generate_trading_signal(sample_ticker_data)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        restored = TradingSignalValidator(Mock())
+        assert journal.recover(restored) == 5
+
+    @pytest.mark.parametrize('operation', ['_write', '_install_snapshot'])
+    def test_cancel_waits_for_write_in_flight(self, journal, sample_ticker_data, operation):
+        """Test cancelling mid-commit or mid-compact still leaves the final flush last"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        signal = validator.generate_trading_signal(sample_ticker_data)
+        order = validator.create_pseudo_order(signal, 1.0)
+        journal.commit_interval = 0.01
+        journal.snapshot_interval = 0.0 if operation == '_install_snapshot' else 3600.0
+        started = threading.Event()
+        slow = getattr(journal, operation)
+
+        def slow_operation(*args, **kwargs):
+            if threading.current_thread() is not threading.main_thread():  # the executor's write
+                started.set()
+                time.sleep(0.1)
+            return slow(*args, **kwargs)
+
+        setattr(journal, operation, slow_operation)
+
+        async def scenario():
+            task = asyncio.create_task(journal.run(validator))
+            while not started.is_set():
+                await asyncio.sleep(0.005)
+            validator.simulate_order_fill(order, signal.price)  # buffered while the write is in flight
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+        assert restored.get_pending_orders() == []
+        assert restored.orders.archived[0].status == OrderStatus.FILLED
+
+    def test_order_ttl_survives_recovery(self, journal, sample_ticker_data):
+        """Test per-order TTLs are journaled and rescheduled on recovery"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        signal = validator.generate_trading_signal(sample_ticker_data)
+        order = validator.create_pseudo_order(signal, 1.0, ttl=timedelta(seconds=30))
+        journal.flush()
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+
+        recovered, = restored.get_pending_orders()
+        assert recovered.ttl == timedelta(seconds=30)
+        assert restored.order_expiry(recovered) == validator.order_expiry(order)
+
+    def test_partial_fill_survives_recovery(self, journal, sample_ticker_data):
+        """Test a partially filled order recovers its filled quantity and average price"""
+        validator = TradingSignalValidator(Mock(), journal=journal)
+        signal = validator.generate_trading_signal(sample_ticker_data)
+        order = validator.create_pseudo_order(signal, 1.0)
+        validator.apply_fill(order, 0.25, 50100.0)
+        journal.flush()
+
+        restored = TradingSignalValidator(Mock())
+        journal.recover(restored)
+
+        recovered, = restored.get_pending_orders()
+        assert recovered.status == OrderStatus.PENDING
+        assert (recovered.filled_quantity, recovered.fill_price) == (0.25, 50100.0)
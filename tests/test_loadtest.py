@@ -0,0 +1,57 @@
+import asyncio
+import pytest
+
+pytest.importorskip('numpy')
+
+from src.loadtest import LoadHarness, _growth_per_hour, parse_mix
+from src.testing import FakeDiscord
+
+
+def test_parse_mix():
+    """Test command weights are parsed and unknown commands rejected"""
+    assert parse_mix('price=6, !order=2,signals') == {'price': 6.0, 'order': 2.0, 'signals': 1.0}
+    with pytest.raises(ValueError):
+        parse_mix('price=1,buy=2')
+
+
+def test_growth_per_hour_is_a_slope():
+    """Test memory growth is the fitted slope, not the last sample"""
+    samples = [(t, 100.0 + t / 60) for t in range(0, 600, 10)]
+
+    assert _growth_per_hour(samples) == pytest.approx(60.0)
+    assert _growth_per_hour(samples[:1]) == 0.0
+
+
+class TestFakeDiscord:
+
+    def test_messages_rotate_over_channels_and_users(self):
+        """Test messages spread over channels and replies are counted per channel"""
+        discord = FakeDiscord(channels=2, users=3)
+        messages = [discord.message('!price BTC') for _ in range(4)]
+
+        for message in messages:
+            asyncio.run(message.channel.send('❌ Error' if message.id % 2 else 'ok'))
+
+        assert {m.channel.id for m in messages} == set(discord.channels)
+        assert len({m.author for m in messages}) == 3
+        assert discord.messages_sent == 4 and discord.error_replies == 2
+        assert discord.get_channel(messages[0].channel.id) is messages[0].channel
+
+
+def test_harness_drives_commands_and_polling(tmp_path):
+    """Test a short run exercises commands, the polling loop and broadcasts end to end"""
+    pytest.importorskip('discord')
+    harness = LoadHarness(rate=400, duration=0.5, symbols=20, channels=3, poll_interval=0.1,
+                          step_interval=0.05, sample_interval=0.1, directory=str(tmp_path), seed=4)
+
+    report = asyncio.run(harness.run())
+
+    assert report.commands == report.completed == 200
+    assert report.failures == 0 and report.shed == 0
+    assert report.latency['all']['count'] == 200
+    assert sum(report.latency[name]['count'] for name in ('price', 'order', 'signals')) == 200
+    assert report.tick['poll_tick_duration_seconds']['count'] >= 3
+    assert report.upstream_calls['all'] >= 3
+    assert report.messages_sent >= 200
+    assert report.state['subscribed_channels'] == 3
+    assert report.memory['peak_mb'] >= report.memory['start_mb'] > 0
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import pytest
+from src.market_data import MarketDataClient, MarketDataTimeout
+
+
+class FakeAsyncBinance:
+    """Minimal async stand-in for binance.AsyncClient"""
+
+    def __init__(self, delay=0.0, universe=('BTCUSDT', 'ETHUSDT', 'BNBUSDT')):
+        self.delay = delay
+        self.universe = universe
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_ticker(self, **params):
+        self.calls.append(params)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if 'symbol' in params:
+            return self._ticker(params['symbol'])
+        symbols = json.loads(params['symbols']) if 'symbols' in params else self.universe
+        return [self._ticker(symbol) for symbol in symbols if symbol in self.universe]
+
+    def _ticker(self, symbol):
+        return {
+            'symbol': symbol,
+            'lastPrice': '50000.00',
+            'priceChangePercent': '1.5',
+            'volume': '2000.0'
+        }
+
+
+def test_get_ticker_uses_injected_client():
+    """Test that tickers are fetched through the injected async client"""
+    fake = FakeAsyncBinance()
+    market_data = MarketDataClient(client=fake)
+
+    ticker = asyncio.run(market_data.get_ticker('BTCUSDT'))
+
+    assert ticker['symbol'] == 'BTCUSDT'
+    assert fake.calls == [{'symbol': 'BTCUSDT'}]
+
+
+def test_get_ticker_bounded_concurrency():
+    """Test that no more than max_concurrency requests run at once"""
+    fake = FakeAsyncBinance(delay=0.01)
+    market_data = MarketDataClient(client=fake, max_concurrency=3)
+
+    async def run():
+        return await asyncio.gather(*(market_data.get_ticker(f'S{i}USDT') for i in range(10)))
+
+    tickers = asyncio.run(run())
+
+    assert len(tickers) == 10
+    assert fake.max_in_flight == 3
+
+
+def test_get_ticker_timeout():
+    """Test that slow upstream requests raise MarketDataTimeout"""
+    fake = FakeAsyncBinance(delay=1.0)
+    market_data = MarketDataClient(client=fake, timeout=0.01)
+
+    with pytest.raises(MarketDataTimeout, match='BTCUSDT'):
+        asyncio.run(market_data.get_ticker('BTCUSDT'))
+
+
+def test_close_keeps_injected_client():
+    """Test that close() leaves an injected client alone"""
+    fake = FakeAsyncBinance()
+    market_data = MarketDataClient(client=fake)
+
+    asyncio.run(market_data.close())
+
+    assert market_data.client is fake
+
+
+def test_get_tickers_deduplicates_into_one_request():
+    """Test that a bulk snapshot costs one upstream call for unique symbols"""
+    fake = FakeAsyncBinance()
+    market_data = MarketDataClient(client=fake)
+
+    snapshot = asyncio.run(market_data.get_tickers(['ETHUSDT', 'BTCUSDT', 'ETHUSDT', 'XXXUSDT']))
+
+    assert set(snapshot) == {'BTCUSDT', 'ETHUSDT'}
+    assert fake.calls == [{'symbols': '["BTCUSDT","ETHUSDT","XXXUSDT"]'}]
+
+
+def test_get_tickers_falls_back_to_all_symbols(monkeypatch):
+    """Test that large symbol sets use the all-symbol ticker"""
+    fake = FakeAsyncBinance()
+    market_data = MarketDataClient(client=fake)
+    monkeypatch.setattr(MarketDataClient, 'MAX_SYMBOLS_PER_REQUEST', 1)
+
+    snapshot = asyncio.run(market_data.get_tickers(['BTCUSDT', 'ETHUSDT']))
+
+    assert set(snapshot) == {'BTCUSDT', 'ETHUSDT'}
+    assert fake.calls == [{}]
+
+
+def test_get_tickers_empty():
+    """Test that an empty symbol set makes no upstream call"""
+    fake = FakeAsyncBinance()
+    market_data = MarketDataClient(client=fake)
+
+    assert asyncio.run(market_data.get_tickers([])) == {}
+    assert fake.calls == []
@@ -0,0 +1,129 @@
+import asyncio
+import time
+import pytest
+from src.market_data import MarketDataClient
+from src.metrics import Histogram, Metrics, TickTimer, monitor_event_loop
+from src.testing import FakeBinanceClient, FakeBinanceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHistogram:
+
+    def test_quantiles_from_buckets(self):
+        """Test quantiles resolve to bucket upper bounds, capped by the max"""
+        histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+        for value in [0.005] * 98 + [0.05, 0.5]:
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == 0.01
+        assert histogram.quantile(0.99) == 0.1
+        assert histogram.quantile(1.0) == 0.5
+
+    def test_overflow_bucket_reports_max(self):
+        """Test values above the last bucket report the observed max"""
+        histogram = Histogram(buckets=(0.01,))
+        histogram.observe(3.0)
+
+        assert histogram.quantile(0.99) == 3.0
+
+
+class TestMetrics:
+
+    def test_time_context_manager(self):
+        """Test time() records the duration of the block per label set"""
+        clock = FakeClock()
+        metrics = Metrics(clock=clock)
+
+        with metrics.time('command_seconds', command='!price'):
+            clock.now += 0.25
+
+        histogram = metrics.histogram('command_seconds', command='!price')
+        assert histogram.count == 1
+        assert histogram.sum == pytest.approx(0.25)
+
+    def test_prometheus_export(self):
+        """Test counters, callback gauges and histograms render as Prometheus text"""
+        metrics = Metrics()
+        metrics.describe('ticks_total', 'Polling ticks')
+        metrics.inc('ticks_total')
+        metrics.gauge_callback('stored_signals', lambda: 42)
+        metrics.observe('latency_seconds', 0.003, method='get_ticker')
+
+        text = metrics.render_prometheus()
+
+        assert '# HELP ticks_total Polling ticks\n# TYPE ticks_total counter\nticks_total 1\n' in text
+        assert 'stored_signals 42\n' in text
+        assert 'latency_seconds_bucket{method="get_ticker",le="0.0025"} 0\n' in text
+        assert 'latency_seconds_bucket{method="get_ticker",le="0.005"} 1\n' in text
+        assert 'latency_seconds_bucket{method="get_ticker",le="+Inf"} 1\n' in text
+        assert 'latency_seconds_count{method="get_ticker"} 1\n' in text
+
+    def test_summary_lines(self):
+        """Test the !stats summary lists latencies and gauges"""
+        metrics = Metrics()
+        metrics.observe('command_seconds', 0.002, command='!price')
+        metrics.set('pending_orders', 3)
+
+        assert metrics.summary() == [
+            'command_seconds[!price]: n=1 p50=2.0ms p99=2.0ms max=2.0ms',
+            'pending_orders: 3',
+        ]
+
+
+def test_tick_timer_duration_and_drift():
+    """Test ticks record their duration and how late they start"""
+    clock = FakeClock()
+    metrics = Metrics()
+    timer = TickTimer(metrics, 'poll_tick', interval=5.0, clock=clock)
+
+    with timer.tick():
+        clock.now += 1.0
+    clock.now += 5.0  # the loop sleeps a full interval after a 1s tick
+    with timer.tick():
+        clock.now += 0.5
+
+    assert metrics.histogram('poll_tick_duration_seconds').sum == pytest.approx(1.5)
+    assert metrics.gauges['poll_tick_drift_last_seconds'][()] == pytest.approx(1.0)
+    assert metrics.counters['poll_tick_ticks_total'][()] == 2
+
+
+def test_event_loop_lag_observed():
+    """Test blocking the loop shows up as lag"""
+    metrics = Metrics()
+
+    async def scenario():
+        task = asyncio.create_task(monitor_event_loop(metrics, interval=0.01))
+        await asyncio.sleep(0)
+        time.sleep(0.05)  # block the loop
+        await asyncio.sleep(0.03)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+    assert metrics.histogram('event_loop_lag_seconds').max >= 0.03
+
+
+def test_market_data_request_latency():
+    """Test upstream requests are timed with their kind and outcome"""
+    metrics = Metrics()
+    market_data = MarketDataClient(client=FakeBinanceClient(symbols=3), metrics=metrics)
+
+    async def scenario():
+        await market_data.get_ticker('BTCUSDT')
+        await market_data.get_tickers()
+        with pytest.raises(FakeBinanceError):
+            await market_data.get_ticker('XXXUSDT')
+
+    asyncio.run(scenario())
+
+    series = metrics.histograms['upstream_request_seconds']
+    labels = sorted(dict(key)['kind'] + ':' + dict(key)['outcome'] for key in series)
+    assert labels == ['all:ok', 'symbol:error', 'symbol:ok']
@@ -0,0 +1,138 @@
+import asyncio
+import time
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.indicators import IndicatorEngine
+from src.ohlcv import OHLCVStore, warm_indicators
+from src.testing import FakeBinanceClient
+
+START = 1704067200000  # 2024-01-01T00:00:00Z
+MINUTE = 60_000
+DAY = 1440 * MINUTE
+
+
+@pytest.fixture
+def fake():
+    return FakeBinanceClient(symbols=3, seed=5)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return OHLCVStore(str(tmp_path))
+
+
+class TestOHLCVStore:
+
+    def test_sync_fetches_range_in_pages(self, store, fake):
+        """Test a first sync pages through the range and stores every kline in its slot"""
+        fetched = asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 2 * DAY))
+
+        rows = store.read('BTCUSDT', START, START + 2 * DAY)
+        assert fetched == len(rows) == 2880
+        assert fake.calls['klines'] == 3
+        assert (np.diff(rows['open_time']) == MINUTE).all()
+        assert store.covered('BTCUSDT') == [(START, START + 2 * DAY)]
+
+    def test_only_missing_ranges_are_fetched(self, store, fake):
+        """Test later syncs request only the gaps between covered ranges"""
+        asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 60 * MINUTE))
+        asyncio.run(store.sync(fake, 'BTCUSDT', START + 120 * MINUTE, START + 180 * MINUTE))
+        calls = fake.calls['klines']
+
+        assert store.gaps('BTCUSDT', START, START + 180 * MINUTE) == [(START + 60 * MINUTE, START + 120 * MINUTE)]
+        fetched = asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 180 * MINUTE))
+
+        assert fetched == 60
+        assert fake.calls['klines'] == calls + 1
+        assert store.covered('BTCUSDT') == [(START, START + 180 * MINUTE)]
+        assert asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 180 * MINUTE)) == 0
+        assert fake.calls['klines'] == calls + 1
+
+    def test_history_before_base_is_prepended(self, store, fake):
+        """Test fetching earlier history shifts the file and keeps later rows"""
+        asyncio.run(store.sync(fake, 'BTCUSDT', START + 10 * MINUTE, START + 20 * MINUTE))
+        later = np.array(store.read('BTCUSDT', START + 10 * MINUTE, START + 20 * MINUTE))
+
+        asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 20 * MINUTE))
+
+        rows = store.read('BTCUSDT', START, START + 20 * MINUTE)
+        assert len(rows) == 20 and rows['open_time'][0] == START
+        assert (rows[10:] == later).all()
+
+    def test_reopened_store_reads_memory_mapped_rows(self, store, fake, tmp_path):
+        """Test a new store instance maps the existing files without fetching"""
+        asyncio.run(store.sync(fake, 'ETHUSDT', START, START + DAY))
+        calls = fake.calls['klines']
+
+        reopened = OHLCVStore(str(tmp_path))
+        rows = reopened.read('ETHUSDT', START + 30 * MINUTE, START + 90 * MINUTE)
+
+        assert isinstance(rows.base, np.memmap)
+        assert len(rows) == 60 and rows['open_time'][0] == START + 30 * MINUTE
+        assert reopened.gaps('ETHUSDT', START, START + DAY) == []
+        assert reopened.symbols() == ['ETHUSDT']
+        assert fake.calls['klines'] == calls
+
+    def test_directories_created_on_first_write(self, fake, tmp_path):
+        """Test opening and reading a store touches no files until klines are written"""
+        store = OHLCVStore(str(tmp_path / 'ohlcv'))
+
+        assert store.symbols() == [] and len(store.tail('BTCUSDT', 5)) == 0
+        assert not (tmp_path / 'ohlcv').exists()
+
+        asyncio.run(store.sync(fake, 'BTCUSDT', START, START + 10 * MINUTE))
+
+        assert store.symbols() == ['BTCUSDT']
+
+    def test_open_kline_is_not_covered(self, store, fake):
+        """Test syncing up to now stops before the kline that is still open"""
+        current = int(time.time() * 1000)
+
+        asyncio.run(store.sync(fake, 'BTCUSDT', current - 10 * MINUTE, now=current))
+
+        (_, covered_end), = store.covered('BTCUSDT')
+        assert covered_end == current // MINUTE * MINUTE
+        assert store.tail('BTCUSDT', 1)['open_time'][0] == covered_end - MINUTE
+
+
+def test_warm_indicators_from_store(store, fake):
+    """Test indicator warm-up replays the newest stored klines"""
+    asyncio.run(store.sync(fake, 'BTCUSDT', START, START + DAY))
+    indicators = IndicatorEngine(window=30)
+
+    assert warm_indicators(store, indicators) == 1
+
+    state = indicators.get('BTCUSDT')
+    assert state.samples == 31
+    assert state.price == store.tail('BTCUSDT', 1)['close'][0]
+
+
+def test_warm_indicators_resamples_to_tick_interval(store, fake):
+    """Test warm-up samples are spaced and sized like 5 s polled ticks, not 1m klines"""
+    asyncio.run(store.sync(fake, 'BTCUSDT', START, START + DAY))
+    indicators = IndicatorEngine(window=24)
+
+    warm_indicators(store, indicators, tick_interval=5.0)
+
+    last = store.tail('BTCUSDT', 2)
+    state = indicators.get('BTCUSDT')
+    assert state.samples == 25
+    assert state.price == pytest.approx(last['close'][-1])
+    # Two minutes of 5 s ticks: each tick carries a twelfth of its kline's volume
+    assert state.vwap == pytest.approx(np.average(last['close'], weights=last['volume']), rel=0.01)
+    assert indicators._symbols['BTCUSDT']._vol_sum == pytest.approx(last['volume'].sum())
+
+
+def test_first_live_ticker_keeps_warmed_volume_stats(store, fake):
+    """Test the first 24h ticker after warm-up sets the volume baseline without a zero-volume sample"""
+    asyncio.run(store.sync(fake, 'BTCUSDT', START, START + DAY))
+    indicators = IndicatorEngine(window=24)
+    warm_indicators(store, indicators)
+    warmed = indicators.get('BTCUSDT')
+
+    live = indicators.update_ticker('BTCUSDT', warmed.price * 1.01, 250_000.0)
+
+    assert live == warmed
+    assert indicators.update_ticker('BTCUSDT', warmed.price, 250_010.0).samples == warmed.samples + 1
@@ -0,0 +1,123 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+from src.order_book import OrderBook
+from src.schema import (
+    TradingSignalValidator, TradingSignal, PseudoOrder, OrderType, OrderStatus
+)
+
+
+def make_order(order_id, symbol, price, timestamp=None):
+    return PseudoOrder(
+        id=order_id,
+        symbol=symbol,
+        order_type=OrderType.BUY,
+        quantity=1.0,
+        price=price,
+        timestamp=timestamp or datetime.now()
+    )
+
+
+@pytest.fixture
+def order_book():
+    book = OrderBook(archive_size=2)
+    for i, price in enumerate([100.0, 101.5, 99.0, 110.0]):
+        book.append(make_order(f'BTC_{i}', 'BTCUSDT', price))
+    book.append(make_order('ETH_0', 'ETHUSDT', 100.0))
+    return book
+
+
+class TestOrderBook:
+
+    def test_in_price_range(self, order_book):
+        """Test range lookup only returns orders of the symbol inside the range"""
+        orders = order_book.in_price_range('BTCUSDT', 99.0, 101.5)
+
+        assert [o.id for o in orders] == ['BTC_2', 'BTC_0', 'BTC_1']
+        assert order_book.in_price_range('XRPUSDT', 0.0, 1e9) == []
+
+    def test_archive_removes_from_index(self, order_book):
+        """Test archived orders leave the pending index and symbol index"""
+        eth_order = order_book.in_price_range('ETHUSDT', 0.0, 1e9)[0]
+        order_book.archive(eth_order)
+
+        assert eth_order not in order_book
+        assert order_book.pending_symbols() == ['BTCUSDT']
+        assert list(order_book.archived) == [eth_order]
+        assert len(order_book) == 5
+
+    def test_archive_is_bounded(self, order_book):
+        """Test the archive keeps only the most recent orders"""
+        for order in order_book.pending():
+            order_book.archive(order)
+
+        assert order_book.pending() == []
+        assert [o.id for o in order_book.archived] == ['BTC_3', 'ETH_0']
+
+
+class TestValidatorOrderIndex:
+
+    @pytest.fixture
+    def validator(self):
+        return TradingSignalValidator(Mock(), order_archive_size=100)
+
+    def _add(self, validator, order):
+        validator.orders.append(order)
+        return order
+
+    def test_snapshot_only_fills_orders_in_band(self, validator):
+        """Test a price snapshot fills only orders within the 1% band"""
+        near = self._add(validator, make_order('A', 'BTCUSDT', 100.0))
+        edge = self._add(validator, make_order('B', 'BTCUSDT', 101.0))
+        far = self._add(validator, make_order('C', 'BTCUSDT', 103.0))
+
+        filled = validator.process_price_snapshot({'BTCUSDT': 100.0})
+
+        assert set(o.id for o in filled) == {'A', 'B'}
+        assert far.status == OrderStatus.PENDING
+        assert near not in validator.orders and edge not in validator.orders
+        assert validator.get_pending_orders() == [far]
+
+    def test_snapshot_expires_old_orders(self, validator):
+        """Test stale orders are cancelled even when the price is out of band"""
+        old = self._add(validator, make_order('A', 'BTCUSDT', 100.0, datetime.now() - timedelta(minutes=6)))
+        young = self._add(validator, make_order('B', 'BTCUSDT', 100.0))
+
+        filled = validator.process_price_snapshot({'BTCUSDT': 150.0})
+
+        assert filled == []
+        assert old.status == OrderStatus.CANCELLED
+        assert validator.get_pending_orders() == [young]
+
+    def test_orders_expire_without_price_checks(self, validator):
+        """Test expire_orders cancels due orders via the timing wheel and emits them"""
+        now = [datetime(2024, 1, 1, 12, 0)]
+        validator.clock = lambda: now[0]
+        cancelled = []
+        validator.on_cancel = cancelled.extend
+        signal = TradingSignal('BTCUSDT', 'BUY', 100.0, 6.0, 2000.0, now[0], 0.6)
+        short = validator.create_pseudo_order(signal, 1.0, ttl=timedelta(seconds=30))
+        default = validator.create_pseudo_order(signal, 1.0)
+
+        now[0] += timedelta(seconds=31)
+        assert validator.expire_orders() == [short]
+        assert cancelled == [short]
+        assert validator.get_pending_orders() == [default]
+
+        now[0] += timedelta(minutes=5)
+        assert validator.expire_orders() == [default]
+        assert short.status == default.status == OrderStatus.CANCELLED
+        assert cancelled == [short, default]
+
+    def test_filled_orders_leave_expiry_schedule(self, validator):
+        """Test a filled order is never reported as expired"""
+        now = [datetime(2024, 1, 1, 12, 0)]
+        validator.clock = lambda: now[0]
+        signal = TradingSignal('BTCUSDT', 'BUY', 100.0, 6.0, 2000.0, now[0], 0.6)
+        order = validator.create_pseudo_order(signal, 1.0, ttl=timedelta(seconds=30))
+        validator.simulate_order_fill(order, 100.0)
+
+        now[0] += timedelta(minutes=1)
+
+        assert validator.expire_orders() == []
+        assert order.status == OrderStatus.FILLED
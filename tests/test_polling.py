@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+pytest.importorskip('numpy')
+
+from src.market_data import MarketDataClient
+from src.polling import format_fill_message, poll_market
+from src.quote_cache import QuoteCache
+from src.schema import OrderStatus, TradingSignal, TradingSignalValidator
+from src.testing import FakeBinanceClient, FakeBinanceError
+
+
+@pytest.fixture
+def fake():
+    return FakeBinanceClient(symbols=50, seed=7)
+
+
+def make_signal(symbol, price):
+    return TradingSignal(
+        symbol=symbol, signal_type="BUY", price=price, change_percent=6.0,
+        volume=2000.0, timestamp=datetime.now(), confidence=0.6
+    )
+
+
+class TestFakeBinanceClient:
+
+    def test_request_kinds_counted(self, fake):
+        """Test single, list and all-symbol requests are served and counted"""
+        async def scenario():
+            one = await fake.get_ticker(symbol='BTCUSDT')
+            some = await fake.get_ticker(symbols='["BTCUSDT","XXXUSDT"]')
+            every = await fake.get_ticker()
+            return one, some, every
+
+        one, some, every = asyncio.run(scenario())
+
+        assert one['symbol'] == 'BTCUSDT'
+        assert [t['symbol'] for t in some] == ['BTCUSDT']
+        assert len(every) == 50
+        assert fake.calls == {'symbol': 1, 'symbols': 1, 'all': 1}
+
+    def test_injected_errors(self):
+        """Test error_rate makes requests fail"""
+        fake = FakeBinanceClient(symbols=3, error_rate=1.0)
+
+        with pytest.raises(FakeBinanceError):
+            asyncio.run(fake.get_ticker(symbol='BTCUSDT'))
+
+
+def test_poll_market_fills_pending_orders(fake):
+    """Test one tick fetches a single snapshot and fills orders within tolerance"""
+    validator = TradingSignalValidator(Mock())
+    price = fake.prices['ETHUSDT']
+    near = validator.create_pseudo_order(make_signal('ETHUSDT', price * 1.005), 1.0)
+    far = validator.create_pseudo_order(make_signal('BNBUSDT', fake.prices['BNBUSDT'] * 2), 1.0)
+
+    filled = asyncio.run(poll_market(MarketDataClient(client=fake), validator))
+
+    assert filled == [near]
+    assert near.status == OrderStatus.FILLED
+    assert far.status == OrderStatus.PENDING
+    assert fake.calls == {'all': 1}
+
+
+def test_format_fill_message(fake):
+    """Test the fill announcement lists id, side, size and fill price"""
+    validator = TradingSignalValidator(Mock())
+    order = validator.create_pseudo_order(make_signal('BTCUSDT', 50000.0), 0.5)
+    validator.simulate_order_fill(order, 50100.0)
+
+    message = format_fill_message(order)
+
+    assert message.startswith("✅ **Order Filled**")
+    assert order.id in message
+    assert "BUY 0.5 BTCUSDT" in message
+    assert "$50,100.0000" in message
+
+
+def test_poll_market_warms_quote_cache(fake):
+    """Test the tick's snapshot warms the command-path quote cache"""
+    quotes = QuoteCache(lambda symbol: fake.get_ticker(symbol=symbol))
+
+    asyncio.run(poll_market(MarketDataClient(client=fake), TradingSignalValidator(Mock()), quotes))
+
+    assert len(quotes) == 50
+    assert quotes.peek('BTCUSDT')['symbol'] == 'BTCUSDT'
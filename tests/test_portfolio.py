@@ -0,0 +1,124 @@
+import math
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+pytest.importorskip('numpy')
+
+from src.journal import Journal
+from src.portfolio import Portfolio, format_pnl_message
+from src.schema import TradingSignal, TradingSignalValidator
+
+
+def make_order(validator, symbol, price, quantity, signal_type="BUY"):
+    return validator.create_pseudo_order(TradingSignal(
+        symbol=symbol, signal_type=signal_type, price=price, change_percent=6.0,
+        volume=2000.0, timestamp=datetime.now(), confidence=0.6
+    ), quantity)
+
+
+class TestPortfolio:
+
+    def test_average_cost_and_realized_pnl(self):
+        """Test adds average the cost and reductions realize PnL against it"""
+        portfolio = Portfolio()
+        portfolio.apply_fill('BTCUSDT', 1.0, 100.0)
+        portfolio.apply_fill('BTCUSDT', 1.0, 110.0)
+        portfolio.apply_fill('BTCUSDT', -0.5, 120.0)
+
+        position = portfolio.position('BTCUSDT')
+        assert position.quantity == 1.5
+        assert position.average_cost == 105.0
+        assert position.realized_pnl == pytest.approx(7.5)
+
+    def test_flip_opens_remainder_at_fill_price(self):
+        """Test a fill larger than the position closes it and opens the other side"""
+        portfolio = Portfolio()
+        portfolio.apply_fill('BTCUSDT', 1.0, 100.0)
+        portfolio.apply_fill('BTCUSDT', -3.0, 90.0)
+
+        position = portfolio.position('BTCUSDT')
+        assert (position.quantity, position.average_cost, position.realized_pnl) == (-2.0, 90.0, -10.0)
+
+        portfolio.apply_fill('BTCUSDT', 2.0, 80.0)
+
+        position = portfolio.position('BTCUSDT')
+        assert (position.quantity, position.average_cost, position.realized_pnl) == (0.0, 0.0, 10.0)
+        assert portfolio.open_positions == 0
+
+    def test_mark_to_market(self):
+        """Test one snapshot values every open position and reports unpriced ones"""
+        portfolio = Portfolio()
+        portfolio.apply_fill('BTCUSDT', 2.0, 100.0)
+        portfolio.apply_fill('ETHUSDT', -1.0, 50.0)
+        portfolio.apply_fill('BNBUSDT', 1.0, 10.0)
+        portfolio.apply_fill('XRPUSDT', 1.0, 1.0)
+        portfolio.apply_fill('XRPUSDT', -1.0, 2.0)
+
+        mark = portfolio.mark({'BTCUSDT': 110.0, 'ETHUSDT': 40.0, 'XRPUSDT': 3.0})
+
+        assert mark.unrealized_pnl == pytest.approx(20.0 + 10.0)
+        assert mark.realized_pnl == pytest.approx(1.0)
+        assert mark.exposure == pytest.approx(220.0 + 40.0)
+        assert (mark.open_positions, mark.unpriced) == (3, 1)
+        assert [p.symbol for p in mark.positions] == ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+        assert math.isnan(mark.positions[-1].price)
+        assert portfolio.open_symbols() == ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+
+        portfolio.apply_fill('SOLUSDT', 1.0, 20.0)  # columns still grow after a mark
+        assert len(portfolio) == 5
+
+    def test_empty_mark(self):
+        """Test an empty portfolio marks to zero"""
+        mark = Portfolio().mark({})
+
+        assert (mark.realized_pnl, mark.unrealized_pnl, mark.open_positions) == (0.0, 0.0, 0)
+        assert format_pnl_message(mark) == "💼 No open positions or realized PnL yet."
+
+
+class TestValidatorIntegration:
+
+    def test_fills_update_positions(self):
+        """Test partial and full order fills reach the portfolio"""
+        portfolio = Portfolio()
+        validator = TradingSignalValidator(Mock(), portfolio=portfolio)
+        order = make_order(validator, 'BTCUSDT', 100.0, 2.0)
+
+        validator.apply_fill(order, 0.5, 100.0)
+        validator.simulate_order_fill(order, 100.5)
+        sell = make_order(validator, 'BTCUSDT', 101.0, 1.0, signal_type="SELL")
+        validator.simulate_order_fill(sell, 101.0)
+
+        position = portfolio.position('BTCUSDT')
+        assert position.quantity == pytest.approx(1.0)
+        assert position.average_cost == pytest.approx((50.0 + 150.75) / 2)
+        assert position.realized_pnl == pytest.approx(101.0 - (50.0 + 150.75) / 2)
+
+    def test_rebuilt_from_journal(self, tmp_path):
+        """Test recovery replays filled quantities into the portfolio"""
+        journal = Journal(str(tmp_path / 'tradisb.journal'), fsync=False)
+        validator = TradingSignalValidator(Mock(), journal=journal, portfolio=Portfolio())
+        validator.simulate_order_fill(make_order(validator, 'BTCUSDT', 100.0, 1.0), 100.0)
+        validator.apply_fill(make_order(validator, 'ETHUSDT', 10.0, 4.0), 1.0, 10.0)
+        journal.flush()
+
+        portfolio = Portfolio()
+        journal.recover(TradingSignalValidator(Mock(), portfolio=portfolio))
+
+        assert portfolio.position('BTCUSDT').quantity == 1.0
+        assert portfolio.position('ETHUSDT').quantity == 1.0
+        assert portfolio.open_positions == 2
+
+
+def test_format_pnl_message():
+    """Test the summary shows totals and the largest positions first"""
+    portfolio = Portfolio()
+    portfolio.apply_fill('ETHUSDT', 1.0, 10.0)
+    portfolio.apply_fill('BTCUSDT', -1.0, 100.0)
+
+    message = format_pnl_message(portfolio.mark({'BTCUSDT': 90.0, 'ETHUSDT': 12.0}, limit=1))
+
+    assert message.startswith("💼 **Portfolio PnL**")
+    assert "Total: $+12.00" in message
+    assert "🔴 BTCUSDT -1 @ $100.0000 → $90.0000 (+10.00)" in message
+    assert "ETHUSDT" not in message and "… and 1 more" in message
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from src.metrics import Metrics
+from src.quote_cache import QuoteCache
+from src.testing import FakeBinanceClient, FakeBinanceError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake():
+    return FakeBinanceClient(symbols=10, latency=0.01, seed=3)
+
+
+def make_cache(fake, clock, **kwargs):
+    return QuoteCache(lambda symbol: fake.get_ticker(symbol=symbol), clock=clock, **kwargs)
+
+
+class TestQuoteCache:
+
+    def test_concurrent_misses_coalesce(self, fake, clock):
+        """Test many concurrent lookups of one symbol make a single upstream call"""
+        metrics = Metrics()
+        cache = make_cache(fake, clock, metrics=metrics)
+
+        async def scenario():
+            return await asyncio.gather(*(cache.get('BTCUSDT') for _ in range(50)))
+
+        tickers = asyncio.run(scenario())
+
+        assert fake.calls['symbol'] == 1
+        assert all(t is tickers[0] for t in tickers)
+        assert metrics.counters['quote_cache_requests_total'] == {
+            (('result', 'miss'),): 1, (('result', 'coalesced'),): 49
+        }
+
+    def test_ttl_expiry_refetches(self, fake, clock):
+        """Test fresh quotes are served from memory and stale ones refetched"""
+        cache = make_cache(fake, clock, ttl=2.0)
+
+        async def scenario():
+            await cache.get('BTCUSDT')
+            clock.now = 1.5
+            await cache.get('BTCUSDT')
+            clock.now = 3.0
+            await cache.get('BTCUSDT')
+
+        asyncio.run(scenario())
+
+        assert fake.calls['symbol'] == 2
+
+    def test_lru_eviction(self, fake, clock):
+        """Test the least recently used symbol is evicted when full"""
+        cache = make_cache(fake, clock, max_size=2)
+        cache.put('BTCUSDT', fake.ticker('BTCUSDT'))
+        cache.put('ETHUSDT', fake.ticker('ETHUSDT'))
+        cache.peek('BTCUSDT')
+
+        cache.put('BNBUSDT', fake.ticker('BNBUSDT'))
+
+        assert cache.peek('ETHUSDT') is None
+        assert cache.peek('BTCUSDT') is not None
+        assert len(cache) == 2
+
+    def test_update_warms_without_evicting(self, fake, clock):
+        """Test snapshots refresh cached symbols and only fill free slots"""
+        cache = make_cache(fake, clock, max_size=2)
+        cache.put('ETHUSDT', {'symbol': 'ETHUSDT', 'lastPrice': '1'})
+        snapshot = {s: fake.ticker(s) for s in fake.symbols}
+
+        clock.now = 10.0
+        cache.update(snapshot)
+
+        assert len(cache) == 2
+        assert cache.peek('ETHUSDT') is snapshot['ETHUSDT']
+        assert asyncio.run(cache.get('BTCUSDT')) is snapshot['BTCUSDT']
+        assert fake.calls['symbol'] == 0
+
+    def test_errors_shared_and_not_cached(self, fake, clock):
+        """Test a failed fetch fails every waiter and the next lookup retries"""
+        fake.error_rate = 1.0
+        cache = make_cache(fake, clock)
+
+        async def scenario():
+            results = await asyncio.gather(*(cache.get('BTCUSDT') for _ in range(3)),
+                                           return_exceptions=True)
+            fake.error_rate = 0.0
+            return results, await cache.get('BTCUSDT')
+
+        results, ticker = asyncio.run(scenario())
+
+        assert all(isinstance(r, FakeBinanceError) for r in results)
+        assert ticker['symbol'] == 'BTCUSDT'
+        assert fake.calls['symbol'] == 2
@@ -0,0 +1,130 @@
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+np = pytest.importorskip('numpy')
+
+from src.replay import (
+    ReplayEngine, RollingTicker, SimulatedClock, TickBatch,
+    kline_batches, merge_streams, store_batches, ticker_batches
+)
+from src.schema import TradingSignalValidator, OrderStatus
+
+T0 = 1704067200000  # 2024-01-01 00:00:00 UTC in epoch ms
+MINUTE = 60000
+
+
+@pytest.fixture
+def ticker_csv(tmp_path):
+    """Ticker history: BTC triggers a BUY at t0, then trades back into the 1% band"""
+    rows = [
+        (T0, 'BTCUSDT', 100.0, 7.5, 5000.0),
+        (T0, 'ETHUSDT', 50.0, 1.0, 5000.0),
+        (T0 + MINUTE, 'BTCUSDT', 103.0, 8.0, 5000.0),
+        (T0 + MINUTE, 'ETHUSDT', 50.0, 1.0, 5000.0),
+        (T0 + 2 * MINUTE, 'BTCUSDT', 100.5, 4.0, 5000.0),
+    ]
+    path = tmp_path / 'tickers.csv'
+    with open(path, 'w') as f:
+        f.write('timestamp,symbol,lastPrice,priceChangePercent,volume\n')
+        for row in rows:
+            f.write(','.join(map(str, row)) + '\n')
+    return str(path)
+
+
+def test_simulated_clock_drives_validator():
+    """Test the validator timestamps signals with the injected clock"""
+    clock = SimulatedClock(datetime(2020, 5, 1))
+    validator = TradingSignalValidator(Mock(), clock=clock)
+
+    signal = validator.generate_trading_signal(
+        {'symbol': 'BTCUSDT', 'lastPrice': '1.0', 'priceChangePercent': '6.0', 'volume': '5000'}
+    )
+
+    assert signal.timestamp == datetime(2020, 5, 1)
+
+
+def test_ticker_batches_stream_in_chunks(ticker_csv):
+    """Test ticker files are read chunk by chunk as NumPy columns"""
+    batches = list(ticker_batches(ticker_csv, chunk_rows=2))
+
+    assert [len(b.timestamps) for b in batches] == [2, 2, 1]
+    assert batches[0].symbols.tolist() == ['BTCUSDT', 'ETHUSDT']
+    assert batches[1].last_price.tolist() == [103.0, 50.0]
+
+
+@pytest.mark.parametrize('order_storage', ['dataclass', 'columnar'])
+def test_replay_fills_and_pnl(ticker_csv, order_storage):
+    """Test a replay opens orders from signals and fills them on later ticks, in either storage mode"""
+    engine = ReplayEngine(order_quantity=2.0, order_storage=order_storage)
+
+    stats = engine.run(ticker_batches(ticker_csv, chunk_rows=2))
+
+    assert stats.steps == 3
+    assert stats.rows == 5
+    assert stats.signals == 2  # BTC at t0 and t0+1m
+    assert stats.orders == 1   # one pending order per symbol at most
+    assert stats.fills == 1
+    assert stats.avg_fill_latency_seconds == 120.0
+    assert stats.positions == {'BTCUSDT': 2.0}
+    assert stats.pnl == pytest.approx(0.0)  # bought at 100.5, marked at 100.5
+    assert engine.validator.orders.archived[0].status == OrderStatus.FILLED
+
+
+def test_rolling_ticker_carries_window_across_chunks():
+    """Test kline closes become window-based change and rolling volume"""
+    rolling = RollingTicker(window=2)
+    symbols = np.array(['BTCUSDT'] * 3, dtype=object)
+
+    first = rolling.transform(np.arange(3), symbols, np.array([100.0, 101.0, 110.0]), np.ones(3))
+    second = rolling.transform(np.arange(3, 4), symbols[:1], np.array([121.0]), np.ones(1))
+
+    assert np.isnan(first.change_percent[:2]).all()
+    assert first.change_percent[2] == pytest.approx(10.0)
+    assert second.change_percent[0] == pytest.approx((121.0 / 101.0 - 1) * 100)
+    assert first.volume.tolist() == [1.0, 2.0, 2.0]
+    assert second.volume.tolist() == [2.0]
+
+
+def test_kline_batches_headerless_binance_dump(tmp_path):
+    """Test headerless Binance kline dumps take their symbol from the file name"""
+    path = tmp_path / 'BTCUSDT-1m-2024-01.csv'
+    with open(path, 'w') as f:
+        for i in range(3):
+            f.write(f'{T0 + i * MINUTE},1,1,1,{100 + i},10,{T0 + (i + 1) * MINUTE - 1},0,0,0,0,0\n')
+
+    batch, = kline_batches(str(path), window=timedelta(minutes=1))
+
+    assert batch.symbols.tolist() == ['BTCUSDT'] * 3
+    assert batch.timestamps.tolist() == [T0 + MINUTE, T0 + 2 * MINUTE, T0 + 3 * MINUTE]
+    assert batch.change_percent[1] == pytest.approx(1.0)
+
+
+def test_store_batches_skip_empty_slots(tmp_path):
+    """Test klines replayed from a local OHLCV store skip slots never filled"""
+    from src.ohlcv import OHLCVStore, parse_klines
+
+    store = OHLCVStore(str(tmp_path))
+    store.write('BTCUSDT', parse_klines([
+        [T0 + i * MINUTE, '1', '1', '1', str(100 + i), '10', 0, '0', 0] for i in (0, 1, 3)
+    ]))
+
+    batch, = store_batches(store, 'BTCUSDT', T0, T0 + 4 * MINUTE, window=timedelta(minutes=1))
+
+    assert batch.timestamps.tolist() == [T0 + MINUTE, T0 + 2 * MINUTE, T0 + 4 * MINUTE]
+    assert batch.last_price.tolist() == [100.0, 101.0, 103.0]
+
+
+def test_merge_streams_orders_by_timestamp():
+    """Test per-file streams merge into one timestamp-sorted stream"""
+    def stream(symbol, timestamps, chunk):
+        for i in range(0, len(timestamps), chunk):
+            ts = np.array(timestamps[i:i + chunk], dtype=np.int64)
+            yield TickBatch(ts, np.full(len(ts), symbol, dtype=object), ts.astype(float),
+                            np.zeros(len(ts)), np.zeros(len(ts)))
+
+    merged = list(merge_streams([stream('A', [1, 3, 5, 7], 3), stream('B', [2, 3, 4], 1)]))
+
+    timestamps = np.concatenate([b.timestamps for b in merged]).tolist()
+    assert timestamps == [1, 2, 3, 3, 4, 5, 7]
+    assert sum(len(b.symbols) for b in merged) == 7
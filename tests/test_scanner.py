@@ -0,0 +1,62 @@
+import pytest
+from unittest.mock import Mock
+
+np = pytest.importorskip('numpy')
+
+from src.scanner import parse_tickers, scan_tickers
+from src.schema import TradingSignalValidator
+
+
+@pytest.fixture
+def market_tickers():
+    """All-symbols ticker response with matching, non-matching and malformed rows"""
+    return [
+        {'symbol': 'BTCUSDT', 'lastPrice': '50000.00', 'priceChangePercent': '7.5', 'volume': '5000.0'},
+        {'symbol': 'ETHUSDT', 'lastPrice': '3000.00', 'priceChangePercent': '-6.0', 'volume': '5000.0'},
+        {'symbol': 'LOWUSDT', 'lastPrice': '1.00', 'priceChangePercent': '8.0', 'volume': '500.0'},
+        {'symbol': 'FLATUSDT', 'lastPrice': '1.00', 'priceChangePercent': '2.0', 'volume': '9000.0'},
+        {'symbol': 'BADUSDT', 'lastPrice': '1.00', 'priceChangePercent': 'oops', 'volume': '9000.0'},
+        {'symbol': 'MOONUSDT', 'lastPrice': '0.10', 'priceChangePercent': '25.0', 'volume': '1e6'},
+        {'symbol': 'HALFUSDT'},
+    ]
+
+
+def test_parse_tickers_malformed_rows_are_nan(market_tickers):
+    """Test malformed or missing fields parse to NaN"""
+    columns = parse_tickers(market_tickers)
+
+    assert columns.last_price[0] == 50000.0
+    assert np.isnan(columns.change_percent[4])
+    assert np.isnan(columns.volume[6])
+
+
+def test_scan_tickers_matches(market_tickers):
+    """Test the vectorized scan applies the criteria and confidence formula"""
+    matches = list(scan_tickers(market_tickers, 5.0, 1000.0, 10.0))
+
+    assert matches == [
+        ('BTCUSDT', 'BUY', 50000.0, 7.5, 5000.0, 0.75),
+        ('ETHUSDT', 'SELL', 3000.0, -6.0, 5000.0, 0.6),
+        ('MOONUSDT', 'BUY', 0.1, 25.0, 1e6, 1.0),
+    ]
+
+
+def test_generate_trading_signals_matches_scalar_path(market_tickers):
+    """Test bulk generation agrees with generate_trading_signal per ticker"""
+    bulk = TradingSignalValidator(Mock())
+    scalar = TradingSignalValidator(Mock())
+
+    bulk_signals = bulk.generate_trading_signals(market_tickers)
+    scalar_signals = [s for s in map(scalar.generate_trading_signal, market_tickers) if s]
+
+    assert [(s.symbol, s.signal_type, s.price, s.confidence) for s in bulk_signals] == \
+        [(s.symbol, s.signal_type, s.price, s.confidence) for s in scalar_signals]
+    assert len(bulk.signals) == 3
+    assert bulk.get_latest_signal('ETHUSDT').signal_type == 'SELL'
+
+
+def test_generate_trading_signals_empty():
+    """Test an empty snapshot produces no signals"""
+    validator = TradingSignalValidator(Mock())
+
+    assert validator.generate_trading_signals([]) == []
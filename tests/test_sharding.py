@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+from unittest.mock import Mock
+
+pytest.importorskip('numpy')
+
+from src.indicators import IndicatorEngine
+from src.market_data import MarketDataClient
+from src.polling import poll_market
+from src.scanner import parse_tickers
+from src.schema import TradingSignalValidator
+from src.sharding import ConsistentHashRing, ShardedScanner, decode_batch, encode_batch
+from src.testing import FakeBinanceClient
+
+
+def make_tickers(count, change=6.0):
+    return [{
+        'symbol': f"COIN{i}USDT",
+        'lastPrice': str(1.0 + i),
+        'priceChangePercent': str(change if i % 2 else -change),
+        'volume': str(5000.0 + i),
+    } for i in range(count)]
+
+
+def summary(signals):
+    return sorted((s.symbol, s.signal_type, s.price, round(s.confidence, 9)) for s in signals)
+
+
+@pytest.fixture
+def scanner():
+    with ShardedScanner(3) as scanner:
+        yield scanner
+
+
+class TestConsistentHashRing:
+
+    def test_adding_a_shard_moves_few_keys(self):
+        """Test growing from 4 to 5 shards only reassigns keys to the new shard"""
+        keys = [f"COIN{i}USDT" for i in range(5000)]
+        before = ConsistentHashRing(range(4))
+        after = ConsistentHashRing(range(5))
+
+        moved = [k for k in keys if before.shard_for(k) != after.shard_for(k)]
+
+        assert all(after.shard_for(k) == 4 for k in moved)
+        assert 0.1 < len(moved) / len(keys) < 0.3
+        assert sorted({before.shard_for(k) for k in keys}) == [0, 1, 2, 3]
+
+
+def test_batch_round_trip():
+    """Test ticker columns survive the worker wire format"""
+    columns = parse_tickers(make_tickers(5))
+
+    decoded = decode_batch(encode_batch(columns))
+
+    assert decoded.symbols.tolist() == columns.symbols.tolist()
+    assert decoded.volume.tolist() == columns.volume.tolist()
+    assert len(decode_batch(encode_batch(parse_tickers([]))).symbols) == 0
+
+
+class TestShardedScanner:
+
+    def test_matches_in_process_scan(self, scanner):
+        """Test sharded signals equal a single validator's over repeated snapshots"""
+        local = TradingSignalValidator(Mock(), indicators=IndicatorEngine())
+        for change in (6.0, 7.0, 9.0):
+            tickers = make_tickers(300, change)
+            expected = local.generate_trading_signals(tickers)
+
+            signals = asyncio.run(scanner.scan(tickers))
+
+            assert summary(signals) == summary(expected)
+
+    def test_each_symbol_stays_on_one_shard(self, scanner):
+        """Test partitioning follows the ring and skips tickers without a symbol"""
+        columns = parse_tickers(make_tickers(50) + [{'lastPrice': '1'}])
+
+        batches = scanner.partition(columns)
+
+        assert sum(len(b.symbols) for b in batches) == 50
+        for shard, batch in enumerate(batches):
+            assert all(scanner.ring.shard_for(s) == shard for s in batch.symbols.tolist())
+
+    def test_dead_worker_is_restarted(self, scanner):
+        """Test a dead worker is replaced before the next scan"""
+        tickers = parse_tickers(make_tickers(60))
+        scanner.start()
+        dead = scanner._processes[0]
+        dead.kill()
+        dead.join()
+
+        signals = scanner.scan_columns(tickers)
+
+        assert len(signals) == 60
+        assert scanner._processes[0] is not dead and scanner._processes[0].is_alive()
+
+
+def test_poll_market_with_scanner(scanner):
+    """Test a polling tick stores the workers' signals in the validator"""
+    fake = FakeBinanceClient(symbols=200, volatility=0.1, seed=3)
+    for _ in range(3):
+        fake.step()
+    validator = TradingSignalValidator(Mock())
+
+    asyncio.run(poll_market(MarketDataClient(client=fake), validator, scanner=scanner))
+
+    expected = TradingSignalValidator(Mock()).generate_trading_signals(fake.ticker(s) for s in fake.symbols)
+    assert expected
+    assert summary(validator.signals) == summary(expected)
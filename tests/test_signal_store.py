@@ -0,0 +1,65 @@
+import pytest
+from datetime import datetime, timedelta
+from src.schema import TradingSignal
+from src.signal_store import SignalStore
+
+BASE_TIME = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def make_signal(symbol, minutes, price=100.0):
+    return TradingSignal(
+        symbol=symbol,
+        signal_type='BUY',
+        price=price,
+        change_percent=6.0,
+        volume=2000.0,
+        timestamp=BASE_TIME + timedelta(minutes=minutes)
+    )
+
+
+@pytest.fixture
+def signal_store():
+    store = SignalStore(max_signals=100, max_age=timedelta(hours=1))
+    for minute, symbol in enumerate(['BTCUSDT', 'ETHUSDT', 'BTCUSDT', 'BNBUSDT']):
+        store.append(make_signal(symbol, minute, price=100.0 + minute))
+    return store
+
+
+class TestSignalStore:
+
+    def test_since_window(self, signal_store):
+        """Test window query returns signals strictly after the cutoff in order"""
+        signals = signal_store.since(BASE_TIME + timedelta(minutes=1))
+
+        assert [s.symbol for s in signals] == ['BTCUSDT', 'BNBUSDT']
+
+    def test_out_of_order_append(self, signal_store):
+        """Test late signals are inserted in timestamp order"""
+        signal_store.append(make_signal('XRPUSDT', -1))
+
+        assert [s.symbol for s in signal_store][:2] == ['XRPUSDT', 'BTCUSDT']
+        assert len(signal_store) == 5
+
+    def test_latest_per_symbol(self, signal_store):
+        """Test per-symbol views return the most recent signal"""
+        assert signal_store.latest('BTCUSDT').price == 102.0
+        assert signal_store.latest('XRPUSDT') is None
+        assert [s.price for s in signal_store.for_symbol('BTCUSDT')] == [100.0, 102.0]
+
+    def test_count_eviction(self):
+        """Test the store never holds more than max_signals"""
+        store = SignalStore(max_signals=3, max_age=timedelta(days=1))
+        for minute in range(10):
+            store.append(make_signal(f'S{minute}USDT', minute))
+
+        assert len(store) == 3
+        assert [s.symbol for s in store] == ['S7USDT', 'S8USDT', 'S9USDT']
+        assert store.latest('S0USDT') is None
+
+    def test_age_eviction(self, signal_store):
+        """Test signals older than max_age relative to the newest are evicted"""
+        signal_store.append(make_signal('BTCUSDT', 62))
+
+        assert [s.symbol for s in signal_store] == ['BNBUSDT', 'BTCUSDT']
+        assert [s.price for s in signal_store.for_symbol('BTCUSDT')] == [100.0]
+        assert signal_store.latest('ETHUSDT') is None
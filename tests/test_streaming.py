@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from src.schema import OrderStatus, TradingSignal, TradingSignalValidator
+from src.streaming import BinanceStreamSource, PriceUpdate, StreamingFillEngine, replay_source
+from src.testing import FakeBinanceClient
+
+
+@pytest.fixture
+def validator():
+    return TradingSignalValidator(Mock())
+
+
+def make_order(validator, symbol, price):
+    return validator.create_pseudo_order(TradingSignal(
+        symbol=symbol, signal_type="BUY", price=price, change_percent=6.0,
+        volume=2000.0, timestamp=datetime.now(), confidence=0.6
+    ), 1.0)
+
+
+class TestStreamingFillEngine:
+
+    def test_update_fills_only_its_symbol(self, validator):
+        """Test an update checks only the orders of the symbol that ticked"""
+        btc = make_order(validator, 'BTCUSDT', 100.0)
+        eth = make_order(validator, 'ETHUSDT', 100.0)
+        fills = []
+        engine = StreamingFillEngine(validator, None, on_fill=fills.extend)
+
+        asyncio.run(engine.consume(replay_source([
+            PriceUpdate('BTCUSDT', 120.0),
+            PriceUpdate('BTCUSDT', 100.5),
+        ])))
+
+        assert fills == [btc]
+        assert btc.status == OrderStatus.FILLED
+        assert btc.fill_price == 100.5
+        assert eth.status == OrderStatus.PENDING
+        assert engine.updates == 2 and engine.fills == 1
+
+    def test_fills_in_one_window_are_announced_once(self, validator):
+        """Test a burst of filling updates reaches on_fill as one batch per flush interval"""
+        orders = [make_order(validator, 'BTCUSDT', 100.0 + i) for i in range(5)]
+        announced = []
+        engine = StreamingFillEngine(validator, None, on_fill=announced.append, flush_interval=0.05)
+
+        async def scenario():
+            for i in range(5):
+                engine.handle(PriceUpdate('BTCUSDT', 100.0 + i))
+            assert announced == []
+            await asyncio.sleep(0.1)
+            engine.handle(PriceUpdate('BTCUSDT', 100.0))
+
+        asyncio.run(scenario())
+
+        assert announced == [orders]
+        assert engine.fills == 5
+
+    def test_fills_within_milliseconds_of_tick(self, validator):
+        """Test an order fills as soon as a matching price is pushed"""
+        fake = FakeBinanceClient(symbols=3, volatility=0.0, seed=1)
+        order = make_order(validator, 'ETHUSDT', fake.prices['ETHUSDT'])
+        engine = StreamingFillEngine(validator, lambda: fake.price_updates(interval=0.001, steps=1))
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await engine.consume(engine.source_factory())
+            return loop.time() - start
+
+        elapsed = asyncio.run(scenario())
+
+        assert order.status == OrderStatus.FILLED
+        assert elapsed < 0.1
+
+    def test_run_retries_after_source_error(self, validator):
+        """Test a failing source is reconnected instead of stopping the engine"""
+        order = make_order(validator, 'BTCUSDT', 100.0)
+        attempts = []
+
+        def source_factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError('stream dropped')
+            return replay_source([PriceUpdate('BTCUSDT', 100.0)])
+
+        engine = StreamingFillEngine(validator, source_factory, retry_delay=0.001)
+
+        async def scenario():
+            task = asyncio.create_task(engine.run())
+            while order.status == OrderStatus.PENDING:
+                await asyncio.sleep(0.001)
+            task.cancel()
+
+        asyncio.run(asyncio.wait_for(scenario(), timeout=1))
+
+        assert len(attempts) >= 2
+
+
+class TestBinanceStreamSource:
+
+    def test_parse_book_ticker_mid_price(self):
+        """Test bookTicker messages become mid-price updates"""
+        source = BinanceStreamSource(None, list)
+        message = {'stream': 'btcusdt@bookTicker',
+                   'data': {'u': 1, 's': 'BTCUSDT', 'b': '100.0', 'B': '1', 'a': '102.0', 'A': '1'}}
+
+        assert source.parse(message) == PriceUpdate('BTCUSDT', 101.0, 0)
+
+    def test_parse_trade(self):
+        """Test trade messages become last-price updates"""
+        source = BinanceStreamSource(None, list, stream='trade')
+        message = {'stream': 'btcusdt@trade',
+                   'data': {'e': 'trade', 's': 'BTCUSDT', 'p': '99.5', 'q': '1', 'T': 1704067200000}}
+
+        assert source.parse(message) == PriceUpdate('BTCUSDT', 99.5, 1704067200000)
+
+    def test_symbols_checked_per_refresh_not_per_message(self, monkeypatch):
+        """Test the stream list is re-read on the refresh timer and reconnects when it changes"""
+        binance = pytest.importorskip('binance')
+        message = {'data': {'s': 'BTCUSDT', 'b': '100.0', 'a': '102.0'}}
+        opened = []
+
+        class Socket:
+            async def recv(self):
+                await asyncio.sleep(0)
+                return message
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        class Manager:
+            def __init__(self, client):
+                pass
+
+            def multiplex_socket(self, streams):
+                opened.append(streams)
+                return Socket()
+
+        class MarketData:
+            async def connect(self):
+                return None
+
+        monkeypatch.setattr(binance, 'BinanceSocketManager', Manager)
+        wanted = ['BTCUSDT']
+        calls = []
+
+        def symbols():
+            calls.append(1)
+            return wanted
+
+        async def scenario():
+            updates = 0
+            async for _ in BinanceStreamSource(MarketData(), symbols, refresh_interval=0.05):
+                updates += 1
+                if updates == 200:
+                    wanted.append('ETHUSDT')
+                if len(opened) == 2:
+                    return updates
+
+        updates = asyncio.run(asyncio.wait_for(scenario(), timeout=5))
+
+        assert opened == [['btcusdt@bookTicker'], ['btcusdt@bookTicker', 'ethusdt@bookTicker']]
+        assert len(calls) < updates / 10
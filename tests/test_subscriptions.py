@@ -0,0 +1,121 @@
+import asyncio
+import os
+import pytest
+from src.subscriptions import SubscriptionRegistry, normalize_topic
+
+
+@pytest.fixture
+def registry():
+    return SubscriptionRegistry(default_topics=['*'])
+
+
+def test_normalize_topic():
+    """Test bare coins get USDT while signal types and '*' are kept"""
+    assert [normalize_topic(t) for t in ('btc', 'ETHUSDT', 'sell', '*')] == ['BTCUSDT', 'ETHUSDT', 'SELL', '*']
+
+
+class TestSubscriptionRegistry:
+
+    def test_events_reach_only_interested_channels(self, registry):
+        """Test symbol, signal type and wildcard subscriptions are all matched"""
+        registry.subscribe(1, ['BTC'])
+        registry.subscribe(2, ['SELL'])
+        registry.subscribe(3, ['*'])
+        registry.subscribe(4, ['ETH'])
+
+        assert registry.channels_for('BTCUSDT', 'BUY') == {1, 3}
+        assert registry.channels_for('ETHUSDT', 'SELL') == {2, 3, 4}
+        assert registry.channels_for('XRPUSDT', 'BUY') == {3}
+
+    def test_unsubscribe_updates_index(self, registry):
+        """Test removed topics stop routing and an emptied channel is not re-defaulted"""
+        registry.subscribe(1, ['BTC', 'ETH'])
+
+        assert registry.unsubscribe(1, ['btc']) == ['ETHUSDT']
+        assert registry.channels_for('BTCUSDT') == set()
+        assert registry.unsubscribe(1) == []
+        assert registry.discover(1) is False
+        assert registry.channels_for('ETHUSDT') == set()
+
+    def test_discover_applies_defaults_once(self, registry):
+        """Test a new channel gets the default topics and a known one keeps its own"""
+        registry.subscribe(1, ['BTC'])
+
+        assert registry.discover(2) is True
+        assert registry.discover(1) is False
+        assert registry.topics(1) == ['BTCUSDT']
+        assert registry.channels_for('XRPUSDT') == {2}
+
+    def test_removed_channel_is_forgotten(self, registry):
+        """Test a deleted channel leaves no index entries behind"""
+        registry.subscribe(1, ['BTC', '*'])
+
+        registry.remove_channel(1)
+
+        assert 1 not in registry and len(registry) == 0
+        assert registry.channels_for('BTCUSDT', 'BUY') == set()
+        assert not registry._channels
+
+    def test_muted_channel_keeps_topics(self, registry):
+        """Test a muted channel is not routed to but keeps its topics until discovered again"""
+        registry.subscribe(1, ['BTC', 'SELL'])
+        registry.subscribe(2, ['*'])
+
+        registry.mute(1)
+        registry.subscribe(1, ['ETH'])
+
+        assert registry.channels_for('BTCUSDT', 'SELL') == {2}
+        assert registry.topics(1) == ['BTCUSDT', 'ETHUSDT', 'SELL']
+        assert registry.discover(1) is False
+        assert registry.channels_for('ETHUSDT', 'BUY') == {1, 2}
+        assert registry.channels_for('XRPUSDT', 'SELL') == {1, 2}
+
+    def test_route_groups_channels_by_contents(self, registry):
+        """Test channels wanting the same events share one broadcast, in event order"""
+        registry.subscribe(1, ['*'])
+        registry.subscribe(2, ['*'])
+        registry.subscribe(3, ['ETH'])
+
+        routes = registry.route([('BTCUSDT', 'BUY', 'btc fill'), ('ETHUSDT', 'SELL', 'eth fill')])
+
+        assert sorted(routes) == [([1, 2], ['btc fill', 'eth fill']), ([3], ['eth fill'])]
+        assert registry.route([('XRPUSDT', 'BUY', 'x')]) == [([1, 2], ['x'])]
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test subscriptions, including opted-out channels, are reloaded from the file"""
+        path = str(tmp_path / 'subscriptions.json')
+        registry = SubscriptionRegistry(path)
+        registry.subscribe(1, ['BTC', 'SELL'])
+        registry.discover(2)
+        registry.unsubscribe(2)
+        registry.flush()
+
+        reloaded = SubscriptionRegistry(path)
+
+        assert reloaded.topics(1) == ['BTCUSDT', 'SELL']
+        assert 2 in reloaded and reloaded.discover(2) is False
+        assert reloaded.channels_for('ETHUSDT', 'SELL') == {1}
+
+    def test_changes_saved_in_batches(self, tmp_path):
+        """Test many changes are written once by the run task and flushed when it stops"""
+        path = str(tmp_path / 'subscriptions.json')
+        registry = SubscriptionRegistry(path, save_interval=0.05)
+        writes = []
+        write = registry._write
+        registry._write = lambda data: (writes.append(data), write(data))
+
+        async def scenario():
+            task = asyncio.create_task(registry.run())
+            for channel_id in range(100):
+                registry.discover(channel_id)
+            assert not os.path.exists(path)
+            await asyncio.sleep(0.1)
+            registry.subscribe(7, ['BTC'])
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(scenario())
+
+        assert len(writes) == 2
+        reloaded = SubscriptionRegistry(path)
+        assert len(reloaded) == 100 and reloaded.topics(7) == ['*', 'BTCUSDT']
@@ -0,0 +1,48 @@
+from src.timer_wheel import TimingWheel
+
+
+class TestTimingWheel:
+
+    def test_expires_at_deadline(self):
+        """Test items come out once their deadline passes, earliest first"""
+        wheel = TimingWheel(resolution=1.0, slots=8)
+        wheel.schedule('b', 102.5, 'B')
+        wheel.schedule('a', 101.2, 'A')
+        wheel.schedule('c', 104.0, 'C')
+
+        assert wheel.advance(100.0) == []
+        assert wheel.advance(102.5) == ['A', 'B']
+        assert wheel.advance(103.9) == []
+        assert wheel.advance(104.0) == ['C']
+        assert len(wheel) == 0
+
+    def test_cancel_and_reschedule(self):
+        """Test cancelled keys never fire and rescheduling replaces the deadline"""
+        wheel = TimingWheel(resolution=1.0, slots=8)
+        wheel.schedule('a', 101.0, 'A')
+        wheel.schedule('b', 101.0, 'B')
+        wheel.schedule('b', 105.0, 'B2')
+
+        assert wheel.cancel('a') is True
+        assert wheel.cancel('a') is False
+        assert wheel.advance(102.0) == []
+        assert wheel.advance(105.0) == ['B2']
+
+    def test_deadlines_beyond_one_revolution(self):
+        """Test far deadlines wait in their bucket for later revolutions"""
+        wheel = TimingWheel(resolution=1.0, slots=4)
+        wheel.schedule('far', 110.0, 'FAR')
+        wheel.schedule('near', 101.0, 'NEAR')
+
+        assert wheel.advance(102.0) == ['NEAR']
+        assert wheel.advance(106.0) == []
+        assert wheel.advance(200.0) == ['FAR']  # gap longer than the wheel
+
+    def test_overdue_schedule_fires_on_next_advance(self):
+        """Test a deadline already in the past expires on the next advance"""
+        wheel = TimingWheel(resolution=1.0, slots=8)
+        wheel.schedule('a', 100.0, 'A')
+        wheel.advance(150.0)
+        wheel.schedule('late', 90.0, 'LATE')
+
+        assert wheel.advance(150.0) == ['LATE']
@@ -206,6 +206,36 @@ class TestTradingSignalValidator:
         assert pending_orders[0].id == order2.id
         assert pending_orders[0].status == OrderStatus.PENDING
 
+    def test_process_price_snapshot(self, trading_validator, sample_ticker_data):
+        """Test filling pending orders against one bulk price snapshot"""
+        signal = trading_validator.generate_trading_signal(sample_ticker_data)
+        btc_order = trading_validator.create_pseudo_order(signal, 0.001)
+        eth_signal = TradingSignal(
+            symbol='ETHUSDT',
+            signal_type='SELL',
+            price=3000.0,
+            change_percent=-6.0,
+            volume=5000.0,
+            timestamp=datetime.now()
+        )
+        eth_order = trading_validator.create_pseudo_order(eth_signal, 0.1)
+        
+        filled = trading_validator.process_price_snapshot({'BTCUSDT': 50100.0, 'ETHUSDT': 3200.0})
+        
+        assert filled == [btc_order]
+        assert btc_order.fill_price == 50100.0
+        assert eth_order.status == OrderStatus.PENDING
+    
+    def test_process_price_snapshot_missing_symbol(self, trading_validator, sample_ticker_data):
+        """Test that orders without a price in the snapshot are left pending"""
+        signal = trading_validator.generate_trading_signal(sample_ticker_data)
+        order = trading_validator.create_pseudo_order(signal, 0.001)
+        
+        filled = trading_validator.process_price_snapshot({'ETHUSDT': 3000.0})
+        
+        assert filled == []
+        assert order.status == OrderStatus.PENDING
+
 class TestIntegration:
     """Integration tests for the complete workflow"""
     